@@ -0,0 +1,3 @@
+"""
+Benchmark suite for the OCR hot paths
+"""
@@ -0,0 +1,105 @@
+"""
+Batched EasyOCR benchmark
+Runs the fixture corpus through EasyOCR one image at a time, as before batching
+(readtext with the default recognizer batch size and detail=1), and through
+PythonOCREngine.extract_batch at several batch sizes, then prints throughput,
+speedup over the loop and whether the texts match
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.fixtures import generate, load_manifest
+from benchmarks.run import EASYOCR_LANGUAGES, char_error_rate
+
+
+def _loop(reader: Any, paths: List[str]) -> List[str]:
+    """Per-image recognition as done before batching"""
+    return ['\n'.join(item[1] for item in reader.readtext(path)) for path in paths]
+
+
+def run(fixture_dir: str, language: str, batch_sizes: List[int], repeat: int) -> Dict[str, Any]:
+    """
+    Measure the per-image loop and every batch size on the fixtures of a language
+
+    Returns:
+        Report with images per second, speedup and mean CER per setting
+    """
+    from src.ocr.python_ocr import EASYOCR_AVAILABLE, PythonOCREngine
+
+    if not EASYOCR_AVAILABLE:
+        return {'skipped': "EasyOCR is not installed"}
+
+    fixtures = [f for f in load_manifest(fixture_dir)['fixtures'] if f['language'] == language]
+    paths = [f['path'] for f in fixtures]
+    expected = [f['text'] for f in fixtures]
+    engine = PythonOCREngine(language=EASYOCR_LANGUAGES[language], use_tesseract=False)
+    if not engine.easyocr_reader:
+        return {'skipped': "EasyOCR reader failed to initialize"}
+
+    def measure(name: str, recognize) -> Dict[str, Any]:
+        # Warm-up pass so model loading and allocator growth are not measured
+        texts = recognize()
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            recognize()
+            best = min(best, time.perf_counter() - start)
+        return {
+            'setting': name,
+            'images_per_second': len(paths) / best,
+            'mean_cer': sum(char_error_rate(e, t if isinstance(t, str) else '')
+                            for e, t in zip(expected, texts)) / len(paths),
+            'texts': texts,
+        }
+
+    results = [measure('loop', lambda: _loop(engine.easyocr_reader, paths))]
+    for size in batch_sizes:
+        results.append(measure(f'batch-{size}', lambda size=size: engine.extract_batch(
+            paths, method='easyocr', batch_images=size)))
+
+    baseline = results[0]
+    for result in results:
+        result['speedup'] = result['images_per_second'] / baseline['images_per_second']
+        result['same_text'] = sum(a == b for a, b in zip(result['texts'], baseline['texts']))
+    for result in results:
+        del result['texts']
+    return {'language': language, 'images': len(paths), 'repeat': repeat, 'results': results}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fixtures', default=None,
+                        help="Fixture directory (default: generate the corpus into a temp dir)")
+    parser.add_argument('--language', default='eng', choices=sorted(EASYOCR_LANGUAGES))
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[2, 4, 8])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=None, help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        report = run(args.fixtures, args.language, args.batch_sizes, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory(prefix='textcapture-easyocr-batch-') as fixture_dir:
+            generate(fixture_dir, languages=[args.language])
+            report = run(fixture_dir, args.language, args.batch_sizes, args.repeat)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+EasyOCR CPU mode benchmark
+Runs the fixture corpus through a default EasyOCR reader and a 'cpu_fast' one
+(int8 recognizer, pinned torch threads, inference_mode) and prints init time,
+latency percentiles, mean character error rate and recognizer weight size
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.fixtures import generate, load_manifest
+from benchmarks.run import EASYOCR_LANGUAGES, char_error_rate, summarize
+
+
+def _weights_mb(model: Any) -> float:
+    """Serialized size of a module's weights"""
+    import torch
+
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / (1024 * 1024)
+
+
+def run(fixture_dir: str, language: str, repeat: int, threads: Optional[int]) -> Dict[str, Any]:
+    """
+    Measure both modes on the fixtures of a language
+
+    The default mode runs first: torch's thread count is process-wide and
+    cpu_fast changes it.
+
+    Returns:
+        Report with init seconds, latency, mean CER and recognizer size per mode
+    """
+    from src.ocr.easyocr_models import EASYOCR_MODE_CPU_FAST, EASYOCR_MODES
+    from src.ocr.python_ocr import EASYOCR_AVAILABLE, PythonOCREngine
+
+    if not EASYOCR_AVAILABLE:
+        return {'skipped': "EasyOCR is not installed"}
+
+    fixtures = [f for f in load_manifest(fixture_dir)['fixtures'] if f['language'] == language]
+    report: Dict[str, Any] = {'language': language, 'images': len(fixtures), 'repeat': repeat,
+                              'results': []}
+    for mode in EASYOCR_MODES:
+        start = time.perf_counter()
+        engine = PythonOCREngine(language=EASYOCR_LANGUAGES[language], use_tesseract=False,
+                                 easyocr_mode=mode,
+                                 torch_threads=threads if mode == EASYOCR_MODE_CPU_FAST else None)
+        init_seconds = time.perf_counter() - start
+        if not engine.easyocr_reader:
+            report['results'].append({'mode': mode, 'skipped': "reader failed to initialize"})
+            continue
+
+        latencies: List[float] = []
+        errors: List[float] = []
+        for fixture in fixtures:
+            # Warm-up call so allocator growth is not measured
+            text = engine.extract_text(fixture['path'], method='easyocr')
+            errors.append(char_error_rate(fixture['text'], text))
+            for _ in range(repeat):
+                start = time.perf_counter()
+                engine.extract_text(fixture['path'], method='easyocr')
+                latencies.append(time.perf_counter() - start)
+
+        report['results'].append({
+            'mode': mode,
+            'init_seconds': init_seconds,
+            'latency': summarize(latencies),
+            'mean_cer': sum(errors) / len(errors) if errors else 0.0,
+            'recognizer_mb': _weights_mb(engine.easyocr_reader.recognizer),
+        })
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fixtures', default=None,
+                        help="Fixture directory (default: generate the corpus into a temp dir)")
+    parser.add_argument('--language', default='eng', choices=sorted(EASYOCR_LANGUAGES))
+    parser.add_argument('--threads', type=int, default=None,
+                        help="torch threads for cpu_fast (default: all available CPUs)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=None, help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        report = run(args.fixtures, args.language, args.repeat, args.threads)
+    else:
+        with tempfile.TemporaryDirectory(prefix='textcapture-easyocr-cpu-') as fixture_dir:
+            generate(fixture_dir, languages=[args.language])
+            report = run(fixture_dir, args.language, args.repeat, args.threads)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
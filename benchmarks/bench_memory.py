@@ -0,0 +1,109 @@
+"""
+Memory stability check for the C++ OCR engine
+Runs thousands of recognitions of mixed-size images on one engine and fails when
+resident memory keeps growing after warm-up, which would mean the preprocessing
+pipeline allocates per call instead of reusing its scratch buffers
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.fixtures import SAMPLE_TEXT, _font_path, render_text
+from src.ocr.cpp_ocr import CppOCREngine, is_cpp_available
+
+
+def current_rss_mb() -> Optional[float]:
+    """Current resident set size of this process in MB"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--warmup', type=int, default=100,
+                        help="Calls before the baseline is taken (buffers grow to the largest image)")
+    parser.add_argument('--samples', type=int, default=20, help="RSS samples over the run")
+    parser.add_argument('--language', default='eng')
+    parser.add_argument('--max-growth-mb', type=float, default=8.0,
+                        help="Fail when RSS grows more than this after warm-up")
+    args = parser.parse_args()
+
+    if not is_cpp_available():
+        print("C++ OCR module not built, skipping")
+        return 0
+    if current_rss_mb() is None:
+        print("Cannot read RSS on this platform (install psutil), skipping")
+        return 0
+
+    import numpy as np
+
+    # Different sizes and channel counts, so buffers are reused for smaller
+    # images and color conversion is exercised too
+    lines = SAMPLE_TEXT['eng'][:2]
+    images = []
+    for size in (12, 20, 32):
+        gray = np.asarray(render_text(lines, _font_path(), size, noise=0.02, seed=size))
+        images.append(np.ascontiguousarray(gray))
+        images.append(np.ascontiguousarray(np.stack([gray] * 3, axis=2)))
+
+    engine = CppOCREngine()
+    engine.initialize(args.language)
+
+    def run(count: int, offset: int):
+        for index in range(offset, offset + count):
+            engine.extract_text_with_confidence_from_array(images[index % len(images)])
+
+    run(args.warmup, 0)
+    baseline = current_rss_mb()
+    scratch_bytes = engine.get_scratch_bytes()
+
+    step = max(1, args.iterations // args.samples)
+    samples: List[float] = []
+    done = 0
+    while done < args.iterations:
+        count = min(step, args.iterations - done)
+        run(count, args.warmup + done)
+        done += count
+        samples.append(current_rss_mb())
+
+    growth = max(samples) - baseline
+    report = {
+        'iterations': args.iterations,
+        'warmup': args.warmup,
+        'baseline_rss_mb': baseline,
+        'final_rss_mb': samples[-1],
+        'max_growth_mb': growth,
+        'rss_samples_mb': samples,
+        'scratch_bytes': scratch_bytes,
+        'scratch_bytes_after': engine.get_scratch_bytes(),
+    }
+    print(json.dumps(report, indent=2))
+
+    if report['scratch_bytes_after'] != scratch_bytes:
+        print("FAIL: scratch buffers grew after warm-up")
+        return 1
+    if growth > args.max_growth_mb:
+        print(f"FAIL: RSS grew {growth:.1f} MB after warm-up (limit {args.max_growth_mb:.1f} MB)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
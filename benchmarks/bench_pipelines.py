@@ -0,0 +1,160 @@
+"""
+Preprocessing pipeline comparison
+Runs every requested pipeline (presets or JSON specs, see src.ocr.pipeline) on
+the same inputs with each available Tesseract backend and reports recognition
+latency and character error rate, plus the cost of the preprocessing alone
+
+Usage:
+    python benchmarks/bench_pipelines.py
+    python benchmarks/bench_pipelines.py --fixtures bench-fixtures --language eng \\
+        --pipelines binarize fast '[{"op": "normalize"}, {"op": "adaptive_threshold"}]'
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.fixtures import SAMPLE_TEXT, _font_path, load_manifest, render_text
+from benchmarks.run import TESSERACT_LANGUAGES, char_error_rate, summarize
+
+# Built-in preprocessing of each backend, measured next to the declarative pipelines
+DEFAULT = 'default'
+
+# Font sizes of the rendered inputs when no fixture corpus is given
+RENDER_SIZES = (10, 16, 32, 96)
+
+
+def _inputs(fixture_dir: Optional[str], language: str, out_dir: str) -> List[Dict[str, Any]]:
+    """Fixture images of the language, or a small rendered set"""
+    if fixture_dir:
+        return [{'name': fixture['file'],
+                 'path': os.path.join(fixture_dir, fixture['file']),
+                 'text': fixture['text']}
+                for fixture in load_manifest(fixture_dir)['fixtures']
+                if fixture['language'] == language]
+
+    lines = SAMPLE_TEXT[language]
+    inputs = []
+    for size in RENDER_SIZES:
+        path = os.path.join(out_dir, f'pipeline_{size}px.png')
+        render_text(lines, _font_path(), size, noise=0.05, seed=size).save(path)
+        inputs.append({'name': f'{size}px', 'path': path, 'text': '\n'.join(lines)})
+    return inputs
+
+
+def _backends(spec: Optional[Any], language: str) -> Dict[str, Callable[[str], str]]:
+    """Recognizers for every available backend running the given pipeline"""
+    from src.ocr import OCREngine, is_cpp_available
+    from src.ocr.python_ocr import TESSERACT_AVAILABLE
+
+    options = {} if spec is None else {'pipeline': spec}
+    backends = {}
+    if TESSERACT_AVAILABLE:
+        engine = OCREngine(use_cpp=False, use_easyocr=False, language=language, **options)
+        backends['python-tesseract'] = lambda path, engine=engine: engine.extract_text(
+            path, method='tesseract')
+    if is_cpp_available():
+        engine = OCREngine(use_cpp=True, language=language, **options)
+        backends['cpp'] = lambda path, engine=engine: engine.extract_text(path)
+    return backends
+
+
+def _preprocess_latency(steps: List[Dict[str, Any]], inputs: List[Dict[str, Any]], repeat: int) -> Dict[str, float]:
+    """Latency of the compiled pipeline alone (grayscale input, no recognition)"""
+    import numpy as np
+    from PIL import Image
+    from src.ocr.pipeline import run_pipeline
+
+    images = [np.asarray(Image.open(item['path']).convert('L')) for item in inputs]
+    latencies = []
+    for _ in range(repeat):
+        for image in images:
+            start = time.perf_counter()
+            run_pipeline(image, steps)
+            latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def run(pipelines: List[str], inputs: List[Dict[str, Any]], language: str, repeat: int) -> Dict[str, Any]:
+    """
+    Measure every pipeline with every backend on every input
+
+    Returns:
+        Report with per-pipeline preprocessing latency and per-backend
+        recognition latency and mean CER
+    """
+    from src.ocr.pipeline import compile_pipeline, parse_pipeline
+
+    report: Dict[str, Any] = {'language': language, 'repeat': repeat,
+                              'inputs': [item['name'] for item in inputs],
+                              'pipelines': {}, 'results': [], 'skipped': {}}
+    for pipeline in pipelines:
+        spec = None if pipeline == DEFAULT else pipeline
+        steps = compile_pipeline(parse_pipeline(spec)) if spec is not None else None
+        if steps is not None:
+            report['pipelines'][pipeline] = {
+                'steps': [step['name'] for step in steps],
+                'preprocess_latency': _preprocess_latency(steps, inputs, repeat),
+            }
+
+        for backend, recognize in _backends(spec, TESSERACT_LANGUAGES[language]).items():
+            latencies: List[float] = []
+            errors: List[float] = []
+            try:
+                for item in inputs:
+                    # Warm-up call so engine initialization is not measured
+                    text = recognize(item['path'])
+                    errors.append(char_error_rate(item['text'], text))
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        recognize(item['path'])
+                        latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                report['skipped'][backend] = f"{type(e).__name__}: {e}"
+                continue
+            report['results'].append({
+                'pipeline': pipeline,
+                'backend': backend,
+                'latency': summarize(latencies),
+                'mean_cer': sum(errors) / len(errors) if errors else None,
+            })
+    return report
+
+
+def main() -> int:
+    from src.ocr.pipeline import PRESETS
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pipelines', nargs='+', default=[DEFAULT, *PRESETS],
+                        help=f"Preset names or JSON specs ('{DEFAULT}' is each backend's built-in preprocessing)")
+    parser.add_argument('--fixtures', default=None, help="Fixture corpus from benchmarks/fixtures.py")
+    parser.add_argument('--language', default='eng', choices=sorted(TESSERACT_LANGUAGES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=None, help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='textcapture-pipelines-') as out_dir:
+        inputs = _inputs(args.fixtures, args.language, out_dir)
+        if not inputs:
+            print(f"No fixtures for language {args.language}")
+            return 1
+        report = run(args.pipelines, inputs, args.language, args.repeat)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
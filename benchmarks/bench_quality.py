@@ -0,0 +1,127 @@
+"""
+Adaptive preprocessing benchmark
+Renders a crisp screenshot-like image, a low-contrast one, a noisy scan and a
+blurred photo, prints the quality class each gets, then compares latency and
+character error rate with adaptive preprocessing on and off for every
+available Tesseract backend
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.fixtures import SAMPLE_TEXT, _font_path, render_text
+from benchmarks.run import char_error_rate, summarize
+
+# Font size of every input, within the normalization range so only the
+# preprocessing differs
+FONT_SIZE = 24
+
+
+def _render_inputs(out_dir: str) -> Dict[str, Dict[str, Any]]:
+    """Write the inputs and record the quality class of each"""
+    import numpy as np
+    from PIL import Image, ImageFilter
+    from src.ocr.quality import classify_quality, quality_features
+
+    lines = SAMPLE_TEXT['eng']
+    clean = render_text(lines, _font_path(), FONT_SIZE)
+    images = {
+        'screenshot': clean,
+        'low-contrast': Image.fromarray((np.asarray(clean) * 0.3 + 150).astype(np.uint8)),
+        'noisy': render_text(lines, _font_path(), FONT_SIZE, noise=0.1, seed=1),
+        'blurred': clean.filter(ImageFilter.GaussianBlur(1.5)),
+    }
+
+    inputs = {}
+    for name, image in images.items():
+        path = os.path.join(out_dir, f'quality_{name}.png')
+        image.save(path)
+        gray = np.asarray(image)
+        start = time.perf_counter()
+        quality = classify_quality(gray)
+        inputs[name] = {'path': path, 'quality': quality,
+                        'classify_ms': (time.perf_counter() - start) * 1000,
+                        'features': quality_features(gray)}
+    return inputs
+
+
+def _backends(adaptive: bool) -> Dict[str, Callable[[str], str]]:
+    """Recognizers for every available backend with adaptive preprocessing on or off"""
+    from src.ocr import OCREngine, is_cpp_available
+    from src.ocr.python_ocr import TESSERACT_AVAILABLE
+
+    backends = {}
+    if TESSERACT_AVAILABLE:
+        engine = OCREngine(use_cpp=False, use_easyocr=False, adaptive_preprocessing=adaptive)
+        backends['python-tesseract'] = lambda path, engine=engine: engine.extract_text(
+            path, method='tesseract')
+    if is_cpp_available():
+        engine = OCREngine(use_cpp=True, adaptive_preprocessing=adaptive)
+        backends['cpp'] = lambda path, engine=engine: engine.extract_text(path)
+    return backends
+
+
+def run(repeat: int, out_dir: str) -> Dict[str, Any]:
+    """
+    Measure every backend on every input, with and without adaptive preprocessing
+
+    Returns:
+        Report with the quality class per input and latency percentiles and
+        CER per backend, input and setting
+    """
+    expected = '\n'.join(SAMPLE_TEXT['eng'])
+    inputs = _render_inputs(out_dir)
+
+    report: Dict[str, Any] = {'repeat': repeat, 'inputs': inputs, 'results': [], 'skipped': {}}
+    for adaptive in (False, True):
+        for backend, recognize in _backends(adaptive).items():
+            for name, item in inputs.items():
+                # Warm-up call so engine initialization is not measured
+                try:
+                    text = recognize(item['path'])
+                except Exception as e:
+                    report['skipped'][backend] = f"{type(e).__name__}: {e}"
+                    break
+                latencies: List[float] = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    recognize(item['path'])
+                    latencies.append(time.perf_counter() - start)
+                report['results'].append({
+                    'backend': backend,
+                    'input': name,
+                    'adaptive': adaptive,
+                    'latency': summarize(latencies),
+                    'cer': char_error_rate(expected, text),
+                })
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default=None, help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='textcapture-quality-') as out_dir:
+        report = run(args.repeat, out_dir)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Resolution normalization benchmark
+Renders the same text as a 4K-class screenshot, a normal document and a tiny UI
+capture, then compares latency and character error rate with normalization on
+and off for every available Tesseract backend
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.fixtures import SAMPLE_TEXT, _font_path, render_text
+from benchmarks.run import char_error_rate, summarize
+
+
+# name -> font size in pixels (the x-height is about 0.55 of it)
+INPUTS = {
+    'large': 96,
+    'normal': 32,
+    'tiny': 10,
+}
+
+
+def _backends(normalize: bool) -> Dict[str, Callable[[str], str]]:
+    """Recognizers for every available backend, built with normalization on or off"""
+    from src.ocr import OCREngine, is_cpp_available
+    from src.ocr.python_ocr import TESSERACT_AVAILABLE
+
+    backends = {}
+    if TESSERACT_AVAILABLE:
+        engine = OCREngine(use_cpp=False, use_easyocr=False, normalize_resolution=normalize)
+        backends['python-tesseract'] = lambda path, engine=engine: engine.extract_text(
+            path, method='tesseract')
+    if is_cpp_available():
+        engine = OCREngine(use_cpp=True, normalize_resolution=normalize)
+        backends['cpp'] = lambda path, engine=engine: engine.extract_text(path)
+    return backends
+
+
+def run(repeat: int, out_dir: str) -> Dict[str, Any]:
+    """
+    Measure every backend on every input, with and without normalization
+
+    Returns:
+        Report with latency percentiles, CER and the estimated x-height per input
+    """
+    import numpy as np
+    from src.ocr.resolution import estimate_x_height
+
+    lines = SAMPLE_TEXT['eng']
+    expected = '\n'.join(lines)
+    inputs = {}
+    for name, size in INPUTS.items():
+        image = render_text(lines, _font_path(), size, noise=0.02, seed=size)
+        path = os.path.join(out_dir, f'resolution_{name}.png')
+        image.save(path)
+        inputs[name] = {'path': path, 'size': [image.width, image.height],
+                        'x_height': estimate_x_height(np.asarray(image))}
+
+    report: Dict[str, Any] = {'repeat': repeat, 'inputs': inputs, 'results': [], 'skipped': {}}
+    for normalize in (False, True):
+        for backend, recognize in _backends(normalize).items():
+            for name, item in inputs.items():
+                # Warm-up call so engine initialization is not measured
+                try:
+                    text = recognize(item['path'])
+                except Exception as e:
+                    report['skipped'][backend] = f"{type(e).__name__}: {e}"
+                    break
+                latencies: List[float] = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    recognize(item['path'])
+                    latencies.append(time.perf_counter() - start)
+                report['results'].append({
+                    'backend': backend,
+                    'input': name,
+                    'normalize': normalize,
+                    'latency': summarize(latencies),
+                    'cer': char_error_rate(expected, text),
+                })
+
+    # Speedup of the normalized run over the native-size run per backend and input
+    by_key = {(r['backend'], r['input'], r['normalize']): r for r in report['results']}
+    report['speedup'] = {
+        f"{backend}/{name}": by_key[(backend, name, False)]['latency']['p50_ms']
+        / by_key[(backend, name, True)]['latency']['p50_ms']
+        for backend, name, normalize in by_key
+        if normalize and (backend, name, False) in by_key
+    }
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default=None, help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='textcapture-resolution-') as out_dir:
+        report = run(args.repeat, out_dir)
+    if not report['results']:
+        print("No Tesseract backend available, skipping")
+        for backend, reason in report['skipped'].items():
+            print(f"  {backend}: {reason}")
+        return 0
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Multi-threaded stress test for the C++ OCR engine
+Checks that N threads with N separate CppOCREngine instances scale near-linearly,
+which only happens when the native calls release the GIL
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ocr.cpp_ocr import CppOCREngine, is_cpp_available
+
+
+def run_threads(image_path: str, threads: int, iterations: int, language: str) -> float:
+    """
+    Run `iterations` recognitions per thread, one engine per thread
+
+    Returns:
+        Wall-clock seconds for all threads
+    """
+    engines = []
+    for _ in range(threads):
+        engine = CppOCREngine()
+        engine.initialize(language)
+        # Warm-up call so model loading is not measured
+        engine.extract_text(image_path)
+        engines.append(engine)
+
+    barrier = threading.Barrier(threads + 1)
+    errors = []
+
+    def worker(engine):
+        barrier.wait()
+        try:
+            for _ in range(iterations):
+                engine.extract_text(image_path)
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=worker, args=(engine,)) for engine in engines]
+    for worker_thread in workers:
+        worker_thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for worker_thread in workers:
+        worker_thread.join()
+    elapsed = time.perf_counter() - start
+
+    if errors:
+        raise RuntimeError(f"Worker failed: {errors[0]}")
+    return elapsed
+
+
+def measure_gil_starvation(image_path: str, language: str, iterations: int) -> float:
+    """
+    Count how far a pure Python thread gets while OCR runs on another thread
+
+    Returns:
+        Python loop iterations per second achieved during recognition
+    """
+    engine = CppOCREngine()
+    engine.initialize(language)
+    engine.extract_text(image_path)
+
+    done = threading.Event()
+    counter = [0]
+
+    def spin():
+        while not done.is_set():
+            counter[0] += 1
+
+    spinner = threading.Thread(target=spin)
+    start = time.perf_counter()
+    spinner.start()
+    for _ in range(iterations):
+        engine.extract_text(image_path)
+    done.set()
+    spinner.join()
+    return counter[0] / (time.perf_counter() - start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--image', required=True, help="Image used for every recognition")
+    parser.add_argument('--threads', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--language', default='eng')
+    parser.add_argument('--min-efficiency', type=float, default=0.7,
+                        help="Fail when speedup / threads falls below this value")
+    args = parser.parse_args()
+
+    if not is_cpp_available():
+        print("C++ OCR module not built, skipping")
+        return 0
+
+    single = run_threads(args.image, 1, args.iterations, args.language)
+    multi = run_threads(args.image, args.threads, args.iterations, args.language)
+
+    # Same work per thread, so perfect scaling keeps wall time constant
+    speedup = args.threads * single / multi
+    efficiency = speedup / args.threads
+    report = {
+        'threads': args.threads,
+        'iterations_per_thread': args.iterations,
+        'single_thread_seconds': single,
+        'multi_thread_seconds': multi,
+        'speedup': speedup,
+        'efficiency': efficiency,
+        'python_loops_per_second_during_ocr': measure_gil_starvation(
+            args.image, args.language, args.iterations),
+    }
+    print(json.dumps(report, indent=2))
+
+    if efficiency < args.min_efficiency:
+        print(f"FAIL: efficiency {efficiency:.2f} below {args.min_efficiency:.2f}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
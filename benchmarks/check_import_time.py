@@ -0,0 +1,108 @@
+"""
+Import-time budget check based on `python -X importtime`
+Fails when importing the OCR package regresses past its budget, or when the OCR
+package, the CLI or the app entry point starts pulling in heavy dependencies
+that must only load on first use (test/test_import_time.py runs the same checks)
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Statement executed in a fresh interpreter, mirrors what app startup needs from src.ocr
+STARTUP_STATEMENT = "import src.ocr; from src.ocr import get_engine, get_engine_pool"
+
+# Top-level packages that must not be imported by the statement above
+FORBIDDEN_MODULES = ('torch', 'easyocr', 'cv2', 'PySide6', 'pytesseract', 'numpy')
+
+# Further entry points: statement and the packages it must not import. The
+# CLI never needs Qt; the app needs Qt but loads OCR backends on first use.
+ENTRY_POINTS = (
+    ("import src.ocr.cli", FORBIDDEN_MODULES),
+    ("import src.app", tuple(name for name in FORBIDDEN_MODULES if name != 'PySide6')),
+)
+
+
+def measure(statement: str):
+    """
+    Run `statement` under -X importtime in a fresh interpreter
+
+    Returns:
+        Tuple of (total cumulative microseconds, {module: cumulative microseconds})
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+
+    modules = {}
+    project = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        # Format: "import time: <self us> | <cumulative us> | <indented module name>"
+        _, cumulative_us, raw_name = line[len('import time:'):].split('|')
+        name = raw_name.strip()
+        modules[name] = int(cumulative_us)
+        # Nested imports are indented; only count top-level project imports so
+        # cumulative times are not added twice
+        if name.startswith('src') and raw_name[1:] == raw_name.lstrip():
+            project += int(cumulative_us)
+
+    return project, modules
+
+
+def forbidden_imports(modules, forbidden=FORBIDDEN_MODULES):
+    """Sorted top-level packages of `forbidden` present in a measure() module map"""
+    return sorted({name.split('.')[0] for name in modules} & set(forbidden))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=50.0,
+                        help="Maximum cumulative import time of src.* modules")
+    parser.add_argument('--runs', type=int, default=5,
+                        help="Best of N runs, to filter out noise")
+    args = parser.parse_args()
+
+    best = None
+    modules = {}
+    for _ in range(args.runs):
+        total_us, modules = measure(STARTUP_STATEMENT)
+        best = total_us if best is None else min(best, total_us)
+
+    forbidden = forbidden_imports(modules)
+    entry_points = {}
+    for statement, entry_forbidden in ENTRY_POINTS:
+        try:
+            _, entry_modules = measure(statement)
+        except subprocess.CalledProcessError as e:
+            entry_points[statement] = {'error': e.stderr.strip().splitlines()[-1]}
+            continue
+        entry_points[statement] = {'forbidden_imported': forbidden_imports(entry_modules, entry_forbidden)}
+        forbidden += entry_points[statement]['forbidden_imported']
+    report = {
+        'statement': STARTUP_STATEMENT,
+        'import_ms': best / 1000.0,
+        'budget_ms': args.budget_ms,
+        'forbidden_imported': forbidden,
+        'slowest': sorted(modules.items(), key=lambda item: -item[1])[:10],
+        'entry_points': entry_points,
+    }
+    print(json.dumps(report, indent=2))
+
+    if forbidden:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(sorted(set(forbidden)))}")
+        return 1
+    if best / 1000.0 > args.budget_ms:
+        print(f"FAIL: import took {best / 1000.0:.1f} ms, budget is {args.budget_ms:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
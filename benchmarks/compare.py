@@ -0,0 +1,83 @@
+"""
+Compare two benchmark reports written by benchmarks/run.py
+Prints per-target deltas and optionally fails on latency regressions
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Any, Optional
+
+
+METRICS = (
+    ('p50_ms', lambda r: r['latency']['p50_ms'], True),
+    ('p99_ms', lambda r: r['latency']['p99_ms'], True),
+    ('img/s', lambda r: r['throughput_images_per_second'], False),
+    ('rss_mb', lambda r: r.get('peak_rss_mb'), True),
+)
+
+
+def _delta(old: Optional[float], new: Optional[float]) -> Optional[float]:
+    if old is None or new is None or old == 0:
+        return None
+    return (new - old) / old * 100.0
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float):
+    """
+    Compare two reports
+
+    Returns:
+        Tuple of (printable lines, list of regressions)
+    """
+    lines = [f"{'target':<20} {'metric':<8} {'old':>10} {'new':>10} {'delta':>8}"]
+    regressions = []
+
+    for target in sorted(set(old['results']) | set(new['results'])):
+        old_result = old['results'].get(target, {})
+        new_result = new['results'].get(target, {})
+        if 'latency' not in old_result or 'latency' not in new_result:
+            lines.append(f"{target:<20} (not measured in both reports)")
+            continue
+
+        for name, getter, lower_is_better in METRICS:
+            old_value, new_value = getter(old_result), getter(new_result)
+            delta = _delta(old_value, new_value)
+            delta_text = f"{delta:+.1f}%" if delta is not None else 'n/a'
+            lines.append(f"{target:<20} {name:<8} {old_value or 0:>10.2f} "
+                         f"{new_value or 0:>10.2f} {delta_text:>8}")
+            if delta is None or name == 'rss_mb':
+                continue
+            worse = delta if lower_is_better else -delta
+            if worse > threshold:
+                regressions.append(f"{target} {name} {delta_text}")
+
+    return lines, regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('old', help="Baseline report")
+    parser.add_argument('new', help="Candidate report")
+    parser.add_argument('--fail-threshold', type=float, default=None,
+                        help="Exit non-zero when a latency/throughput metric regresses by more than this percent")
+    args = parser.parse_args()
+
+    with open(args.old, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(args.new, encoding='utf-8') as f:
+        new = json.load(f)
+
+    threshold = args.fail_threshold if args.fail_threshold is not None else float('inf')
+    lines, regressions = compare(old, new, threshold)
+    print(f"old: {old['meta'].get('commit')}  new: {new['meta'].get('commit')}")
+    print('\n'.join(lines))
+
+    if regressions:
+        print("Regressions: " + ', '.join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+OCR hot-path benchmark suite
+Measures latency percentiles, throughput, peak RSS, engine init time and accuracy
+per target on the synthetic fixture corpus and writes machine-readable JSON
+
+Usage:
+    python benchmarks/run.py --output bench.json
+    python benchmarks/compare.py old.json bench.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+# Language codes per backend family
+TESSERACT_LANGUAGES = {'eng': 'eng', 'vie': 'vie', 'jpn': 'jpn'}
+EASYOCR_LANGUAGES = {'eng': 'en', 'vie': 'vi', 'jpn': 'ja'}
+
+
+def _setup_python_tesseract(language: str) -> Callable[[str], Any]:
+    from src.ocr import OCREngine
+    engine = OCREngine(use_cpp=False, use_easyocr=False,
+                       language=TESSERACT_LANGUAGES[language])
+    return lambda path: engine.extract_text(path, method='tesseract')
+
+
+def _setup_python_tesseract_inproc(language: str) -> Callable[[str], Any]:
+    from src.ocr import OCREngine
+    from src.ocr.tesseract_capi import is_libtesseract_available
+    if not is_libtesseract_available():
+        raise RuntimeError("libtesseract not found")
+    engine = OCREngine(use_cpp=False, use_easyocr=False,
+                       language=TESSERACT_LANGUAGES[language])
+    return lambda path: engine.extract_text(path, method='tesseract_inproc')
+
+
+def _setup_python_easyocr(language: str) -> Callable[[str], Any]:
+    from src.ocr import OCREngine
+    engine = OCREngine(use_cpp=False, use_tesseract=False,
+                       language=EASYOCR_LANGUAGES[language])
+    return lambda path: engine.extract_text(path, method='easyocr')
+
+
+def _setup_cpp(language: str) -> Callable[[str], Any]:
+    from src.ocr import OCREngine, is_cpp_available
+    if not is_cpp_available():
+        raise RuntimeError("C++ OCR module not built")
+    engine = OCREngine(use_cpp=True, language=TESSERACT_LANGUAGES[language])
+    return lambda path: engine.extract_text(path)
+
+
+def _setup_preprocess_python(language: str) -> Callable[[str], Any]:
+    from src.ocr.python_ocr import PythonOCREngine, TESSERACT_AVAILABLE
+    if not TESSERACT_AVAILABLE:
+        raise RuntimeError("Pillow/pytesseract not installed")
+    engine = PythonOCREngine(use_easyocr=False)
+    # Force decoding so lazy PIL loading is part of the measurement
+    return lambda path: engine.preprocess_image(path).load()
+
+
+def _setup_preprocess_cpp(language: str) -> Callable[[str], Any]:
+    from src.ocr import CppOCREngine, is_cpp_available
+    if not is_cpp_available():
+        raise RuntimeError("C++ OCR module not built")
+    engine = CppOCREngine()
+    engine.initialize(TESSERACT_LANGUAGES[language])
+    return lambda path: engine.preprocess_image(path)
+
+
+# name -> (setup, whether the call returns recognized text)
+TARGETS: Dict[str, Tuple[Callable[[str], Callable[[str], Any]], bool]] = {
+    'python-tesseract': (_setup_python_tesseract, True),
+    'python-tesseract-inproc': (_setup_python_tesseract_inproc, True),
+    'python-easyocr': (_setup_python_easyocr, True),
+    'cpp': (_setup_cpp, True),
+    'preprocess-python': (_setup_preprocess_python, False),
+    'preprocess-cpp': (_setup_preprocess_cpp, False),
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Linear-interpolated percentile of a non-empty list, q in [0, 100]"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def char_error_rate(expected: str, actual: str) -> float:
+    """Levenshtein distance over characters divided by the expected length (whitespace-normalized)"""
+    expected = ' '.join(expected.split())
+    actual = ' '.join((actual or '').split())
+    if not expected:
+        return 0.0 if not actual else 1.0
+
+    previous = list(range(len(actual) + 1))
+    for i, expected_char in enumerate(expected, 1):
+        current = [i]
+        for j, actual_char in enumerate(actual, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (expected_char != actual_char)))
+        previous = current
+    return previous[-1] / len(expected)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB"""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+        except (ImportError, AttributeError):
+            return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """Latency percentiles in milliseconds"""
+    return {
+        'count': len(latencies),
+        'mean_ms': sum(latencies) / len(latencies) * 1000,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p90_ms': percentile(latencies, 90) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'min_ms': min(latencies) * 1000,
+        'max_ms': max(latencies) * 1000,
+    }
+
+
+def run_target(name: str, fixtures: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    """
+    Benchmark one target in the current process (called in a fresh child process)
+
+    Returns:
+        Result dictionary for the target
+    """
+    setup, recognizes = TARGETS[name]
+    by_language: Dict[str, List[Dict[str, Any]]] = {}
+    for fixture in fixtures:
+        by_language.setdefault(fixture['language'], []).append(fixture)
+
+    result: Dict[str, Any] = {'languages': {}}
+    all_latencies: List[float] = []
+    total_seconds = 0.0
+
+    for language, items in sorted(by_language.items()):
+        start = time.perf_counter()
+        call = setup(language)
+        init_seconds = time.perf_counter() - start
+
+        # Warm-up pass, not measured
+        outputs = {fixture['file']: call(fixture['path']) for fixture in items}
+
+        latencies = []
+        for _ in range(repeat):
+            for fixture in items:
+                start = time.perf_counter()
+                call(fixture['path'])
+                latencies.append(time.perf_counter() - start)
+        all_latencies.extend(latencies)
+        total_seconds += sum(latencies)
+
+        language_result = {'init_seconds': init_seconds, 'latency': summarize(latencies)}
+        if recognizes:
+            errors = [char_error_rate(fixture['text'], outputs[fixture['file']])
+                      for fixture in items]
+            language_result['mean_cer'] = sum(errors) / len(errors)
+        result['languages'][language] = language_result
+
+    result['latency'] = summarize(all_latencies)
+    result['throughput_images_per_second'] = len(all_latencies) / total_seconds if total_seconds else 0.0
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def _child_main(args) -> int:
+    """Entry point of the per-target child process"""
+    from benchmarks.fixtures import load_manifest
+
+    fixtures = [fixture for fixture in load_manifest(args.fixtures)['fixtures']
+                if fixture['language'] in args.languages]
+    real_stdout = sys.stdout
+    try:
+        # Engine diagnostics must not corrupt the JSON written to stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            result = run_target(args.child, fixtures, args.repeat)
+    except Exception as e:
+        result = {'skipped': f"{type(e).__name__}: {e}"}
+    real_stdout.write(json.dumps(result) + '\n')
+    return 0
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fixtures', default=None,
+                        help="Fixture directory (generated into a temp dir when omitted)")
+    parser.add_argument('--targets', nargs='+', default=list(TARGETS), choices=list(TARGETS))
+    parser.add_argument('--languages', nargs='+', default=['eng', 'vie'])
+    parser.add_argument('--repeat', type=int, default=3, help="Measured passes over the corpus")
+    parser.add_argument('--output', '-o', default=None, help="Write JSON here instead of stdout")
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return _child_main(args)
+
+    fixture_dir = args.fixtures
+    if fixture_dir is None or not os.path.exists(os.path.join(fixture_dir, 'manifest.json')):
+        from benchmarks.fixtures import generate
+        fixture_dir = fixture_dir or tempfile.mkdtemp(prefix='textcapture-fixtures-')
+        generate(fixture_dir, languages=args.languages)
+
+    report: Dict[str, Any] = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': args.repeat,
+            'languages': args.languages,
+            'fixtures': fixture_dir,
+        },
+        'results': {},
+    }
+
+    for target in args.targets:
+        # One process per target: init time and peak RSS are not polluted by other targets
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', target,
+             '--fixtures', fixture_dir, '--repeat', str(args.repeat),
+             '--languages', *args.languages],
+            cwd=ROOT, capture_output=True, text=True)
+        lines = completed.stdout.strip().splitlines()
+        if completed.returncode != 0 or not lines:
+            report['results'][target] = {'skipped': completed.stderr.strip()[-500:] or 'child failed'}
+        else:
+            report['results'][target] = json.loads(lines[-1])
+        print(f"{target}: {'skipped' if 'skipped' in report['results'][target] else 'done'}",
+              file=sys.stderr)
+
+    encoded = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(encoded + '\n')
+    else:
+        print(encoded)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,2 +1,8 @@
 # App package initialization
-from .app import run_app
+
+
+def run_app():
+    """Run the Qt application (imported lazily so headless tools such as
+    `python -m src.ocr` never load PySide6)"""
+    from .app import run_app as _run_app
+    return _run_app()
@@ -2,11 +2,22 @@
 Button action handlers
 """
 
+import logging
+import os
 import re
-from src.core.async_utils import async_action, safe_ui_update
+import threading
+from src.core.async_utils import async_action, submit_action, safe_ui_update
+from src.core.job_queue import current_job
 from PySide6.QtGui import QTextCharFormat, QFont
 from PySide6.QtCore import QCoreApplication
-from src.ocr import OCREngine
+from src.ocr import get_engine, get_engine_pool
+
+logger = logging.getLogger(__name__)
+
+# Mapping cho Tesseract (C++/Python Tesseract)
+TESSERACT_LANGUAGES = {"En": "eng", "Vi": "vie", "Jp": "jpn"}
+# Mapping cho EasyOCR (chuẩn ISO)
+EASYOCR_LANGUAGES = {"En": "en", "Vi": "vi", "Jp": "ja"}
 
 
 class ButtonActions:
@@ -24,6 +35,28 @@ class ButtonActions:
         # Initialize default language
         self.current_language = "eng"
 
+    def prewarm_ocr(self):
+        """Build the default OCR engine in the background after the window is shown
+
+        Warms the engine _recognize asks the pool for first with the selected
+        language, so the first Get Text click finds it warm instead of paying
+        for the backend imports and model loading. Disabled with
+        TEXTCAPTURE_PREWARM=0.
+        """
+        if os.environ.get("TEXTCAPTURE_PREWARM", "1") == "0":
+            return
+
+        # Read on the GUI thread, widgets must not be touched from the warm-up thread
+        use_cpp, language = self._first_engine(self.main_window.ui.cbLanguage.currentText())
+
+        def warm_up():
+            try:
+                get_engine(use_cpp=use_cpp, language=language, use_cache=True)
+            except Exception as e:
+                logger.warning("OCR pre-warming failed: %s", e)
+
+        threading.Thread(target=warm_up, name="ocr-prewarm", daemon=True).start()
+
     def _get_text_from_editor(self):
         return self.main_window.ui.txtEdit.toPlainText()
 
@@ -266,9 +299,8 @@ class ButtonActions:
             )
             self.main_window.ui.lbImageArea.image_path = None
         except Exception as e:
-            print(f"Error clearing image: {e}")
+            logger.error("Error clearing image: %s", e)
 
-    @async_action
     def on_get_text_clicked(self):
         """Action for Get Text button"""
         image_path = self._get_current_image_path()
@@ -277,31 +309,60 @@ class ButtonActions:
             return
 
         current_ui_language = self.main_window.ui.cbLanguage.currentText()
-        # Mapping cho Tesseract (C++/Python Tesseract)
-        tesseract_mapping = {"En": "eng", "Vi": "vie", "Jp": "jpn"}
-        # Mapping cho EasyOCR (chuẩn ISO)
-        easyocr_mapping = {"En": "en", "Vi": "vi", "Jp": "ja"}
-        selected_language_tesseract = tesseract_mapping.get(current_ui_language, "eng")
-        selected_language_easyocr = easyocr_mapping.get(current_ui_language, "en")
+        # Clicking again for the same image and language joins the running job;
+        # loading another image cancels it (MainWindow._load_image)
+        submit_action(
+            self.main_window,
+            self._recognize,
+            image_path,
+            current_ui_language,
+            key=("ocr", image_path, current_ui_language),
+            group="ocr",
+            on_finished=self._set_text_to_editor,
+        )
+
+    @staticmethod
+    def _extract_text(ocr_engine, image_path):
+        """Extract text, aborted through engine.cancel() when the OCR job is cancelled"""
+        ocr_engine.reset_cancel()
+        job = current_job()
+        if job is not None:
+            job.add_cancel_callback(ocr_engine.cancel)
+        return ocr_engine.extract_text(image_path)
+
+    @staticmethod
+    def _job_cancelled():
+        job = current_job()
+        return job is not None and job.is_cancelled()
+
+    @staticmethod
+    def _first_engine(ui_language):
+        """(use_cpp, language) of the first engine _recognize gets from the pool"""
+        if TESSERACT_LANGUAGES.get(ui_language) == "jpn":
+            return False, EASYOCR_LANGUAGES[ui_language]
+        # C++ is asked for first even when it is not built (the engine then falls back to Python)
+        return True, TESSERACT_LANGUAGES.get(ui_language, "eng")
+
+    def _recognize(self, image_path, current_ui_language):
+        """Run OCR on a worker thread and return the text to show in the editor"""
+        selected_language_tesseract = TESSERACT_LANGUAGES.get(current_ui_language, "eng")
+        selected_language_easyocr = EASYOCR_LANGUAGES.get(current_ui_language, "en")
 
         # Nếu là tiếng Nhật, ép dùng EasyOCR (Python)
         if selected_language_tesseract == "jpn":
             try:
-                print("Forcing EasyOCR for Japanese...")
-                ocr_engine = OCREngine(use_cpp=False, language=selected_language_easyocr)
-                extracted_text = ocr_engine.extract_text(image_path)
+                logger.debug("Forcing EasyOCR for Japanese")
+                ocr_engine = get_engine(use_cpp=False, language=selected_language_easyocr, use_cache=True)
+                extracted_text = self._extract_text(ocr_engine, image_path)
                 if extracted_text and extracted_text.strip():
-                    print("EasyOCR (Python) successful for Japanese")
-                    self._set_text_to_editor_safe(extracted_text)
-                    return
+                    logger.debug("EasyOCR (Python) successful for Japanese")
+                    return extracted_text
                 else:
-                    print("EasyOCR (Python) returned empty text for Japanese")
-                    self._set_text_to_editor_safe("❌ Không thể nhận dạng văn bản tiếng Nhật từ ảnh này.\n\n💡 Gợi ý:\n- Kiểm tra chất lượng ảnh\n- Đảm bảo ảnh có text rõ ràng\n- Thử với ảnh khác")
-                    return
+                    logger.info("EasyOCR (Python) returned empty text for Japanese")
+                    return "❌ Không thể nhận dạng văn bản tiếng Nhật từ ảnh này.\n\n💡 Gợi ý:\n- Kiểm tra chất lượng ảnh\n- Đảm bảo ảnh có text rõ ràng\n- Thử với ảnh khác"
             except Exception as e:
-                print(f"EasyOCR (Python) failed for Japanese: {e}")
-                self._set_text_to_editor_safe(f"❌ EasyOCR lỗi: {str(e)}")
-                return
+                logger.error("EasyOCR (Python) failed for Japanese: %s", e)
+                return f"❌ EasyOCR lỗi: {str(e)}"
 
         # Try C++ implementation first, then fallback to Python
         extracted_text = None
@@ -309,44 +370,47 @@ class ButtonActions:
         
         # First attempt: C++ implementation
         try:
-            print(f"Attempting C++ OCR with language: {selected_language_tesseract}")
-            ocr_engine = OCREngine(use_cpp=True, language=selected_language_tesseract)
-            extracted_text = ocr_engine.extract_text(image_path)
+            logger.debug("Attempting C++ OCR with language: %s", selected_language_tesseract)
+            ocr_engine = get_engine(use_cpp=True, language=selected_language_tesseract, use_cache=True)
+            extracted_text = self._extract_text(ocr_engine, image_path)
             
             if extracted_text and extracted_text.strip():
-                print("C++ OCR successful")
-                self._set_text_to_editor_safe(extracted_text)
-                return
+                logger.debug("C++ OCR successful")
+                return extracted_text
             else:
-                print("C++ OCR returned empty text, trying Python fallback...")
+                logger.info("C++ OCR returned empty text, trying Python fallback")
                 error_message = "C++ OCR không nhận diện được text, đang thử Python..."
                 
         except Exception as e:
-            print(f"C++ OCR failed: {e}")
+            if self._job_cancelled():
+                # Aborted on purpose, the result is dropped anyway
+                return None
+            logger.warning("C++ OCR failed: %s", e)
+            # Do not keep a broken engine warm
+            get_engine_pool().discard(use_cpp=True, language=selected_language_tesseract, use_cache=True)
             error_message = f"C++ OCR lỗi: {str(e)}, đang thử Python..."
         
         # Second attempt: Python implementation
         try:
-            print(f"Attempting Python OCR with language: {selected_language_easyocr}")
-            ocr_engine = OCREngine(use_cpp=False, language=selected_language_easyocr)
-            extracted_text = ocr_engine.extract_text(image_path)
+            logger.debug("Attempting Python OCR with language: %s", selected_language_easyocr)
+            ocr_engine = get_engine(use_cpp=False, language=selected_language_easyocr, use_cache=True)
+            extracted_text = self._extract_text(ocr_engine, image_path)
             
             if extracted_text and extracted_text.strip():
-                print("Python OCR successful")
-                self._set_text_to_editor_safe(extracted_text)
-                return
+                logger.debug("Python OCR successful")
+                return extracted_text
             else:
-                print("Python OCR also returned empty text")
-                self._set_text_to_editor_safe("❌ Không thể nhận dạng văn bản từ ảnh này.\n\n💡 Gợi ý:\n- Kiểm tra chất lượng ảnh\n- Đảm bảo ảnh có text rõ ràng\n- Thử với ngôn ngữ khác")
+                logger.info("Python OCR also returned empty text")
+                return "❌ Không thể nhận dạng văn bản từ ảnh này.\n\n💡 Gợi ý:\n- Kiểm tra chất lượng ảnh\n- Đảm bảo ảnh có text rõ ràng\n- Thử với ngôn ngữ khác"
                 
         except Exception as e:
-            print(f"Python OCR failed: {e}")
-            self._set_text_to_editor_safe(f"❌ Cả C++ và Python OCR đều lỗi:\n\nC++: {error_message}\nPython: {str(e)}\n\n💡 Gợi ý:\n- Kiểm tra ảnh có hợp lệ không\n- Thử ảnh khác\n- Kiểm tra cài đặt Tesseract")
+            logger.error("Python OCR failed: %s", e)
+            return f"❌ Cả C++ và Python OCR đều lỗi:\n\nC++: {error_message}\nPython: {str(e)}\n\n💡 Gợi ý:\n- Kiểm tra ảnh có hợp lệ không\n- Thử ảnh khác\n- Kiểm tra cài đặt Tesseract"
 
     @async_action
     def on_language_changed(self, text=None):
         """Action for Language button"""
-        print(f"Language changed to: {text}")
+        logger.debug("Language changed to: %s", text)
 
         # Map UI language codes to Tesseract language codes
         language_mapping = {"En": "eng", "Vi": "vie", "Jp": "jpn"}
@@ -377,7 +441,7 @@ class ButtonActions:
                 "Chức năng chụp ảnh từ camera đang được phát triển..."
             )
         except Exception as e:
-            print(f"Error capturing from camera: {e}")
+            logger.error("Error capturing from camera: %s", e)
             self._set_text_to_editor_safe(f"Lỗi khi mở camera: {str(e)}")
 
     def _select_from_device(self):
@@ -397,10 +461,10 @@ class ButtonActions:
                 # Load the selected image into the image area
                 self._load_image_to_area(file_path)
             else:
-                print("No file selected")
+                logger.debug("No file selected")
 
         except Exception as e:
-            print(f"Error selecting from device: {e}")
+            logger.error("Error selecting from device: %s", e)
             self._set_text_to_editor_safe(f"Lỗi khi chọn ảnh: {str(e)}")
 
     def _load_image_to_area(self, image_path):
@@ -409,7 +473,7 @@ class ButtonActions:
             # Use thread-safe method to load image
             safe_ui_update(self.main_window, "_load_image_to_area", image_path)
         except Exception as e:
-            print(f"Error loading image to area: {e}")
+            logger.error("Error loading image to area: %s", e)
             self._set_text_to_editor_safe(f"Lỗi khi tải ảnh: {str(e)}")
 
     def get_current_language_info(self):
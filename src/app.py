@@ -2,6 +2,7 @@
 Main entry point for the TextCapture application
 """
 
+import logging
 import sys
 import os
 
@@ -9,12 +10,18 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__))))
 
 from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QTimer
 from src.utils import ResourceLoader
 from src.ui.main_window import MainWindow
 
 
 def run_app():
     """Main function to run the application"""
+    # TEXTCAPTURE_LOG_LEVEL=DEBUG enables per-image OCR logs (Python and C++)
+    logging.basicConfig(
+        level=os.environ.get("TEXTCAPTURE_LOG_LEVEL", "WARNING").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
     app = QApplication(sys.argv)
     
     resource_loader = ResourceLoader()
@@ -26,6 +33,10 @@ def run_app():
     # Create and show main window
     widget = MainWindow()
     widget.show()
+    app.aboutToQuit.connect(widget.job_queue.shutdown)
+
+    # Load the OCR backend once the event loop is running, off the GUI thread
+    QTimer.singleShot(0, widget.button_actions.prewarm_ocr)
 
     return app.exec()
 
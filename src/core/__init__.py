@@ -1,5 +1,6 @@
 # Core package initialization
-from .async_utils import async_action, ActionThread
+from .async_utils import async_action, submit_action
+from .job_queue import Job, JobQueue
 from .button_manager import ButtonManager
 
-__all__ = ["async_action", "ActionThread", "ButtonManager"]
+__all__ = ["async_action", "submit_action", "Job", "JobQueue", "ButtonManager"]
@@ -1,10 +1,12 @@
 """
-Async utilities for handling button actions in separate threads
+Async utilities for running button actions on the job queue
 """
 
-import time
+import logging
 from functools import wraps
-from PySide6.QtCore import QThread, SIGNAL, QMetaObject, Qt, QObject, Signal
+from PySide6.QtCore import QObject, Signal
+
+logger = logging.getLogger(__name__)
 
 
 class UIUpdateSignal(QObject):
@@ -16,54 +18,37 @@ class UIUpdateSignal(QObject):
     show_upload_menu = Signal()
 
 
-def async_action(func):
-    """Decorator to run action in separate thread and automatically enable buttons"""
+def submit_action(main_window, func, *args, key=None, group=None, on_finished=None, **kwargs):
+    """Queue func(*args, **kwargs) on the window's job queue and disable the other buttons
 
-    @wraps(func)
-    def wrapper(self, *args, **kwargs):
-        # Check if another action is already running
-        if (
-            hasattr(self.main_window, "action_thread")
-            and self.main_window.action_thread
-            and self.main_window.action_thread.isRunning()
-        ):
-            print("Action is already running, skipping...")
-            return
-
-        # Disable all buttons except the current one
-        if hasattr(self.main_window, "disable_other_buttons"):
-            self.main_window.disable_other_buttons(self.main_window.sender())
-
-        # Create thread to run action
-        self.main_window.action_thread = ActionThread(func, self, *args, **kwargs)
-        if hasattr(self.main_window, "on_action_finished"):
-            self.main_window.action_thread.connect(
-                SIGNAL("finished()"), self.main_window.on_action_finished
-            )
-        self.main_window.action_thread.start()
+    Buttons are enabled again by the queue's idle signal (see MainWindow).
+    Returns the Job, which may be an already queued job with the same key.
+    """
+    if hasattr(main_window, "disable_other_buttons"):
+        main_window.disable_other_buttons(main_window.sender())
 
-    return wrapper
+    return main_window.job_queue.submit(
+        func, args, kwargs, key=key, group=group, on_finished=on_finished
+    )
 
 
-class ActionThread(QThread):
-    """Thread to run asynchronous actions"""
+def async_action(func):
+    """Decorator to run an action on the window's job queue
 
-    def __init__(self, func, instance, *args, **kwargs):
-        super().__init__()
-        self.func = func
-        self.instance = instance
-        self.args = args
-        self.kwargs = kwargs
+    Repeated clicks while the same action is still queued or running are
+    coalesced into one job instead of being dropped or run twice.
+    """
 
-    def run(self):
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        key = (func.__qualname__, id(self)) + args
         try:
-            # Add small delay to avoid spamming
-            time.sleep(0.1)
-            self.func(self.instance, *self.args, **self.kwargs)
-        except Exception as e:
-            print(f"Error in action: {e}")
-        finally:
-            self.emit(SIGNAL("finished()"))
+            hash(key)
+        except TypeError:
+            key = None
+        submit_action(self.main_window, func, self, *args, key=key, **kwargs)
+
+    return wrapper
 
 
 def safe_ui_update(main_window, method_name, *args, **kwargs):
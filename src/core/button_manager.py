@@ -8,7 +8,6 @@ class ButtonManager:
 
     def __init__(self, buttons):
         self.buttons = buttons
-        self.action_thread = None
 
     def disable_other_buttons(self, active_button):
         """Disable all buttons except the active one"""
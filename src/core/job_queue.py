@@ -0,0 +1,273 @@
+"""
+Background job queue for button actions and OCR requests
+Runs jobs on a bounded thread pool, coalesces duplicate requests and drops the
+results of cancelled jobs. Results are delivered through Qt signals, so slots
+connected from the GUI thread run on the GUI thread.
+"""
+
+import itertools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+from PySide6.QtCore import QObject, Signal
+
+logger = logging.getLogger(__name__)
+
+# Job running on the current worker thread
+_current = threading.local()
+
+
+def current_job() -> Optional["Job"]:
+    """Job running on the calling worker thread, None outside the queue"""
+    return getattr(_current, "job", None)
+
+
+class Job(QObject):
+    """Handle of a queued job"""
+
+    finished = Signal(object)
+    failed = Signal(object)
+    cancelled = Signal()
+
+    def __init__(self, queue, job_id: int, key: Optional[Hashable], group: Optional[str]):
+        super().__init__()
+        self.id = job_id
+        self.key = key
+        self.group = group
+        self.future = None
+        self._queue = queue
+        self._cancelled = threading.Event()
+        self._cancel_callbacks: List[Callable[[], Any]] = []
+        self._callbacks_lock = threading.Lock()
+
+    def cancel(self) -> bool:
+        """
+        Cancel the job
+
+        A pending job never runs; a running job is asked to stop through its
+        cancel callbacks, its result is dropped and 'cancelled' is emitted
+        instead of 'finished'.
+
+        Returns:
+            True if the job was not already finished
+        """
+        return self._queue.cancel(self)
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def add_cancel_callback(self, callback: Callable[[], Any]):
+        """
+        Call callback when the job is cancelled while running, e.g. engine.cancel
+
+        Called at once if the job is already cancelled.
+        """
+        with self._callbacks_lock:
+            if not self.is_cancelled():
+                self._cancel_callbacks.append(callback)
+                return
+        callback()
+
+    def _run_cancel_callbacks(self):
+        """Run the cancel callbacks once, errors are logged"""
+        with self._callbacks_lock:
+            callbacks, self._cancel_callbacks = self._cancel_callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning("Cancel callback of %r failed: %s", self, e)
+
+    def __repr__(self):
+        return f"Job(id={self.id}, key={self.key!r}, group={self.group!r})"
+
+
+class JobQueue(QObject):
+    """
+    Bounded worker pool with duplicate coalescing and group cancellation
+    """
+
+    # Emitted when no live (non-cancelled) job is left
+    idle = Signal()
+    # Internal: queued behind a job's terminal signal, releases the job
+    _delivered = Signal(int)
+
+    def __init__(self, max_workers: int = 2, parent: Optional[QObject] = None,
+                 serial_groups: Sequence[str] = ()):
+        """
+        Initialize job queue
+
+        Args:
+            max_workers: Maximum number of jobs running at the same time
+            parent: Parent QObject, the queue lives in its thread
+            serial_groups: Groups whose jobs run one at a time on a worker of
+                their own, e.g. jobs sharing a non-reentrant OCR engine
+        """
+        super().__init__(parent)
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="textcapture-job")
+        self._group_executors = {
+            group: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"textcapture-{group}")
+            for group in serial_groups
+        }
+        self._active: Dict[int, Job] = {}
+        self._by_key: Dict[Hashable, Job] = {}
+        # Jobs whose terminal signal may still be queued for the GUI thread;
+        # held here so the caller does not have to keep the Job alive
+        self._finishing: Dict[int, Job] = {}
+        self._delivered.connect(self._release)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable[..., Any], args: Sequence[Any] = (),
+               kwargs: Optional[Dict[str, Any]] = None, key: Optional[Hashable] = None,
+               group: Optional[str] = None,
+               on_finished: Optional[Callable[[Any], None]] = None,
+               on_failed: Optional[Callable[[BaseException], None]] = None) -> Job:
+        """
+        Queue func(*args, **kwargs)
+
+        Args:
+            func: Callable run on a worker thread
+            args: Positional arguments
+            kwargs: Keyword arguments
+            key: Jobs with an equal key that are still pending or running are
+                coalesced: the existing job is returned and nothing is queued
+            group: Name used by cancel_group()
+            on_finished: Connected to 'finished' of a newly created job
+            on_failed: Connected to 'failed' of a newly created job
+
+        Returns:
+            The new job, or the live job it was coalesced with
+        """
+        with self._lock:
+            if key is not None:
+                existing = self._by_key.get(key)
+                if existing is not None and not existing.is_cancelled():
+                    logger.debug("Coalesced duplicate job %r", existing)
+                    return existing
+
+            job = Job(self, next(self._ids), key, group)
+            # Signals are delivered through the queue's (GUI) thread even when
+            # submit() is called from a worker
+            job.moveToThread(self.thread())
+            if on_finished is not None:
+                job.finished.connect(on_finished)
+            if on_failed is not None:
+                job.failed.connect(on_failed)
+
+            self._active[job.id] = job
+            if key is not None:
+                self._by_key[key] = job
+            executor = self._group_executors.get(group, self._executor)
+            job.future = executor.submit(self._run, job, func, tuple(args), kwargs or {})
+        return job
+
+    def cancel(self, job: Job) -> bool:
+        """Cancel one job, see Job.cancel()"""
+        with self._lock:
+            if job.id not in self._active or job.is_cancelled():
+                return False
+            job._cancelled.set()
+            if self._by_key.get(job.key) is job:
+                del self._by_key[job.key]
+            # A job that never started is finished here, a running one in _run()
+            never_started = job.future is not None and job.future.cancel()
+            if never_started:
+                del self._active[job.id]
+            now_idle = self._is_idle()
+
+        if never_started:
+            self._emit_terminal(job, job.cancelled)
+        else:
+            job._run_cancel_callbacks()
+        if now_idle:
+            self.idle.emit()
+        return True
+
+    def cancel_group(self, group: str) -> int:
+        """
+        Cancel all live jobs of a group, e.g. OCR of a previous image
+
+        Returns:
+            Number of cancelled jobs
+        """
+        with self._lock:
+            jobs = [job for job in self._active.values() if job.group == group]
+        return sum(self.cancel(job) for job in jobs)
+
+    def cancel_all(self) -> int:
+        """Cancel all live jobs"""
+        with self._lock:
+            jobs = list(self._active.values())
+        return sum(self.cancel(job) for job in jobs)
+
+    def pending_count(self) -> int:
+        """Number of live jobs, pending or running"""
+        with self._lock:
+            return sum(1 for job in self._active.values() if not job.is_cancelled())
+
+    def shutdown(self, wait: bool = False):
+        """Cancel everything and stop the worker threads"""
+        self.cancel_all()
+        self._executor.shutdown(wait=wait)
+        for executor in self._group_executors.values():
+            executor.shutdown(wait=wait)
+
+    def _run(self, job: Job, func: Callable[..., Any], args, kwargs):
+        """Worker side of a job"""
+        signal, value = job.cancelled, None
+        if not job.is_cancelled():
+            _current.job = job
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not job.is_cancelled():
+                    logger.exception("Job %r failed: %s", job, e)
+                signal, value = job.failed, e
+            else:
+                signal, value = job.finished, result
+            finally:
+                _current.job = None
+                # Callbacks registered after the job ended must not outlive it
+                with job._callbacks_lock:
+                    job._cancel_callbacks = []
+
+        with self._lock:
+            self._active.pop(job.id, None)
+            if self._by_key.get(job.key) is job:
+                del self._by_key[job.key]
+            now_idle = self._is_idle()
+
+        # Checked again: the job may have been cancelled while it was running
+        if job.is_cancelled():
+            self._emit_terminal(job, job.cancelled)
+        else:
+            self._emit_terminal(job, signal, value)
+        if now_idle:
+            self.idle.emit()
+
+    def _emit_terminal(self, job: Job, signal, *args):
+        """
+        Emit a job's last signal and keep the job alive until it is delivered
+
+        Emitted from a worker, the signal is queued for the GUI thread; the
+        release is queued behind it, so the Job is only dropped once its
+        slots have run.
+        """
+        with self._lock:
+            self._finishing[job.id] = job
+        signal.emit(*args)
+        self._delivered.emit(job.id)
+
+    def _release(self, job_id: int):
+        """Drop the reference taken by _emit_terminal()"""
+        with self._lock:
+            self._finishing.pop(job_id, None)
+
+    def _is_idle(self) -> bool:
+        """True when no live job is left, lock must be held"""
+        return not any(not job.is_cancelled() for job in self._active.values())
@@ -3,13 +3,59 @@ OCR module for TextCapture application
 Supports both Python and C++ implementations
 """
 
-from .ocr_engine import OCREngine
-from .cpp_ocr import CppOCREngine, is_cpp_available, get_cpp_dependencies, get_cpp_version
+# Public names and the submodule defining them. Submodules are imported on first
+# attribute access so `import src.ocr` stays cheap (no OpenCV, Tesseract or torch).
+_EXPORTS = {
+    'OCREngine': 'ocr_engine',
+    'CppOCREngine': 'cpp_ocr',
+    'is_cpp_available': 'cpp_ocr',
+    'get_cpp_dependencies': 'cpp_ocr',
+    'get_cpp_version': 'cpp_ocr',
+    'sync_native_log_level': 'cpp_ocr',
+    'EnginePool': 'engine_pool',
+    'get_engine_pool': 'engine_pool',
+    'get_engine': 'engine_pool',
+    'iter_batch': 'batch',
+    'run_batch': 'batch',
+    'ResultCache': 'result_cache',
+    'get_result_cache': 'result_cache',
+    'MetricsRegistry': 'metrics',
+    'get_metrics_registry': 'metrics',
+    'AsyncOCREngine': 'async_engine',
+    'OCRBusyError': 'async_engine',
+}
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # __import__ (not importlib) so the import shows up in `python -X importtime`
+    module = __import__(f"{__name__}.{module_name}", fromlist=[name])
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
 
 __all__ = [
     'OCREngine',
     'CppOCREngine', 
     'is_cpp_available',
     'get_cpp_dependencies',
-    'get_cpp_version'
+    'get_cpp_version',
+    'sync_native_log_level',
+    'EnginePool',
+    'get_engine_pool',
+    'get_engine',
+    'iter_batch',
+    'run_batch',
+    'ResultCache',
+    'get_result_cache',
+    'MetricsRegistry',
+    'get_metrics_registry',
+    'AsyncOCREngine',
+    'OCRBusyError'
 ] 
\ No newline at end of file
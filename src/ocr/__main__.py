@@ -0,0 +1,10 @@
+"""
+Headless OCR entry point: python -m src.ocr
+"""
+
+import sys
+
+from .cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+"""
+asyncio interface to the OCR engines
+Runs recognitions on a shared thread pool (the C++ engine releases the GIL),
+bounds concurrency with backpressure and aborts timed-out Tesseract calls
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Union
+
+from .batch import default_workers
+
+
+class OCRBusyError(RuntimeError):
+    """Raised when more callers are waiting than the engine's max_queue allows"""
+
+
+_shared_executor: Optional[ThreadPoolExecutor] = None
+_shared_executor_lock = threading.Lock()
+
+
+def get_shared_executor() -> ThreadPoolExecutor:
+    """
+    Get the process-wide executor used by AsyncOCREngine instances
+
+    Returns:
+        ThreadPoolExecutor with one thread per CPU
+    """
+    global _shared_executor
+    if _shared_executor is None:
+        with _shared_executor_lock:
+            if _shared_executor is None:
+                _shared_executor = ThreadPoolExecutor(max_workers=default_workers(),
+                                                      thread_name_prefix='textcapture-ocr')
+    return _shared_executor
+
+
+class _Call:
+    """Links an in-flight call to the engine running it, so it can be cancelled"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cancelled = False
+        self.engine = None
+
+    def start(self, engine) -> bool:
+        """Attach the engine, returns False if the call was cancelled before it started"""
+        with self.lock:
+            if self.cancelled:
+                return False
+            self.engine = engine
+            # Clears a request left over from a call that was cancelled as it finished
+            engine.reset_cancel()
+            return True
+
+    def finish(self):
+        with self.lock:
+            self.engine = None
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            if self.engine is not None:
+                self.engine.cancel()
+
+
+class AsyncOCREngine:
+    """
+    Awaitable OCR engine for asyncio services
+
+    Each concurrent call uses its own warm OCREngine (created on demand, at most
+    max_concurrency), because a Tesseract handle serves one recognition at a time.
+    """
+
+    def __init__(self, use_cpp: bool = True, max_concurrency: Optional[int] = None,
+                 max_queue: Optional[int] = None, timeout: Optional[float] = None,
+                 executor: Optional[ThreadPoolExecutor] = None, **engine_kwargs):
+        """
+        Initialize async OCR engine
+
+        Args:
+            use_cpp: Whether to use C++ implementation if available
+            max_concurrency: Maximum recognitions running at once (default: CPU count)
+            max_queue: Maximum callers waiting for a free slot, extra callers get
+                OCRBusyError (None waits without limit)
+            timeout: Default per-call timeout in seconds (None disables it)
+            executor: Thread pool to run on, defaults to the shared executor
+            **engine_kwargs: Arguments for each OCREngine
+        """
+        self.use_cpp = use_cpp
+        self.max_concurrency = max_concurrency or default_workers()
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.engine_kwargs = engine_kwargs
+        self._executor = executor
+        self._idle_engines: List[Any] = []
+        self._engines_lock = threading.Lock()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+
+    async def extract_text(self, image: Any, timeout: Optional[float] = None, **kwargs) -> str:
+        """
+        Extract text from an image
+
+        Args:
+            image: Path, encoded bytes, or in-memory image (NumPy array, PIL image, QImage)
+            timeout: Per-call timeout in seconds, overrides the default
+            **kwargs: Additional arguments for text extraction
+
+        Returns:
+            Extracted text
+
+        Raises:
+            asyncio.TimeoutError: The call did not finish in time; a C++
+                recognition is aborted through Tesseract's cancel hook
+            OCRBusyError: Too many callers are already waiting
+        """
+        return await self._submit('text', image, kwargs, timeout)
+
+    async def extract_text_with_confidence(self, image: Any, timeout: Optional[float] = None,
+                                           **kwargs) -> Dict[str, Any]:
+        """
+        Extract text with confidence scores
+
+        Args:
+            image: Path, encoded bytes, or in-memory image
+            timeout: Per-call timeout in seconds, overrides the default
+            **kwargs: Additional arguments for text extraction
+
+        Returns:
+            Dictionary with text and confidence information
+        """
+        return await self._submit('confidence', image, kwargs, timeout)
+
+    async def extract_stream(self, images: Union[Iterable[Any], AsyncIterable[Any]],
+                             mode: str = 'text', ordered: bool = False,
+                             timeout: Optional[float] = None,
+                             **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run OCR over many images and yield one item per image
+
+        Input is consumed lazily and at most max_concurrency images are in
+        flight, so a slow consumer throttles the producer.
+
+        Args:
+            images: Images (paths, bytes or arrays), sync or async iterable
+            mode: 'text' or 'confidence'
+            ordered: Yield items in input order, otherwise as they complete
+            timeout: Per-image timeout in seconds
+            **kwargs: Additional arguments for every extraction
+
+        Yields:
+            Dictionaries with 'index', 'path', 'result', 'error' and 'seconds'
+            keys, like iter_batch
+        """
+        if mode not in ('text', 'confidence'):
+            raise ValueError(f"Unsupported stream mode: {mode}")
+
+        source = _aiter(images)
+        pending: Dict[int, asyncio.Task] = {}
+        finished: Dict[int, Dict[str, Any]] = {}
+        next_index = 0
+        count = 0
+        exhausted = False
+
+        try:
+            while pending or finished or not exhausted:
+                # Buffered out-of-order items count too, so memory stays bounded
+                while not exhausted and len(pending) + len(finished) < self.max_concurrency:
+                    try:
+                        image = await source.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    pending[count] = asyncio.ensure_future(
+                        self._stream_item(count, image, mode, timeout, kwargs))
+                    count += 1
+
+                if ordered and next_index in finished:
+                    yield finished.pop(next_index)
+                    next_index += 1
+                    continue
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(pending.values(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    item = task.result()
+                    del pending[item['index']]
+                    if ordered:
+                        finished[item['index']] = item
+                    else:
+                        yield item
+        finally:
+            for task in pending.values():
+                task.cancel()
+
+    async def close(self):
+        """Drop the warm engines (the shared executor stays available)"""
+        with self._engines_lock:
+            self._idle_engines.clear()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _stream_item(self, index: int, image: Any, mode: str,
+                           timeout: Optional[float], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """One stream item, never raises"""
+        start = time.perf_counter()
+        path = str(image) if isinstance(image, (str, os.PathLike)) else None
+        item = {'index': index, 'path': path, 'result': None, 'error': None}
+        try:
+            item['result'] = await self._submit(mode, image, dict(kwargs), timeout)
+        except asyncio.TimeoutError:
+            item['error'] = "TimeoutError: OCR call timed out"
+        except Exception as e:
+            item['error'] = f"{type(e).__name__}: {e}"
+        item['seconds'] = time.perf_counter() - start
+        return item
+
+    async def _submit(self, mode: str, image: Any, kwargs: Dict[str, Any],
+                      timeout: Optional[float]) -> Any:
+        """Wait for a free slot and run one call on the executor"""
+        timeout = self.timeout if timeout is None else timeout
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.max_queue is not None and self._semaphore.locked() and self._waiting >= self.max_queue:
+            raise OCRBusyError(f"{self._waiting} OCR calls are already waiting")
+
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        loop = asyncio.get_running_loop()
+        call = _Call()
+        try:
+            future = loop.run_in_executor(self._executor or get_shared_executor(),
+                                          self._run, call, mode, image, kwargs, timeout)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        # The slot is freed when the thread is actually done, not when the caller
+        # gives up, so an aborted recognition still counts against the limit
+        future.add_done_callback(self._release)
+
+        try:
+            if timeout is None:
+                return await asyncio.shield(future)
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            call.cancel()
+            raise
+
+    def _release(self, future: asyncio.Future):
+        self._semaphore.release()
+        if not future.cancelled():
+            # Mark the exception of abandoned calls as retrieved
+            future.exception()
+
+    def _run(self, call: _Call, mode: str, image: Any, kwargs: Dict[str, Any],
+             timeout: Optional[float]) -> Any:
+        """Executor side of a call"""
+        engine = self._checkout()
+        try:
+            if not call.start(engine):
+                # The caller already gave up, nobody reads this
+                raise RuntimeError("OCR call cancelled before it started")
+            try:
+                # Native deadline as a second line of defence: it also fires
+                # when the event loop is too busy to deliver the timeout
+                engine.set_timeout(timeout)
+                return _dispatch(engine, mode, image, kwargs)
+            finally:
+                call.finish()
+        finally:
+            self._checkin(engine)
+
+    def _checkout(self):
+        with self._engines_lock:
+            if self._idle_engines:
+                return self._idle_engines.pop()
+        from .ocr_engine import OCREngine
+        return OCREngine(use_cpp=self.use_cpp, **self.engine_kwargs)
+
+    def _checkin(self, engine):
+        with self._engines_lock:
+            self._idle_engines.append(engine)
+
+
+def _dispatch(engine, mode: str, image: Any, kwargs: Dict[str, Any]) -> Any:
+    """Call the engine method matching the input type"""
+    confidence = mode == 'confidence'
+    if isinstance(image, (str, os.PathLike)):
+        if confidence:
+            return engine.extract_text_with_confidence(str(image), **kwargs)
+        return engine.extract_text(str(image), **kwargs)
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        if confidence:
+            return engine.extract_text_with_confidence_from_bytes(bytes(image), **kwargs)
+        return engine.extract_text_from_bytes(bytes(image), **kwargs)
+    if confidence:
+        return engine.extract_text_with_confidence_from_array(image, **kwargs)
+    return engine.extract_text_from_array(image, **kwargs)
+
+
+async def _aiter(items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+    """Iterate sync and async iterables alike"""
+    if hasattr(items, '__aiter__'):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
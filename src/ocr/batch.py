@@ -0,0 +1,229 @@
+"""
+Batch OCR over many images using a pool of worker processes
+Each worker keeps one warm OCR engine for the whole batch
+"""
+
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+
+# Warm engine of the current worker process
+_worker_engine = None
+_worker_error: Optional[str] = None
+
+
+def _init_worker(use_cpp: bool, engine_kwargs: Dict[str, Any], log_level: Optional[int] = None):
+    """Process pool initializer: build the worker's engine once"""
+    global _worker_engine, _worker_error
+    # Worker diagnostics go to stderr so a parent streaming results on stdout stays clean
+    sys.stdout = sys.stderr
+    if log_level is not None:
+        # Spawned workers do not inherit the parent's logging configuration
+        logging.basicConfig(level=log_level, stream=sys.stderr)
+    try:
+        from .ocr_engine import OCREngine
+        _worker_engine = OCREngine(use_cpp=use_cpp, **engine_kwargs)
+    except Exception as e:
+        _worker_error = f"Failed to initialize OCR engine: {e}"
+
+
+def _process_item(engine, index: int, path: str, mode: str,
+                  extract_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Run OCR on one image and never raise"""
+    start = time.perf_counter()
+    item = {'index': index, 'path': path, 'result': None, 'error': None}
+    try:
+        if mode == 'confidence':
+            item['result'] = engine.extract_text_with_confidence(path, **extract_kwargs)
+        else:
+            item['result'] = engine.extract_text(path, **extract_kwargs)
+    except Exception as e:
+        item['error'] = f"{type(e).__name__}: {e}"
+    item['seconds'] = time.perf_counter() - start
+    return item
+
+
+def _process_chunk(engine, entries: List[Tuple[int, str]], mode: str,
+                   extract_kwargs: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Run OCR on several images with one batched engine call and never raise"""
+    if len(entries) == 1:
+        index, path = entries[0]
+        return [_process_item(engine, index, path, mode, extract_kwargs)]
+
+    start = time.perf_counter()
+    try:
+        outputs = engine.extract_batch([path for _, path in entries],
+                                       confidence=mode == 'confidence', **extract_kwargs)
+    except Exception as e:
+        outputs = [e] * len(entries)
+    # The call is not timed per image: each one gets an equal share, flagged as such
+    seconds = (time.perf_counter() - start) / len(entries)
+
+    items = []
+    for (index, path), output in zip(entries, outputs):
+        item = {'index': index, 'path': path, 'result': None, 'error': None,
+                'seconds': seconds, 'seconds_averaged': True}
+        if isinstance(output, Exception):
+            item['error'] = f"{type(output).__name__}: {output}"
+        else:
+            item['result'] = output
+        items.append(item)
+    return items
+
+
+def _run_in_worker(entries: List[Tuple[int, str]], mode: str,
+                   extract_kwargs: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Task executed inside a worker process"""
+    if _worker_engine is None:
+        return [{'index': index, 'path': path, 'result': None,
+                 'error': _worker_error or "OCR engine not initialized", 'seconds': 0.0}
+                for index, path in entries]
+    return _process_chunk(_worker_engine, entries, mode, extract_kwargs)
+
+
+def _chunks(paths: Iterable[str], size: int) -> Iterator[List[Tuple[int, str]]]:
+    """Consecutive (index, path) lists of up to size entries, consumed lazily"""
+    chunk: List[Tuple[int, str]] = []
+    for index, path in enumerate(paths):
+        chunk.append((index, str(path)))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def default_workers() -> int:
+    """
+    Get default number of worker processes
+
+    Returns:
+        Number of CPUs available to this process
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def iter_batch(paths: Iterable[str], mode: str = 'text', workers: Optional[int] = None,
+               ordered: bool = True, use_cpp: bool = True,
+               engine_kwargs: Optional[Dict[str, Any]] = None,
+               extract_kwargs: Optional[Dict[str, Any]] = None,
+               engine=None, batch_size: int = 1) -> Iterator[Dict[str, Any]]:
+    """
+    Run OCR over many images and yield one result item per image
+
+    Args:
+        paths: Image paths, consumed lazily
+        mode: 'text' for extract_text, 'confidence' for extract_text_with_confidence
+        workers: Number of worker processes (None uses all CPUs, 0 or 1 runs in-process)
+        ordered: Yield items in input order, otherwise as they complete
+        use_cpp: Whether workers use the C++ implementation if available
+        engine_kwargs: Arguments used to build each worker's engine
+        extract_kwargs: Arguments passed to every extraction call
+        engine: Existing engine used when running in-process
+        batch_size: Images handed to the engine's extract_batch at once
+            (batched EasyOCR inference); 1 processes images one by one
+
+    Yields:
+        Dictionaries with 'index', 'path', 'result', 'error' and 'seconds' keys;
+        items of a batched call carry 'seconds_averaged': True, their
+        'seconds' being an equal share of that call
+    """
+    if mode not in ('text', 'confidence'):
+        raise ValueError(f"Unsupported batch mode: {mode}")
+
+    engine_kwargs = dict(engine_kwargs or {})
+    extract_kwargs = dict(extract_kwargs or {})
+    if workers is None:
+        workers = default_workers()
+
+    if workers <= 1:
+        if engine is None:
+            from .ocr_engine import OCREngine
+            engine = OCREngine(use_cpp=use_cpp, **engine_kwargs)
+        for chunk in _chunks(paths, max(1, batch_size)):
+            yield from _process_chunk(engine, chunk, mode, extract_kwargs)
+        return
+
+    if engine_kwargs.get('easyocr_mode') == 'cpu_fast':
+        # Split the cores between the workers instead of every torch using all of them
+        engine_kwargs.setdefault('torch_threads', max(1, default_workers() // workers))
+
+    # Keep a bounded number of tasks (chunks) in flight so huge folders are streamed
+    max_pending = workers * 4
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(use_cpp, engine_kwargs,
+                                       logging.getLogger().getEffectiveLevel())) as executor:
+        pending = deque()
+        source = _chunks(paths, max(1, batch_size))
+        exhausted = False
+
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    chunk = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                future = executor.submit(_run_in_worker, chunk, mode, extract_kwargs)
+                pending.append((chunk, future))
+
+            if not pending:
+                break
+
+            if ordered:
+                done_entries = [pending.popleft()]
+            else:
+                done, _ = wait([entry[1] for entry in pending], return_when=FIRST_COMPLETED)
+                done_entries = [entry for entry in pending if entry[1] in done]
+                for entry in done_entries:
+                    pending.remove(entry)
+
+            for chunk, future in done_entries:
+                try:
+                    yield from future.result()
+                except Exception as e:
+                    # Worker crashed (e.g. BrokenProcessPool), report it on the items
+                    for index, path in chunk:
+                        yield {'index': index, 'path': path, 'result': None,
+                               'error': f"{type(e).__name__}: {e}", 'seconds': 0.0}
+
+
+def run_batch(paths: Iterable[str], **kwargs) -> Dict[str, Any]:
+    """
+    Run OCR over many images and collect all results
+
+    Args:
+        paths: Image paths
+        **kwargs: Arguments for iter_batch
+
+    Returns:
+        Dictionary with 'results' (list of items) and 'stats' (throughput information)
+    """
+    workers = kwargs.get('workers')
+    if workers is None:
+        workers = default_workers()
+        kwargs['workers'] = workers
+
+    start = time.perf_counter()
+    results: List[Dict[str, Any]] = list(iter_batch(paths, **kwargs))
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for item in results if item['error'])
+    return {
+        'results': results,
+        'stats': {
+            'items': len(results),
+            'succeeded': len(results) - failed,
+            'failed': failed,
+            'workers': workers,
+            'seconds': elapsed,
+            'items_per_second': len(results) / elapsed if elapsed > 0 else 0.0,
+        }
+    }
@@ -0,0 +1,212 @@
+"""
+Headless command line interface for batch OCR
+Streams one JSON object per image to stdout and never imports PySide6
+
+Usage:
+    python -m src.ocr screenshots/ "scans/**/*.png" --workers 4 --lang eng
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from typing import Dict, Any, Iterator, List, Optional
+
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff', '.webp')
+
+
+def expand_inputs(inputs: List[str], recursive: bool = False) -> Iterator[str]:
+    """
+    Expand files, glob patterns and directories into image paths
+
+    Args:
+        inputs: Paths, glob patterns or directories
+        recursive: Descend into subdirectories of directory inputs
+
+    Yields:
+        Image paths, each at most once
+    """
+    seen = set()
+
+    def emit(path):
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            return True
+        return False
+
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, dirs, files in os.walk(item):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(IMAGE_EXTENSIONS):
+                        path = os.path.join(root, name)
+                        if emit(path):
+                            yield path
+                if not recursive:
+                    break
+        elif glob.has_magic(item):
+            for path in sorted(glob.glob(item, recursive=True)):
+                if os.path.isfile(path) and emit(path):
+                    yield path
+        else:
+            # Plain files are passed through so missing ones are reported per item
+            if emit(item):
+                yield item
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize NumPy arrays and scalars returned by the engines"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+def format_record(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a batch item into the JSONL record
+
+    Args:
+        item: Item yielded by iter_batch
+
+    Returns:
+        Dictionary with path, text, confidence, boxes, timing and error
+    """
+    record = {'path': item['path'], 'seconds': round(item['seconds'], 6), 'error': item['error']}
+    result = item['result']
+
+    if isinstance(result, dict):
+        record['text'] = result.get('text')
+        record['confidence'] = result.get('confidence')
+        record['text_parts'] = result.get('text_parts')
+        record['confidences'] = result.get('confidences')
+        boxes = result.get('bounding_boxes')
+        record['boxes'] = boxes if boxes is not None else result.get('bboxes')
+    else:
+        record['text'] = result
+    return record
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser"""
+    parser = argparse.ArgumentParser(
+        prog='python -m src.ocr',
+        description="Run OCR on images and stream JSONL results")
+    parser.add_argument('inputs', nargs='+', help="Image files, glob patterns or directories")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: all CPUs, 1 runs in-process)")
+    parser.add_argument('--backend', choices=('auto', 'cpp', 'python'), default='auto',
+                        help="OCR implementation (auto prefers C++)")
+    parser.add_argument('--method', choices=('easyocr', 'tesseract', 'tesseract_inproc'), default=None,
+                        help="Python backend method")
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help="Images per batched inference call (EasyOCR), 1 processes them one by one")
+    parser.add_argument('--easyocr-mode', choices=('default', 'cpu_fast'), default=None,
+                        help="EasyOCR model configuration (cpu_fast: int8 recognizer, tuned threads)")
+    parser.add_argument('--easyocr-models', default=None,
+                        help="Local EasyOCR model directory, loaded without downloading")
+    parser.add_argument('--lang', default=None,
+                        help="Language code (e.g. eng, vie for Tesseract; en, vi for EasyOCR)")
+    parser.add_argument('--cache-dir', default=None, help="Persistent result cache directory")
+    parser.add_argument('--level', choices=('word', 'line', 'paragraph', 'block'), default='word',
+                        help="Granularity of parts, confidences and boxes (C++ backend)")
+    parser.add_argument('--text-only', action='store_true',
+                        help="Only extract text, skip confidences and boxes")
+    parser.add_argument('--unordered', action='store_true',
+                        help="Emit results as they complete instead of in input order")
+    parser.add_argument('--recursive', '-r', action='store_true',
+                        help="Descend into subdirectories")
+    parser.add_argument('--output', '-o', default=None, help="Write JSONL here instead of stdout")
+    parser.add_argument('--log-level', choices=('DEBUG', 'INFO', 'WARNING', 'ERROR'),
+                        default='WARNING', help="Log level of engine diagnostics (stderr)")
+    return parser
+
+
+def _stream(args, output, workers: int, use_cpp: bool, engine_kwargs: Dict[str, Any],
+            extract_kwargs: Dict[str, Any]):
+    """Run the batch and write one JSON line per image, returns (count, failed)"""
+    from .batch import iter_batch
+
+    count = failed = 0
+    items = iter_batch(expand_inputs(args.inputs, args.recursive),
+                       mode='text' if args.text_only else 'confidence',
+                       workers=workers, ordered=not args.unordered,
+                       use_cpp=use_cpp, engine_kwargs=engine_kwargs,
+                       extract_kwargs=extract_kwargs, batch_size=args.batch_size)
+    for item in items:
+        count += 1
+        failed += bool(item['error'])
+        output.write(json.dumps(format_record(item), ensure_ascii=False, default=_json_default))
+        output.write('\n')
+        output.flush()
+    return count, failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the command line interface
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
+
+    Returns:
+        Exit code: 0 if every image succeeded, 1 if any failed
+    """
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=args.log_level, stream=sys.stderr,
+                        format="%(levelname)s %(name)s: %(message)s")
+
+    from .batch import default_workers
+    from .cpp_ocr import is_cpp_available
+
+    use_cpp = args.backend == 'cpp' or (args.backend == 'auto' and is_cpp_available())
+    if args.backend == 'cpp' and not is_cpp_available():
+        print("C++ OCR backend is not available", file=sys.stderr)
+        return 2
+
+    engine_kwargs: Dict[str, Any] = {}
+    if args.lang:
+        engine_kwargs['language'] = args.lang
+    if args.cache_dir:
+        engine_kwargs['cache_dir'] = args.cache_dir
+    if args.easyocr_mode:
+        engine_kwargs['easyocr_mode'] = args.easyocr_mode
+    if args.easyocr_models:
+        engine_kwargs['easyocr_model_dir'] = args.easyocr_models
+
+    extract_kwargs: Dict[str, Any] = {}
+    if args.method:
+        extract_kwargs['method'] = args.method
+    if use_cpp and not args.text_only:
+        extract_kwargs['level'] = args.level
+
+    workers = args.workers if args.workers is not None else default_workers()
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+
+    count = failed = 0
+    start = time.perf_counter()
+    try:
+        # Engine diagnostics must not interleave with the JSONL stream
+        with contextlib.redirect_stdout(sys.stderr):
+            count, failed = _stream(args, output, workers, use_cpp, engine_kwargs, extract_kwargs)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        'items': count,
+        'failed': failed,
+        'workers': workers,
+        'backend': 'cpp' if use_cpp else 'python',
+        'seconds': round(elapsed, 3),
+        'items_per_second': round(count / elapsed, 3) if elapsed > 0 else 0.0,
+    }
+    print(json.dumps(summary), file=sys.stderr)
+    return 1 if failed else 0
@@ -1,10 +1,54 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 #include <pybind11/functional.h>
+#include <pybind11/numpy.h>
 #include "ocr_engine.h"
+#include "logging.h"
 
 namespace py = pybind11;
 
+namespace {
+
+// Wrap a Python buffer (NumPy array, memoryview, ...) as a cv::Mat without copying.
+// Accepts uint8 images shaped (H, W), (H, W, 1), (H, W, 3) or (H, W, 4) whose pixels
+// are contiguous; rows may be padded. The buffer must outlive the returned Mat.
+// Only reads the buffer description, so the pixels can be used without the GIL.
+cv::Mat mat_from_buffer(const py::buffer_info& info) {
+    if (info.itemsize != 1 || info.format != py::format_descriptor<uint8_t>::format()) {
+        throw std::invalid_argument("Image buffer must contain uint8 pixels");
+    }
+    if (info.ndim != 2 && info.ndim != 3) {
+        throw std::invalid_argument("Image buffer must have shape (H, W) or (H, W, C)");
+    }
+
+    int rows = static_cast<int>(info.shape[0]);
+    int cols = static_cast<int>(info.shape[1]);
+    int channels = info.ndim == 3 ? static_cast<int>(info.shape[2]) : 1;
+    if (channels != 1 && channels != 3 && channels != 4) {
+        throw std::invalid_argument("Image buffer must have 1, 3 or 4 channels");
+    }
+    if (info.strides[1] != channels || (info.ndim == 3 && info.strides[2] != 1)) {
+        throw std::invalid_argument("Image buffer pixels must be contiguous");
+    }
+
+    return cv::Mat(rows, cols, CV_8UC(channels), info.ptr, static_cast<size_t>(info.strides[0]));
+}
+
+// Engine input for a wrapped buffer: RGB/RGBA pixels are converted to gray here,
+// the engine would read them as BGR. Call with the GIL released, the conversion
+// touches every pixel.
+cv::Mat engine_input(const cv::Mat& image, bool rgb) {
+    if (rgb && image.channels() >= 3) {
+        // Grayscale conversion is the first pipeline step anyway, do it with the right channel order
+        cv::Mat gray;
+        cv::cvtColor(image, gray, image.channels() == 4 ? cv::COLOR_RGBA2GRAY : cv::COLOR_RGB2GRAY);
+        return gray;
+    }
+    return image;
+}
+
+} // namespace
+
 PYBIND11_MODULE(cpp_ocr, m) {
     m.doc() = "C++ OCR Engine for TextCapture - High performance text extraction using Tesseract and OpenCV";
     
@@ -13,41 +57,189 @@ PYBIND11_MODULE(cpp_ocr, m) {
         .def_readwrite("text", &textcapture::OCRResult::text)
         .def_readwrite("confidence", &textcapture::OCRResult::confidence)
         .def_readwrite("text_parts", &textcapture::OCRResult::text_parts)
-        .def_readwrite("confidences", &textcapture::OCRResult::confidences)
-        .def_readwrite("bounding_boxes", &textcapture::OCRResult::bounding_boxes)
+        // Numeric results are exposed as NumPy views over the result's own
+        // contiguous storage (kept alive by the array), not lists of Python objects
+        .def_property_readonly("confidences", [](py::object self) {
+            auto& result = self.cast<textcapture::OCRResult&>();
+            return py::array_t<double>(
+                {static_cast<py::ssize_t>(result.confidences.size())},
+                {static_cast<py::ssize_t>(sizeof(double))},
+                result.confidences.data(), self);
+        }, "Per-element confidences as a float64 array of shape (N,)")
+        .def_property_readonly("bounding_boxes", [](py::object self) {
+            auto& result = self.cast<textcapture::OCRResult&>();
+            return py::array_t<int32_t>(
+                {static_cast<py::ssize_t>(result.bounding_boxes.size() / 4), static_cast<py::ssize_t>(4)},
+                {static_cast<py::ssize_t>(4 * sizeof(int32_t)), static_cast<py::ssize_t>(sizeof(int32_t))},
+                result.bounding_boxes.data(), self);
+        }, "Per-element (x, y, width, height) boxes as an int32 array of shape (N, 4)")
+        .def_property_readonly("timings", [](const textcapture::OCRResult& result) {
+            py::dict timings;
+            for (const auto& stage : result.timings) {
+                timings[py::str(stage.first)] = stage.second;
+            }
+            return timings;
+        }, "Seconds spent per pipeline stage, in execution order")
+        .def_readwrite("scale", &textcapture::OCRResult::scale,
+                       "Factor the image was resized by before recognition")
+        .def_readwrite("quality", &textcapture::OCRResult::quality,
+                       "Preprocessing picked for the image ('none', 'binarize', 'full'), empty if not classified")
         .def("__repr__", [](const textcapture::OCRResult& result) {
             return "OCRResult(text='" + result.text + "', confidence=" + std::to_string(result.confidence) + ")";
         });
     
     // CppOCREngine class
+    // Long-running entry points release the GIL so recognition runs in parallel
+    // with the Qt GUI thread and other Python threads. Arguments are converted
+    // before the GIL is dropped and results after it is re-acquired.
+    // The engine serializes calls on one instance with its own mutex, which is
+    // taken after the GIL is released: every method that takes it must release
+    // the GIL first, or a thread waiting for the mutex while holding the GIL
+    // would deadlock with a recognition that logs (the log sink needs the GIL).
     py::class_<textcapture::OCREngine>(m, "CppOCREngine")
         .def(py::init<>())
         .def("initialize", &textcapture::OCREngine::initialize, 
              py::arg("language") = "eng",
+             py::call_guard<py::gil_scoped_release>(),
              "Initialize the OCR engine with specified language")
         .def("extract_text", &textcapture::OCREngine::extract_text,
              py::arg("image_path"),
+             py::call_guard<py::gil_scoped_release>(),
              "Extract text from image file")
         .def("extract_text_with_confidence", &textcapture::OCREngine::extract_text_with_confidence,
              py::arg("image_path"),
+             py::arg("level") = "word",
+             py::call_guard<py::gil_scoped_release>(),
              "Extract text with confidence scores from image file")
+        .def("extract_text_from_array",
+             [](textcapture::OCREngine& engine, py::buffer image, bool rgb) {
+                 py::buffer_info info = image.request();
+                 cv::Mat mat = mat_from_buffer(info);
+                 py::gil_scoped_release release;
+                 return engine.extract_text_from_mat(engine_input(mat, rgb));
+             },
+             py::arg("image"),
+             py::arg("rgb") = true,
+             "Extract text from a uint8 image buffer (NumPy array) without copying it")
+        .def("extract_text_with_confidence_from_array",
+             [](textcapture::OCREngine& engine, py::buffer image, bool rgb, const std::string& level) {
+                 py::buffer_info info = image.request();
+                 cv::Mat mat = mat_from_buffer(info);
+                 py::gil_scoped_release release;
+                 return engine.extract_text_with_confidence_from_mat(engine_input(mat, rgb), level);
+             },
+             py::arg("image"),
+             py::arg("rgb") = true,
+             py::arg("level") = "word",
+             "Extract text with confidence scores from a uint8 image buffer")
+        .def("extract_text_from_bytes",
+             [](textcapture::OCREngine& engine, py::bytes data) {
+                 std::string encoded = data;
+                 py::gil_scoped_release release;
+                 return engine.extract_text_from_bytes(encoded);
+             },
+             py::arg("data"),
+             "Decode an encoded image (PNG, JPEG, ...) and extract text")
+        .def("extract_text_with_confidence_from_bytes",
+             [](textcapture::OCREngine& engine, py::bytes data, const std::string& level) {
+                 std::string encoded = data;
+                 py::gil_scoped_release release;
+                 return engine.extract_text_with_confidence_from_bytes(encoded, level);
+             },
+             py::arg("data"),
+             py::arg("level") = "word",
+             "Decode an encoded image and extract text with confidence scores")
         .def("preprocess_image", &textcapture::OCREngine::preprocess_image,
              py::arg("image_path"),
              py::arg("enhance_contrast") = true,
              py::arg("enhance_sharpness") = true,
              py::arg("denoise") = true,
              py::arg("grayscale") = true,
+             py::call_guard<py::gil_scoped_release>(),
              "Preprocess image for better OCR results")
         .def("set_language", &textcapture::OCREngine::set_language,
              py::arg("language"),
+             py::call_guard<py::gil_scoped_release>(),
              "Set OCR language")
+        .def("set_max_cached_languages", &textcapture::OCREngine::set_max_cached_languages,
+             py::arg("max_languages"),
+             py::call_guard<py::gil_scoped_release>(),
+             "Set how many initialized languages are kept for fast switching")
+        .def("get_cached_languages", &textcapture::OCREngine::get_cached_languages,
+             py::call_guard<py::gil_scoped_release>(),
+             "Get initialized languages, most recently used first")
+        // Called from other threads while a recognition runs without the GIL
+        .def("cancel", &textcapture::OCREngine::cancel,
+             "Abort the running recognition (stays requested until reset_cancel)")
+        .def("reset_cancel", &textcapture::OCREngine::reset_cancel,
+             "Clear a pending cancel request")
+        .def("set_timeout_ms", &textcapture::OCREngine::set_timeout_ms,
+             py::arg("timeout_ms"),
+             py::call_guard<py::gil_scoped_release>(),
+             "Recognition deadline in milliseconds for subsequent calls, 0 disables it")
+        .def("set_resolution_normalization", &textcapture::OCREngine::set_resolution_normalization,
+             py::arg("enabled"),
+             py::arg("target_x_height") = 20.0,
+             py::arg("min_x_height") = 14.0,
+             py::arg("max_x_height") = 32.0,
+             py::call_guard<py::gil_scoped_release>(),
+             "Rescale images whose estimated x-height is outside [min, max] to the target")
+        .def("get_scratch_bytes", &textcapture::OCREngine::get_scratch_bytes,
+             py::call_guard<py::gil_scoped_release>(),
+             "Bytes held by the reusable preprocessing buffers")
+        .def("set_pipeline", &textcapture::OCREngine::set_pipeline,
+             py::arg("stages"),
+             py::call_guard<py::gil_scoped_release>(),
+             "Use a preprocessing pipeline given as [(op, {param: value})] for all calls")
+        .def("reset_pipeline", &textcapture::OCREngine::reset_pipeline,
+             py::call_guard<py::gil_scoped_release>(),
+             "Restore the built-in preprocessing pipelines")
+        .def("get_pipeline_steps", &textcapture::OCREngine::get_pipeline_steps,
+             py::call_guard<py::gil_scoped_release>(),
+             "Compiled steps of the custom pipeline, fused stages joined by '+'")
+        .def("set_adaptive_preprocessing", &textcapture::OCREngine::set_adaptive_preprocessing,
+             py::arg("enabled"),
+             py::call_guard<py::gil_scoped_release>(),
+             "Pick the smallest preprocessing each image needs when no custom pipeline is set")
         .def("get_supported_languages", &textcapture::OCREngine::get_supported_languages,
              "Get list of supported languages")
         .def("get_info", &textcapture::OCREngine::get_info,
+             py::call_guard<py::gil_scoped_release>(),
              "Get engine information")
         .def("__repr__", [](const textcapture::OCREngine& engine) {
-            return "CppOCREngine(" + engine.get_info() + ")";
+            std::string info;
+            {
+                py::gil_scoped_release release;
+                info = engine.get_info();
+            }
+            return "CppOCREngine(" + info + ")";
+        });
+    
+    // Logging: messages below the level are never formatted
+    m.def("set_log_level", &textcapture::set_log_level, py::arg("level"),
+          "Set the minimum native log level (Python logging values)");
+    m.def("get_log_level", &textcapture::get_log_level,
+          "Get the minimum native log level");
+    m.def("set_log_sink", [](py::object callback) {
+        if (callback.is_none()) {
+            textcapture::set_log_sink(nullptr);
+            return;
+        }
+        // Engine threads run without the GIL; the last reference may be dropped by one of them
+        std::shared_ptr<py::object> holder(new py::object(std::move(callback)), [](py::object* obj) {
+            py::gil_scoped_acquire gil;
+            delete obj;
+        });
+        textcapture::set_log_sink([holder](int level, const std::string& message) {
+            py::gil_scoped_acquire gil;
+            try {
+                (*holder)(level, message);
+            } catch (py::error_already_set& e) {
+                e.discard_as_unraisable("cpp_ocr log sink");
+            }
         });
+    }, py::arg("callback"),
+       "Send native log messages to callback(level, message), None restores stderr");
     
     // Module-level functions
     m.def("get_version", []() {
@@ -0,0 +1,81 @@
+#ifndef OCR_LOGGING_H
+#define OCR_LOGGING_H
+
+#include <atomic>
+#include <functional>
+#include <iostream>
+#include <memory>
+#include <mutex>
+#include <sstream>
+#include <string>
+
+namespace textcapture {
+
+// Numeric values match Python's logging levels so they can be passed through unchanged
+enum class LogLevel : int {
+    Debug = 10,
+    Info = 20,
+    Warning = 30,
+    Error = 40,
+    Off = 100
+};
+
+using LogSink = std::function<void(int level, const std::string& message)>;
+
+namespace detail {
+
+inline std::atomic<int> log_level{static_cast<int>(LogLevel::Warning)};
+inline std::mutex sink_mutex;
+inline std::shared_ptr<LogSink> sink;
+
+}  // namespace detail
+
+inline void set_log_level(int level) {
+    detail::log_level.store(level, std::memory_order_relaxed);
+}
+
+inline int get_log_level() {
+    return detail::log_level.load(std::memory_order_relaxed);
+}
+
+inline bool log_enabled(LogLevel level) {
+    return static_cast<int>(level) >= detail::log_level.load(std::memory_order_relaxed);
+}
+
+// Replace the sink; nullptr restores the default (stderr, no flush per line)
+inline void set_log_sink(LogSink new_sink) {
+    std::lock_guard<std::mutex> lock(detail::sink_mutex);
+    detail::sink = new_sink ? std::make_shared<LogSink>(std::move(new_sink)) : nullptr;
+}
+
+inline void log_message(LogLevel level, const std::string& message) {
+    std::shared_ptr<LogSink> current;
+    {
+        std::lock_guard<std::mutex> lock(detail::sink_mutex);
+        current = detail::sink;
+    }
+    if (current) {
+        (*current)(static_cast<int>(level), message);
+    } else {
+        std::cerr << message << '\n';
+    }
+}
+
+}  // namespace textcapture
+
+// Formats the message only when the level is enabled, so disabled logs cost one atomic load
+#define TC_LOG(level, expr)                                                   \
+    do {                                                                      \
+        if (::textcapture::log_enabled(level)) {                              \
+            std::ostringstream tc_log_stream_;                                \
+            tc_log_stream_ << expr;                                           \
+            ::textcapture::log_message(level, tc_log_stream_.str());          \
+        }                                                                     \
+    } while (0)
+
+#define TC_LOG_DEBUG(expr) TC_LOG(::textcapture::LogLevel::Debug, expr)
+#define TC_LOG_INFO(expr) TC_LOG(::textcapture::LogLevel::Info, expr)
+#define TC_LOG_WARNING(expr) TC_LOG(::textcapture::LogLevel::Warning, expr)
+#define TC_LOG_ERROR(expr) TC_LOG(::textcapture::LogLevel::Error, expr)
+
+#endif // OCR_LOGGING_H
@@ -1,98 +1,318 @@
 #include "ocr_engine.h"
+#include "logging.h"
+#include <tesseract/resultiterator.h>
 #include <iostream>
 #include <fstream>
 #include <filesystem>
 #include <algorithm>
 #include <sstream>
+#include <utility>
+#include <chrono>
+#include <cmath>
+#include <cstdlib>
+#include <map>
 
 namespace textcapture {
 
-OCREngine::OCREngine() : initialized_(false) {
-    tess_api_ = std::make_unique<tesseract::TessBaseAPI>();
+namespace {
+
+// Appends the time since the previous lap to the result's stage timings
+class StageTimer {
+public:
+    explicit StageTimer(OCRResult& result)
+        : result_(result), last_(std::chrono::steady_clock::now()) {}
+    
+    void lap(const char* stage) {
+        auto now = std::chrono::steady_clock::now();
+        result_.timings.emplace_back(stage, std::chrono::duration<double>(now - last_).count());
+        last_ = now;
+    }
+    
+    // Start the next stage now (after stages timed elsewhere)
+    void restart() {
+        last_ = std::chrono::steady_clock::now();
+    }
+    
+private:
+    OCRResult& result_;
+    std::chrono::steady_clock::time_point last_;
+};
+
+// Runs the extraction and puts the decode time in front of its stage timings
+template <typename Decode, typename Extract>
+OCRResult with_decode_timing(Decode decode, Extract extract) {
+    auto start = std::chrono::steady_clock::now();
+    cv::Mat image = decode();
+    double seconds = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+    OCRResult result = extract(image);
+    result.timings.insert(result.timings.begin(), {"decode", seconds});
+    return result;
+}
+
+// Resolution normalization limits, see src/ocr/resolution.py
+constexpr size_t kMinGlyphComponents = 8;
+constexpr double kMinScale = 0.25;
+constexpr double kMaxScale = 4.0;
+constexpr double kDefaultTargetXHeight = 20.0;
+constexpr double kDefaultMinXHeight = 14.0;
+constexpr double kDefaultMaxXHeight = 32.0;
+
+// Stage name -> parameters with their defaults, same as STAGES in src/ocr/pipeline.py
+const std::map<std::string, std::map<std::string, double>>& stage_defaults() {
+    static const std::map<std::string, std::map<std::string, double>> defaults = {
+        {"normalize", {{"target_x_height", kDefaultTargetXHeight},
+                       {"min_x_height", kDefaultMinXHeight},
+                       {"max_x_height", kDefaultMaxXHeight}}},
+        {"contrast", {{"alpha", 1.5}, {"beta", 10.0}}},
+        {"invert", {}},
+        {"threshold", {{"value", 127.0}}},
+        {"otsu", {}},
+        {"adaptive_threshold", {{"block_size", 31.0}, {"c", 10.0}}},
+        {"sharpen", {{"amount", 1.0}}},
+        {"median", {{"ksize", 3.0}}},
+        {"dilate", {{"width", 2.0}, {"height", 1.0}}},
+        {"erode", {{"width", 2.0}, {"height", 1.0}}},
+    };
+    return defaults;
+}
+
+// Quality classification, same values as src/ocr/quality.py
+constexpr double kMaxQualitySamples = 512.0 * 512.0;
+constexpr int kMinInkDistance = 64;
+constexpr int kCleanContrast = 128;
+constexpr int kPeakTolerance = 16;
+constexpr double kMinPeakFraction = 0.9;
+constexpr double kMinSharpEdges = 0.35;
+
+// Same as PRESETS in src/ocr/pipeline.py
+std::vector<PipelineStage> builtin_pipeline(const std::string& name) {
+    if (name == "binarize") {
+        return {{"normalize", {}},
+                {"contrast", {{"alpha", 1.5}, {"beta", 10.0}}},
+                {"otsu", {}},
+                {"dilate", {{"width", 2.0}, {"height", 1.0}}}};
+    }
+    if (name == "binarize-simple") {
+        return {{"normalize", {}}, {"otsu", {}}};
+    }
+    if (name == "fast") {
+        return {{"normalize", {}}};
+    }
+    // "enhance"
+    return {{"normalize", {}},
+            {"contrast", {{"alpha", 1.5}, {"beta", 10.0}}},
+            {"sharpen", {{"amount", 1.0}}},
+            {"median", {{"ksize", 3.0}}}};
+}
+
+}  // namespace
+
+cv::Mat ScratchBuffer::get(int rows, int cols, int type) {
+    size_t bytes = static_cast<size_t>(rows) * cols * CV_ELEM_SIZE(type);
+    if (bytes > storage_.size()) {
+        storage_.resize(bytes);
+    }
+    return cv::Mat(rows, cols, type, storage_.data());
+}
+
+OCREngine::OCREngine()
+    : tess_api_(nullptr), initialized_(false), max_cached_languages_(3),
+      cancel_requested_(false), timeout_ms_(0), normalize_resolution_(true),
+      target_x_height_(kDefaultTargetXHeight), min_x_height_(kDefaultMinXHeight),
+      max_x_height_(kDefaultMaxXHeight),
+      sharpen_kernel_((cv::Mat_<float>(3, 3) <<
+          0, -1, 0,
+          -1, 5, -1,
+          0, -1, 0)),
+      use_custom_pipeline_(false),
+      binarize_pipeline_(compile_pipeline(builtin_pipeline("binarize"))),
+      binarize_simple_pipeline_(compile_pipeline(builtin_pipeline("binarize-simple"))),
+      enhance_pipeline_(compile_pipeline(builtin_pipeline("enhance"))),
+      fast_pipeline_(compile_pipeline(builtin_pipeline("fast"))),
+      adaptive_preprocessing_(true) {
 }
 
 OCREngine::~OCREngine() {
-    if (tess_api_) {
-        tess_api_->End();
+    for (auto& entry : language_apis_) {
+        entry.second->End();
     }
 }
 
 bool OCREngine::initialize(const std::string& language) {
+    std::lock_guard<std::mutex> lock(call_mutex_);
+    return initialize_locked(language);
+}
+
+bool OCREngine::initialize_locked(const std::string& language) {
     try {
+        // Reuse an already initialized API for this language (or combination such as "eng+vie")
+        auto cached = std::find_if(language_apis_.begin(), language_apis_.end(),
+            [&language](const LanguageApi& entry) { return entry.first == language; });
+        if (cached != language_apis_.end()) {
+            language_apis_.splice(language_apis_.begin(), language_apis_, cached);
+            tess_api_ = language_apis_.front().second.get();
+            current_language_ = language;
+            initialized_ = true;
+            return true;
+        }
+        
+        auto api = std::make_unique<tesseract::TessBaseAPI>();
+        
         // Initialize Tesseract
-        if (tess_api_->Init(nullptr, language.c_str())) {
-            std::cerr << "Failed to initialize Tesseract with language: " << language << std::endl;
+        if (api->Init(nullptr, language.c_str())) {
+            TC_LOG_ERROR("Failed to initialize Tesseract with language: " << language);
             return false;
         }
         
         // Set OCR parameters for better accuracy and word separation
-        tess_api_->SetPageSegMode(tesseract::PSM_AUTO);
-        tess_api_->SetVariable("tessedit_char_whitelist", "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyzÀÁÂÃÈÉÊÌÍÒÓÔÕÙÚĂĐĨŨƠàáâãèéêìíòóôõùúăđĩũơƯĂẠẢẤẦẨẪẬẮẰẲẴẶẸẺẼỀỀỂẾưăạảấầẩẫậắằẳẵặẹẻẽềềểếỄỆỈỊỌỎỐỒỔỖỘỚỜỞỠỢỤỦỨỪễệỉịọỏốồổỗộớờởỡợụủứừỬỮỰỲỴÝỶỸửữựỳỵýỷỹ.,!?;:()[]{}\"'`~@#$%^&*+-=_|\\/<>");
+        api->SetPageSegMode(tesseract::PSM_AUTO);
+        api->SetVariable("tessedit_char_whitelist", "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyzÀÁÂÃÈÉÊÌÍÒÓÔÕÙÚĂĐĨŨƠàáâãèéêìíòóôõùúăđĩũơƯĂẠẢẤẦẨẪẬẮẰẲẴẶẸẺẼỀỀỂẾưăạảấầẩẫậắằẳẵặẹẻẽềềểếỄỆỈỊỌỎỐỒỔỖỘỚỜỞỠỢỤỦỨỪễệỉịọỏốồổỗộớờởỡợụủứừỬỮỰỲỴÝỶỸửữựỳỵýỷỹ.,!?;:()[]{}\"'`~@#$%^&*+-=_|\\/<>");
         
         // Improve word separation
-        tess_api_->SetVariable("preserve_interword_spaces", "1");
-        tess_api_->SetVariable("tessedit_do_invert", "0");
-        tess_api_->SetVariable("textord_heavy_nr", "1");
-        tess_api_->SetVariable("textord_min_linesize", "2.0");
+        api->SetVariable("preserve_interword_spaces", "1");
+        api->SetVariable("tessedit_do_invert", "0");
+        api->SetVariable("textord_heavy_nr", "1");
+        api->SetVariable("textord_min_linesize", "2.0");
         
+        language_apis_.emplace_front(language, std::move(api));
+        tess_api_ = language_apis_.front().second.get();
         current_language_ = language;
         initialized_ = true;
+        evict_languages();
         
-        std::cout << "Tesseract initialized successfully with language: " << language << std::endl;
+        TC_LOG_INFO("Tesseract initialized successfully with language: " << language);
         return true;
         
     } catch (const std::exception& e) {
-        std::cerr << "Exception during Tesseract initialization: " << e.what() << std::endl;
+        TC_LOG_ERROR("Exception during Tesseract initialization: " << e.what());
         return false;
     }
 }
 
+void OCREngine::set_max_cached_languages(size_t max_languages) {
+    std::lock_guard<std::mutex> lock(call_mutex_);
+    max_cached_languages_ = std::max<size_t>(1, max_languages);
+    evict_languages();
+}
+
+std::vector<std::string> OCREngine::get_cached_languages() const {
+    std::lock_guard<std::mutex> lock(call_mutex_);
+    std::vector<std::string> languages;
+    for (const auto& entry : language_apis_) {
+        languages.push_back(entry.first);
+    }
+    return languages;
+}
+
+void OCREngine::cancel() {
+    cancel_requested_.store(true);
+}
+
+void OCREngine::reset_cancel() {
+    cancel_requested_.store(false);
+}
+
+void OCREngine::set_timeout_ms(int timeout_ms) {
+    std::lock_guard<std::mutex> lock(call_mutex_);
+    timeout_ms_ = std::max(0, timeout_ms);
+}
+
+void OCREngine::set_resolution_normalization(bool enabled, double target_x_height,
+                                             double min_x_height, double max_x_height) {
+    if (!(min_x_height <= target_x_height && target_x_height <= max_x_height) || min_x_height <= 0) {
+        throw std::invalid_argument("Expected 0 < min_x_height <= target_x_height <= max_x_height");
+    }
+    std::lock_guard<std::mutex> lock(call_mutex_);
+    normalize_resolution_ = enabled;
+    target_x_height_ = target_x_height;
+    min_x_height_ = min_x_height;
+    max_x_height_ = max_x_height;
+}
+
+bool OCREngine::cancel_callback(void* engine, int /*words*/) {
+    return static_cast<OCREngine*>(engine)->cancel_requested_.load(std::memory_order_relaxed);
+}
+
+void OCREngine::recognize() {
+    tesseract::ETEXT_DESC monitor;
+    monitor.cancel = &OCREngine::cancel_callback;
+    monitor.cancel_this = this;
+    if (timeout_ms_ > 0) {
+        monitor.set_deadline_msecs(timeout_ms_);
+    }
+    
+    int status = tess_api_->Recognize(&monitor);
+    if (cancel_requested_.load()) {
+        throw std::runtime_error("Recognition cancelled");
+    }
+    if (timeout_ms_ > 0 && monitor.deadline_exceeded()) {
+        throw std::runtime_error("Recognition timed out after " + std::to_string(timeout_ms_) + " ms");
+    }
+    if (status != 0) {
+        throw std::runtime_error("Tesseract recognition failed");
+    }
+}
+
+void OCREngine::evict_languages() {
+    // The active API is always at the front and never evicted
+    while (language_apis_.size() > max_cached_languages_) {
+        language_apis_.back().second->End();
+        language_apis_.pop_back();
+    }
+}
+
+// Images are decoded before the call mutex is taken, so decoding overlaps
+// with a recognition running on the same engine
 std::string OCREngine::extract_text(const std::string& image_path) {
+    cv::Mat image = load_image(image_path);
+    std::lock_guard<std::mutex> lock(call_mutex_);
+    return extract_text_locked(image);
+}
+
+std::string OCREngine::extract_text_from_bytes(const std::string& data) {
+    cv::Mat image = decode_image(data);
+    std::lock_guard<std::mutex> lock(call_mutex_);
+    return extract_text_locked(image);
+}
+
+std::string OCREngine::extract_text_from_mat(const cv::Mat& image) {
+    std::lock_guard<std::mutex> lock(call_mutex_);
+    return extract_text_locked(image);
+}
+
+std::string OCREngine::extract_text_locked(const cv::Mat& image) {
     if (!initialized_) {
         throw std::runtime_error("OCR engine not initialized");
     }
     
     try {
-        // Load image using OpenCV
-        cv::Mat image = cv::imread(image_path);
         if (image.empty()) {
-            throw std::runtime_error("Failed to load image: " + image_path);
+            throw std::runtime_error("Empty image");
         }
         
-        std::cout << "Image loaded successfully: " << image.cols << "x" << image.rows << " channels: " << image.channels() << std::endl;
+        TC_LOG_DEBUG("Image loaded successfully: " << image.cols << "x" << image.rows << " channels: " << image.channels());
         
-        // Preprocess image with improved approach for better word separation
-        cv::Mat preprocessed = image.clone();
-        preprocessed = convert_to_grayscale(preprocessed);
+        // Preprocess image with improved approach for better word separation.
+        // Stages work in the engine's scratch buffers, the input is only read.
+        // Japanese gets the simple grayscale + Otsu threshold pipeline.
+        cv::Mat gray = convert_to_grayscale(image);
+        std::string quality;
+        const std::vector<PipelineStep>& steps = select_pipeline(
+            gray, current_language_ == "jpn" ? binarize_simple_pipeline_ : binarize_pipeline_, quality);
+        double scale = 1.0;
+        cv::Mat preprocessed = run_pipeline(steps, gray, scale);
         
-        if (current_language_ == "jpn") {
-            // Simplify pipeline for Japanese: only grayscale + Otsu threshold
-            cv::threshold(preprocessed, preprocessed, 0, 255, cv::THRESH_BINARY + cv::THRESH_OTSU);
-            std::cout << "[JPN] Simple grayscale + Otsu threshold pipeline applied" << std::endl;
-        } else {
-            // Old pipeline for other languages
-            cv::Mat enhanced = enhance_contrast(preprocessed);
-            cv::Mat kernel = cv::getStructuringElement(cv::MORPH_RECT, cv::Size(1, 1));
-            cv::Mat eroded;
-            cv::erode(enhanced, eroded, kernel, cv::Point(-1, -1), 1);
-            cv::Mat binary;
-            cv::threshold(eroded, binary, 0, 255, cv::THRESH_BINARY + cv::THRESH_OTSU);
-            cv::Mat kernel2 = cv::getStructuringElement(cv::MORPH_RECT, cv::Size(2, 1));
-            cv::Mat dilated;
-            cv::dilate(binary, dilated, kernel2, cv::Point(-1, -1), 1);
-            preprocessed = dilated;
-        }
-        
-        std::cout << "Image preprocessed successfully with adaptive thresholding" << std::endl;
+        TC_LOG_DEBUG("Image preprocessed with " << steps.size() << " pipeline steps"
+                     << (quality.empty() ? "" : ", quality " + quality));
         
-        // Set image for Tesseract
+        // Set image for Tesseract (copies the pixels, the scratch buffer is free again)
         tess_api_->SetImage(preprocessed.data, preprocessed.cols, preprocessed.rows, 
                            preprocessed.channels(), preprocessed.step);
         
-        // Check if image was set correctly (no need to check GetImage as it's not available)
-        std::cout << "Image dimensions: " << preprocessed.cols << "x" << preprocessed.rows << std::endl;
+        TC_LOG_DEBUG("Image set for Tesseract: " << preprocessed.cols << "x" << preprocessed.rows);
         
-        std::cout << "Image set for Tesseract successfully" << std::endl;
+        // Recognize first so the call can be cancelled or time out
+        recognize();
         
         // Extract text
         char* text = tess_api_->GetUTF8Text();
@@ -105,14 +325,14 @@ std::string OCREngine::extract_text(const std::string& image_path) {
         
         // Check if text is empty or contains only whitespace
         if (result.empty() || result.find_first_not_of(" \t\n\r") == std::string::npos) {
-            std::cout << "Empty page!!" << std::endl;
+            TC_LOG_DEBUG("Empty page");
             return "";
         }
         
         // Post-process text to improve word separation
         result = post_process_text(result);
         
-        std::cout << "Text extracted successfully, length: " << result.length() << std::endl;
+        TC_LOG_DEBUG("Text extracted successfully, length: " << result.length());
         return result;
         
     } catch (const std::exception& e) {
@@ -120,76 +340,75 @@ std::string OCREngine::extract_text(const std::string& image_path) {
     }
 }
 
-OCRResult OCREngine::extract_text_with_confidence(const std::string& image_path) {
+OCRResult OCREngine::extract_text_with_confidence(const std::string& image_path, const std::string& level) {
+    return with_decode_timing(
+        [&]() { return load_image(image_path); },
+        [&](const cv::Mat& image) { return extract_text_with_confidence_from_mat(image, level); });
+}
+
+OCRResult OCREngine::extract_text_with_confidence_from_bytes(const std::string& data, const std::string& level) {
+    return with_decode_timing(
+        [&]() { return decode_image(data); },
+        [&](const cv::Mat& image) { return extract_text_with_confidence_from_mat(image, level); });
+}
+
+OCRResult OCREngine::extract_text_with_confidence_from_mat(const cv::Mat& image, const std::string& level) {
+    std::lock_guard<std::mutex> lock(call_mutex_);
+    return extract_text_with_confidence_locked(image, level);
+}
+
+OCRResult OCREngine::extract_text_with_confidence_locked(const cv::Mat& image, const std::string& level) {
     if (!initialized_) {
         throw std::runtime_error("OCR engine not initialized");
     }
     
     OCRResult result;
+    StageTimer timer(result);
     
     try {
-        // Load image using OpenCV
-        cv::Mat image = cv::imread(image_path);
         if (image.empty()) {
-            throw std::runtime_error("Failed to load image: " + image_path);
+            throw std::runtime_error("Empty image");
         }
         
-        // Preprocess image
-        cv::Mat preprocessed = image.clone();
-        preprocessed = convert_to_grayscale(preprocessed);
-        preprocessed = enhance_contrast(preprocessed);
-        preprocessed = enhance_sharpness(preprocessed);
-        preprocessed = denoise_image(preprocessed);
+        // Preprocess image (in the engine's scratch buffers, the input is only read)
+        cv::Mat gray = convert_to_grayscale(image);
+        timer.lap("grayscale");
+        const std::vector<PipelineStep>& steps = select_pipeline(gray, enhance_pipeline_, result.quality);
+        if (!result.quality.empty()) {
+            timer.lap("classify");
+        }
+        cv::Mat preprocessed = run_pipeline(steps, gray, result.scale, &result);
+        timer.restart();
         
-        // Set image for Tesseract
+        // Set image for Tesseract (copies the pixels, the scratch buffer is free again)
         tess_api_->SetImage(preprocessed.data, preprocessed.cols, preprocessed.rows, 
                            preprocessed.channels(), preprocessed.step);
         
-        // Get text with confidence
+        // Recognize once, then read the full text and the per-element results
+        recognize();
+        timer.lap("recognize");
+        
         char* text = tess_api_->GetUTF8Text();
-        result.text = std::string(text);
+        result.text = text ? std::string(text) : std::string();
         delete[] text;
+        timer.lap("get_text");
         
-        // Get confidence scores
-        int* word_count = tess_api_->AllWordConfidences();
-        
-        if (word_count) {
-            for (int i = 0; i < *word_count; ++i) {
-                result.confidences.push_back(static_cast<double>(word_count[i]));
-            }
-            delete[] word_count;
-        }
-        
-        // Calculate average confidence
-        if (!result.confidences.empty()) {
-            double sum = 0.0;
-            for (double conf : result.confidences) {
-                sum += conf;
-            }
-            result.confidence = sum / result.confidences.size();
-        } else {
-            result.confidence = 0.0;
-        }
-        
-        // Split text into parts
-        std::istringstream iss(result.text);
-        std::string word;
-        while (iss >> word) {
-            result.text_parts.push_back(word);
-        }
+        collect_results(parse_level(level), result);
+        timer.lap("collect");
         
     } catch (const std::exception& e) {
         throw std::runtime_error("Text extraction with confidence failed: " + std::string(e.what()));
     }
     
-         return result;
- }
+    return result;
+}
 
 std::string OCREngine::preprocess_image(const std::string& image_path, 
                                        bool enhance_contrast,
                                        bool enhance_sharpness,
                                        bool denoise,
                                        bool grayscale) {
+    std::lock_guard<std::mutex> lock(call_mutex_);
     try {
         // Load image
         cv::Mat image = cv::imread(image_path);
@@ -198,12 +417,22 @@ std::string OCREngine::preprocess_image(const std::string& image_path,
         }
         
         // Apply preprocessing
-        cv::Mat processed = image.clone();
+        cv::Mat processed = image;
         
         if (grayscale) {
             processed = convert_to_grayscale(processed);
         }
         
+        if (processed.channels() == 1) {
+            double scale = 1.0;
+            processed = normalize_resolution(processed, scale);
+        } else {
+            // Estimate on a gray copy, resize the color image by the same factor
+            double scale = resolution_scale(convert_to_grayscale(processed), normalize_resolution_,
+                                            target_x_height_, min_x_height_, max_x_height_);
+            processed = resize_by(processed, scale);
+        }
+        
         if (enhance_contrast) {
             processed = this->enhance_contrast(processed);
         }
@@ -231,16 +460,12 @@ std::string OCREngine::preprocess_image(const std::string& image_path,
 
 bool OCREngine::set_language(const std::string& language) {
     try {
-        // End current API
-        if (tess_api_) {
-            tess_api_->End();
-        }
-        
-        // Reinitialize with new language
-        return initialize(language);
+        // Switch to the cached API for this language, initializing it only on first use
+        std::lock_guard<std::mutex> lock(call_mutex_);
+        return initialize_locked(language);
         
     } catch (const std::exception& e) {
-        std::cerr << "Failed to set language: " << e.what() << std::endl;
+        TC_LOG_ERROR("Failed to set language: " << e.what());
         return false;
     }
 }
@@ -253,57 +478,495 @@ std::vector<std::string> OCREngine::get_supported_languages() {
 }
 
 std::string OCREngine::get_info() const {
+    std::lock_guard<std::mutex> lock(call_mutex_);
     std::ostringstream oss;
     oss << "C++ OCR Engine (Tesseract + OpenCV)\n";
     oss << "Initialized: " << (initialized_ ? "Yes" : "No") << "\n";
     oss << "Language: " << current_language_ << "\n";
+    oss << "Cached languages: " << language_apis_.size() << "/" << max_cached_languages_ << "\n";
     oss << "Tesseract Version: " << (tess_api_ ? tess_api_->Version() : "Unknown") << "\n";
     return oss.str();
 }
 
+size_t OCREngine::get_scratch_bytes() const {
+    std::lock_guard<std::mutex> lock(call_mutex_);
+    return work_[0].capacity() + work_[1].capacity() + binary_.capacity() + labels_.capacity();
+}
+
+double OCREngine::estimate_x_height(const cv::Mat& gray) {
+    // Otsu binarization, the minority color is the ink
+    cv::Mat binary = binary_.get(gray.rows, gray.cols, CV_8UC1);
+    cv::threshold(gray, binary, 0, 255, cv::THRESH_BINARY + cv::THRESH_OTSU);
+    if (static_cast<size_t>(cv::countNonZero(binary)) > binary.total() / 2) {
+        cv::bitwise_not(binary, binary);
+    }
+    
+    cv::Mat labels = labels_.get(gray.rows, gray.cols, CV_32S);
+    int count = cv::connectedComponentsWithStats(binary, labels, component_stats_,
+                                                 component_centroids_, 8, CV_32S);
+    const cv::Mat& stats = component_stats_;
+    
+    // Glyph-like components: not tiny, not taller than a third of the image,
+    // not wider than three glyphs, neither hairlines nor solid blocks
+    std::vector<int>& heights = glyph_heights_;
+    heights.clear();
+    for (int i = 1; i < count; ++i) {  // label 0 is the background
+        int width = stats.at<int>(i, cv::CC_STAT_WIDTH);
+        int height = stats.at<int>(i, cv::CC_STAT_HEIGHT);
+        double fill = static_cast<double>(stats.at<int>(i, cv::CC_STAT_AREA)) / std::max(width * height, 1);
+        if (height >= 3 && height <= gray.rows / 3 && width <= 3 * height && fill >= 0.1 && fill <= 0.95) {
+            heights.push_back(height);
+        }
+    }
+    if (heights.size() < kMinGlyphComponents) {
+        return 0.0;
+    }
+    
+    // Median, averaging the two middle values like numpy.median
+    size_t middle = heights.size() / 2;
+    std::nth_element(heights.begin(), heights.begin() + middle, heights.end());
+    double median = heights[middle];
+    if (heights.size() % 2 == 0) {
+        median = (median + *std::max_element(heights.begin(), heights.begin() + middle)) / 2.0;
+    }
+    return median;
+}
+
 // Private methods
 
+cv::Mat OCREngine::next_buffer(const cv::Mat& input, int rows, int cols, int type) {
+    // Alternate between the two work buffers; caller-owned input is never written
+    ScratchBuffer& target = input.data == work_[0].data() ? work_[1] : work_[0];
+    return target.get(rows, cols, type);
+}
+
+double OCREngine::resolution_scale(const cv::Mat& gray, bool enabled, double target_x_height,
+                                   double min_x_height, double max_x_height) {
+    if (!enabled) {
+        return 1.0;
+    }
+    
+    double x_height = estimate_x_height(gray);
+    if (x_height <= 0.0 || (x_height >= min_x_height && x_height <= max_x_height)) {
+        return 1.0;
+    }
+    
+    double scale = std::clamp(target_x_height / x_height, kMinScale, kMaxScale);
+    TC_LOG_DEBUG("Estimated x-height " << x_height << " px, resizing by " << scale);
+    return scale;
+}
+
+cv::Mat OCREngine::normalize_resolution(const cv::Mat& gray, double& scale) {
+    scale = resolution_scale(gray, normalize_resolution_, target_x_height_, min_x_height_, max_x_height_);
+    return resize_by(gray, scale);
+}
+
+cv::Mat OCREngine::resize_by(const cv::Mat& image, double scale) {
+    if (scale == 1.0) {
+        return image;
+    }
+    
+    cv::Mat resized = next_buffer(image, cvRound(image.rows * scale), cvRound(image.cols * scale), image.type());
+    cv::resize(image, resized, resized.size(), 0, 0, scale < 1.0 ? cv::INTER_AREA : cv::INTER_CUBIC);
+    return resized;
+}
+
+void OCREngine::set_pipeline(const std::vector<PipelineStage>& stages) {
+    // Compile first so an invalid spec leaves the current pipeline in place
+    std::vector<PipelineStep> compiled = compile_pipeline(stages);
+    std::lock_guard<std::mutex> lock(call_mutex_);
+    pipeline_ = std::move(compiled);
+    use_custom_pipeline_ = true;
+}
+
+void OCREngine::reset_pipeline() {
+    std::lock_guard<std::mutex> lock(call_mutex_);
+    pipeline_.clear();
+    use_custom_pipeline_ = false;
+}
+
+std::vector<std::string> OCREngine::get_pipeline_steps() const {
+    std::lock_guard<std::mutex> lock(call_mutex_);
+    std::vector<std::string> names;
+    for (const auto& step : pipeline_) {
+        names.push_back(step.name);
+    }
+    return names;
+}
+
+void OCREngine::set_adaptive_preprocessing(bool enabled) {
+    std::lock_guard<std::mutex> lock(call_mutex_);
+    adaptive_preprocessing_ = enabled;
+}
+
+std::string OCREngine::classify_quality(const cv::Mat& gray) {
+    // Regular subsample of at most kMaxQualitySamples pixels
+    int step = std::max(1, static_cast<int>(std::ceil(std::sqrt(gray.total() / kMaxQualitySamples))));
+    int histogram[256] = {0};
+    size_t samples = 0;
+    for (int y = 0; y < gray.rows; y += step) {
+        const uchar* row = gray.ptr<uchar>(y);
+        for (int x = 0; x < gray.cols; x += step) {
+            ++histogram[row[x]];
+            ++samples;
+        }
+    }
+    
+    int background = 0;
+    for (int v = 1; v < 256; ++v) {
+        if (histogram[v] > histogram[background]) {
+            background = v;
+        }
+    }
+    int ink = -1;
+    for (int v = 0; v < 256; ++v) {
+        if (std::abs(v - background) >= kMinInkDistance && histogram[v] > 0
+            && (ink < 0 || histogram[v] > histogram[ink])) {
+            ink = v;
+        }
+    }
+    if (ink < 0) {
+        // Blank image, nothing to enhance
+        return "none";
+    }
+    int contrast = std::abs(background - ink);
+    
+    size_t near = 0;
+    for (int v = 0; v < 256; ++v) {
+        if (std::abs(v - background) <= kPeakTolerance || std::abs(v - ink) <= kPeakTolerance) {
+            near += histogram[v];
+        }
+    }
+    
+    // Text edges jump most of the way between the peaks within one pixel;
+    // noise and blur produce many smaller steps
+    size_t strong = 0;
+    size_t soft = 0;
+    for (int y = 0; y < gray.rows; y += step) {
+        const uchar* row = gray.ptr<uchar>(y);
+        for (int x = step; x < gray.cols; x += step) {
+            int diff = std::abs(row[x] - row[x - step]);
+            if (diff >= contrast / 2) {
+                ++strong;
+            } else if (diff > kPeakTolerance) {
+                ++soft;
+            }
+        }
+    }
+    double sharp_edges = strong + soft ? static_cast<double>(strong) / (strong + soft) : 1.0;
+    
+    if (static_cast<double>(near) / samples < kMinPeakFraction || sharp_edges < kMinSharpEdges) {
+        return "full";
+    }
+    return contrast >= kCleanContrast ? "none" : "binarize";
+}
+
+const std::vector<PipelineStep>& OCREngine::select_pipeline(const cv::Mat& gray,
+                                                            const std::vector<PipelineStep>& full,
+                                                            std::string& quality) const {
+    if (use_custom_pipeline_) {
+        return pipeline_;
+    }
+    if (!adaptive_preprocessing_) {
+        return full;
+    }
+    
+    quality = classify_quality(gray);
+    if (quality == "none") {
+        return fast_pipeline_;
+    }
+    if (quality == "binarize") {
+        return binarize_simple_pipeline_;
+    }
+    return full;
+}
+
+std::vector<PipelineStep> OCREngine::compile_pipeline(const std::vector<PipelineStage>& stages) {
+    using Op = PipelineStep::Op;
+    std::vector<PipelineStep> steps;
+    
+    for (const auto& stage : stages) {
+        const std::string& op = stage.first;
+        auto known = stage_defaults().find(op);
+        if (known == stage_defaults().end()) {
+            throw std::invalid_argument("Unknown pipeline stage: " + op);
+        }
+        for (const auto& entry : stage.second) {
+            if (known->second.count(entry.first) == 0) {
+                throw std::invalid_argument("Unknown parameter for '" + op + "': " + entry.first);
+            }
+        }
+        auto param = [&](const char* key) {
+            auto found = stage.second.find(key);
+            return found != stage.second.end() ? found->second : known->second.at(key);
+        };
+        PipelineStep* last = steps.empty() ? nullptr : &steps.back();
+        
+        if (op == "contrast" || op == "invert" || op == "threshold") {
+            // Pointwise on 8-bit pixels, so any run of them is one exact lookup table
+            cv::Mat lut(1, 256, CV_8U);
+            for (int i = 0; i < 256; ++i) {
+                if (op == "contrast") {
+                    // Same rounding and saturation as convertTo
+                    lut.at<uchar>(i) = cv::saturate_cast<uchar>(i * param("alpha") + param("beta"));
+                } else if (op == "invert") {
+                    lut.at<uchar>(i) = static_cast<uchar>(255 - i);
+                } else {
+                    lut.at<uchar>(i) = i > param("value") ? 255 : 0;
+                }
+            }
+            if (last && last->op == Op::Lut) {
+                cv::Mat fused;
+                cv::LUT(last->data, lut, fused);
+                last->data = fused;
+                last->name += "+" + op;
+                continue;
+            }
+            PipelineStep step;
+            step.op = Op::Lut;
+            step.data = lut;
+            step.name = op;
+            steps.push_back(std::move(step));
+        } else if (op == "dilate" || op == "erode") {
+            Op morph = op == "dilate" ? Op::Dilate : Op::Erode;
+            int width = static_cast<int>(param("width"));
+            int height = static_cast<int>(param("height"));
+            if (width < 1 || height < 1) {
+                throw std::invalid_argument(op + " width and height must be at least 1");
+            }
+            cv::Point anchor(width / 2, height / 2);
+            if (last && last->op == morph) {
+                // Rect (w1, h1) then rect (w2, h2) equals rect (w1 + w2 - 1, h1 + h2 - 1)
+                // with the anchors added
+                cv::Size size(last->data.cols + width - 1, last->data.rows + height - 1);
+                last->data = cv::getStructuringElement(cv::MORPH_RECT, size);
+                last->anchor += anchor;
+                last->name += "+" + op;
+                continue;
+            }
+            PipelineStep step;
+            step.op = morph;
+            step.data = cv::getStructuringElement(cv::MORPH_RECT, cv::Size(width, height));
+            step.anchor = anchor;
+            step.name = op;
+            steps.push_back(std::move(step));
+        } else {
+            PipelineStep step;
+            step.name = op;
+            if (op == "normalize") {
+                step.op = Op::Normalize;
+                if (!stage.second.empty()) {
+                    // Explicit settings always normalize, missing ones use the defaults
+                    step.target_x_height = param("target_x_height");
+                    step.min_x_height = param("min_x_height");
+                    step.max_x_height = param("max_x_height");
+                    if (!(0 < step.min_x_height && step.min_x_height <= step.target_x_height
+                          && step.target_x_height <= step.max_x_height)) {
+                        throw std::invalid_argument("Expected 0 < min_x_height <= target_x_height <= max_x_height");
+                    }
+                }
+            } else if (op == "otsu") {
+                step.op = Op::Otsu;
+            } else if (op == "adaptive_threshold") {
+                step.op = Op::AdaptiveThreshold;
+                step.size = static_cast<int>(param("block_size"));
+                step.c = param("c");
+                if (step.size < 3 || step.size % 2 != 1) {
+                    throw std::invalid_argument("adaptive_threshold block_size must be an odd number >= 3");
+                }
+            } else if (op == "sharpen") {
+                step.op = Op::Sharpen;
+                double amount = param("amount");
+                step.data = (cv::Mat_<float>(3, 3) <<
+                    0, static_cast<float>(-amount), 0,
+                    static_cast<float>(-amount), static_cast<float>(1 + 4 * amount), static_cast<float>(-amount),
+                    0, static_cast<float>(-amount), 0);
+            } else {  // median
+                step.op = Op::Median;
+                step.size = static_cast<int>(param("ksize"));
+                if (step.size < 1 || step.size % 2 != 1) {
+                    throw std::invalid_argument("median ksize must be a positive odd number");
+                }
+            }
+            steps.push_back(std::move(step));
+        }
+    }
+    return steps;
+}
+
+cv::Mat OCREngine::run_pipeline(const std::vector<PipelineStep>& steps, const cv::Mat& gray,
+                                double& scale, OCRResult* result) {
+    using Op = PipelineStep::Op;
+    scale = 1.0;
+    cv::Mat image = gray;
+    auto last = std::chrono::steady_clock::now();
+    
+    for (const auto& step : steps) {
+        cv::Mat output;
+        if (step.op != Op::Normalize) {
+            output = next_buffer(image, image.rows, image.cols, CV_8UC1);
+        }
+        
+        switch (step.op) {
+            case Op::Lut:
+                cv::LUT(image, step.data, output);
+                break;
+            case Op::Normalize: {
+                double factor = step.target_x_height > 0
+                    ? resolution_scale(image, true, step.target_x_height, step.min_x_height, step.max_x_height)
+                    : resolution_scale(image, normalize_resolution_, target_x_height_, min_x_height_, max_x_height_);
+                output = resize_by(image, factor);
+                scale *= factor;
+                break;
+            }
+            case Op::Otsu:
+                cv::threshold(image, output, 0, 255, cv::THRESH_BINARY + cv::THRESH_OTSU);
+                break;
+            case Op::AdaptiveThreshold:
+                cv::adaptiveThreshold(image, output, 255, cv::ADAPTIVE_THRESH_GAUSSIAN_C,
+                                      cv::THRESH_BINARY, step.size, step.c);
+                break;
+            case Op::Sharpen:
+                cv::filter2D(image, output, -1, step.data);
+                break;
+            case Op::Median:
+                cv::medianBlur(image, output, step.size);
+                break;
+            case Op::Dilate:
+                cv::dilate(image, output, step.data, step.anchor);
+                break;
+            case Op::Erode:
+                cv::erode(image, output, step.data, step.anchor);
+                break;
+        }
+        image = output;
+        
+        if (result) {
+            auto now = std::chrono::steady_clock::now();
+            result->timings.emplace_back(step.name, std::chrono::duration<double>(now - last).count());
+            last = now;
+        }
+    }
+    return image;
+}
+
 cv::Mat OCREngine::enhance_contrast(const cv::Mat& image) {
-    cv::Mat enhanced;
     double alpha = 1.5; // Contrast control
     int beta = 10;      // Brightness control
     
+    cv::Mat enhanced = next_buffer(image, image.rows, image.cols, image.type());
     image.convertTo(enhanced, -1, alpha, beta);
     return enhanced;
 }
 
 cv::Mat OCREngine::enhance_sharpness(const cv::Mat& image) {
-    cv::Mat kernel = (cv::Mat_<float>(3, 3) << 
-        0, -1, 0,
-        -1, 5, -1,
-        0, -1, 0);
-    
-    cv::Mat sharpened;
-    cv::filter2D(image, sharpened, -1, kernel);
+    cv::Mat sharpened = next_buffer(image, image.rows, image.cols, image.type());
+    cv::filter2D(image, sharpened, -1, sharpen_kernel_);
     return sharpened;
 }
 
 cv::Mat OCREngine::denoise_image(const cv::Mat& image) {
-    cv::Mat denoised;
+    cv::Mat denoised = next_buffer(image, image.rows, image.cols, image.type());
     cv::medianBlur(image, denoised, 3);
     return denoised;
 }
 
 cv::Mat OCREngine::convert_to_grayscale(const cv::Mat& image) {
     if (image.channels() == 1) {
-        return image.clone();
+        // Read-only from here on, no copy needed
+        return image;
     }
     
-    cv::Mat grayscale;
+    cv::Mat grayscale = next_buffer(image, image.rows, image.cols, CV_8UC1);
     cv::cvtColor(image, grayscale, cv::COLOR_BGR2GRAY);
     return grayscale;
 }
 
+tesseract::PageIteratorLevel OCREngine::parse_level(const std::string& level) {
+    if (level == "word") return tesseract::RIL_WORD;
+    if (level == "line") return tesseract::RIL_TEXTLINE;
+    if (level == "paragraph") return tesseract::RIL_PARA;
+    if (level == "block") return tesseract::RIL_BLOCK;
+    throw std::invalid_argument("Unsupported result level: " + level);
+}
+
+void OCREngine::collect_results(tesseract::PageIteratorLevel level, OCRResult& result) {
+    result.text_parts.clear();
+    result.confidences.clear();
+    result.bounding_boxes.clear();
+    result.confidence = 0.0;
+    
+    std::unique_ptr<tesseract::ResultIterator> it(tess_api_->GetIterator());
+    if (!it) {
+        return;
+    }
+    
+    // Single pass: text, confidence and box come from the same element,
+    // so the three arrays are aligned by construction
+    double sum = 0.0;
+    do {
+        if (it->Empty(level)) {
+            continue;
+        }
+        
+        std::unique_ptr<char[]> element(it->GetUTF8Text(level));
+        if (!element) {
+            continue;
+        }
+        
+        std::string part(element.get());
+        size_t end = part.find_last_not_of(" \t\n\r");
+        if (end == std::string::npos) {
+            continue;
+        }
+        part.erase(end + 1);
+        
+        int left = 0, top = 0, right = 0, bottom = 0;
+        it->BoundingBox(level, &left, &top, &right, &bottom);
+        if (result.scale != 1.0) {
+            // Back to the coordinates of the input image
+            left = static_cast<int>(std::lround(left / result.scale));
+            top = static_cast<int>(std::lround(top / result.scale));
+            right = static_cast<int>(std::lround(right / result.scale));
+            bottom = static_cast<int>(std::lround(bottom / result.scale));
+        }
+        
+        double conf = static_cast<double>(it->Confidence(level));
+        result.text_parts.push_back(std::move(part));
+        result.confidences.push_back(conf);
+        result.bounding_boxes.insert(result.bounding_boxes.end(),
+                                     {left, top, right - left, bottom - top});
+        sum += conf;
+    } while (it->Next(level));
+    
+    if (!result.confidences.empty()) {
+        result.confidence = sum / result.confidences.size();
+    }
+}
+
+cv::Mat OCREngine::load_image(const std::string& image_path) {
+    cv::Mat image = cv::imread(image_path);
+    if (image.empty()) {
+        throw std::runtime_error("Failed to load image: " + image_path);
+    }
+    return image;
+}
+
+cv::Mat OCREngine::decode_image(const std::string& data) {
+    cv::Mat buffer(1, static_cast<int>(data.size()), CV_8UC1,
+                   const_cast<char*>(data.data()));
+    cv::Mat image = cv::imdecode(buffer, cv::IMREAD_COLOR);
+    if (image.empty()) {
+        throw std::runtime_error("Failed to decode image bytes");
+    }
+    return image;
+}
+
 bool OCREngine::save_image(const cv::Mat& image, const std::string& output_path) {
     try {
         return cv::imwrite(output_path, image);
     } catch (const std::exception& e) {
-        std::cerr << "Failed to save image: " << e.what() << std::endl;
+        TC_LOG_ERROR("Failed to save image: " << e.what());
         return false;
     }
 }
@@ -4,20 +4,75 @@
 #include <string>
 #include <vector>
 #include <memory>
+#include <list>
+#include <map>
+#include <cstdint>
+#include <atomic>
+#include <mutex>
+#include <utility>
 #include <opencv2/opencv.hpp>
 #include <tesseract/baseapi.h>
+#include <tesseract/ocrclass.h>
 #include <leptonica/allheaders.h>
 
 namespace textcapture {
 
+// Growable pixel storage handed out as cv::Mat views. The storage only grows,
+// so once the largest image has been seen no stage allocates again.
+class ScratchBuffer {
+public:
+    // Continuous matrix of the given size and type backed by this buffer
+    cv::Mat get(int rows, int cols, int type);
+    const uchar* data() const { return storage_.data(); }
+    size_t capacity() const { return storage_.size(); }
+    
+private:
+    std::vector<uchar> storage_;
+};
+
+// One stage of a preprocessing pipeline spec: operation name and numeric
+// parameters, as produced by src/ocr/pipeline.py parse_pipeline()
+using PipelineStage = std::pair<std::string, std::map<std::string, double>>;
+
+// Executable pipeline step, see OCREngine::compile_pipeline
+struct PipelineStep {
+    enum class Op { Lut, Normalize, Otsu, AdaptiveThreshold, Sharpen, Median, Dilate, Erode };
+    
+    Op op = Op::Lut;
+    std::string name;
+    // 1x256 lookup table, sharpen kernel or morphology element
+    cv::Mat data;
+    cv::Point anchor{-1, -1};
+    int size = 0;  // median ksize or adaptive threshold block size
+    double c = 0.0;
+    // Normalize targets, 0 means the engine's resolution settings
+    double target_x_height = 0.0;
+    double min_x_height = 0.0;
+    double max_x_height = 0.0;
+};
+
 struct OCRResult {
     std::string text;
-    double confidence;
+    double confidence = 0.0;
+    // Aligned per-element results (word, line, paragraph or block)
     std::vector<std::string> text_parts;
     std::vector<double> confidences;
-    std::vector<cv::Rect> bounding_boxes;
+    // Flat (x, y, width, height) per element, contiguous so it can be exposed as an (N, 4) array
+    std::vector<int32_t> bounding_boxes;
+    // Seconds spent per pipeline stage, in execution order
+    std::vector<std::pair<std::string, double>> timings;
+    // Factor the image was resized by before recognition (boxes are in input coordinates)
+    double scale = 1.0;
+    // Preprocessing picked by classify_quality ("none", "binarize" or "full"),
+    // empty when a custom pipeline ran or adaptive preprocessing is off
+    std::string quality;
 };
 
+// Calls on one engine are serialized: every method that touches the Tesseract
+// API, the scratch buffers or the settings holds an internal mutex for the
+// whole call (the Python bindings take it after releasing the GIL). Use one
+// engine per thread to recognize in parallel. cancel() and reset_cancel() do
+// not take the mutex, so they reach a running call.
 class OCREngine {
 public:
     OCREngine();
@@ -30,7 +85,19 @@ public:
     std::string extract_text(const std::string& image_path);
     
     // Extract text with confidence scores
-    OCRResult extract_text_with_confidence(const std::string& image_path);
+    // level: "word", "line", "paragraph" or "block"
+    OCRResult extract_text_with_confidence(const std::string& image_path,
+                                           const std::string& level = "word");
+    
+    // In-memory variants (BGR, BGRA or grayscale 8-bit images, no disk round trip)
+    std::string extract_text_from_mat(const cv::Mat& image);
+    OCRResult extract_text_with_confidence_from_mat(const cv::Mat& image,
+                                                    const std::string& level = "word");
+    
+    // Decode an encoded image (PNG, JPEG, ...) held in memory and extract text
+    std::string extract_text_from_bytes(const std::string& data);
+    OCRResult extract_text_with_confidence_from_bytes(const std::string& data,
+                                                      const std::string& level = "word");
     
     // Preprocess image for better OCR results
     std::string preprocess_image(const std::string& image_path, 
@@ -39,27 +106,138 @@ public:
                                 bool denoise = true,
                                 bool grayscale = true);
     
-    // Set OCR language
+    // Set OCR language (switching to a cached language does not reload traineddata)
     bool set_language(const std::string& language);
     
+    // Number of initialized languages kept warm (least recently used are evicted)
+    void set_max_cached_languages(size_t max_languages);
+    std::vector<std::string> get_cached_languages() const;
+    
     // Get supported languages
     std::vector<std::string> get_supported_languages();
     
     // Get engine information
     std::string get_info() const;
+    
+    // Abort the running recognition; safe to call from another thread.
+    // The request stays set until reset_cancel(), so a cancel issued just
+    // before a call starts is not lost.
+    void cancel();
+    void reset_cancel();
+    
+    // Recognition deadline in milliseconds for subsequent calls (0 disables it)
+    void set_timeout_ms(int timeout_ms);
+    
+    // Rescale images whose estimated x-height is outside [min, max] to the target
+    // before recognition (same defaults as src/ocr/resolution.py)
+    void set_resolution_normalization(bool enabled, double target_x_height = 20.0,
+                                      double min_x_height = 14.0, double max_x_height = 32.0);
+    
+    // Median height of glyph-like connected components of a grayscale image,
+    // 0 when there are too few of them to tell (uses the scratch buffers, so
+    // it must not run concurrently with other calls on this engine)
+    double estimate_x_height(const cv::Mat& gray);
+    
+    // Bytes held by the preprocessing scratch buffers
+    size_t get_scratch_bytes() const;
+    
+    // Use a custom preprocessing pipeline for all calls (an empty spec disables
+    // preprocessing); reset_pipeline() restores the built-in ones: "binarize"
+    // ("binarize-simple" for jpn) for extract_text, "enhance" with confidence
+    void set_pipeline(const std::vector<PipelineStage>& stages);
+    void reset_pipeline();
+    
+    // Names of the compiled steps of the custom pipeline (fused stages are joined by '+')
+    std::vector<std::string> get_pipeline_steps() const;
+    
+    // Validate a spec and fuse it: runs of pointwise stages become one lookup
+    // table and consecutive rectangular dilations/erosions one larger element
+    static std::vector<PipelineStep> compile_pipeline(const std::vector<PipelineStage>& stages);
+    
+    // Without a custom pipeline, classify each image and run the smallest
+    // pipeline it needs (on by default)
+    void set_adaptive_preprocessing(bool enabled);
+    
+    // "none" for crisp high-contrast images, "binarize" for clean low-contrast
+    // ones, "full" otherwise (same rules as src/ocr/quality.py)
+    static std::string classify_quality(const cv::Mat& gray);
 
 private:
-    std::unique_ptr<tesseract::TessBaseAPI> tess_api_;
+    // One initialized API per language string ("eng", "eng+vie", ...), most recently used first
+    using LanguageApi = std::pair<std::string, std::unique_ptr<tesseract::TessBaseAPI>>;
+    std::list<LanguageApi> language_apis_;
+    tesseract::TessBaseAPI* tess_api_;  // active API, owned by language_apis_
     std::string current_language_;
     bool initialized_;
+    size_t max_cached_languages_;
+    std::atomic<bool> cancel_requested_;
+    int timeout_ms_;
+    bool normalize_resolution_;
+    double target_x_height_;
+    double min_x_height_;
+    double max_x_height_;
+    
+    // Preprocessing stages write into these instead of allocating a cv::Mat
+    // per stage: two buffers the stages alternate between, plus the binary
+    // image and labels of the x-height estimate
+    ScratchBuffer work_[2];
+    ScratchBuffer binary_;
+    ScratchBuffer labels_;
+    std::vector<int> glyph_heights_;
+    cv::Mat component_stats_;
+    cv::Mat component_centroids_;
+    // Built once instead of per image
+    const cv::Mat sharpen_kernel_;
+    
+    // Compiled pipelines: the custom one and the built-ins
+    bool use_custom_pipeline_;
+    std::vector<PipelineStep> pipeline_;
+    const std::vector<PipelineStep> binarize_pipeline_;
+    const std::vector<PipelineStep> binarize_simple_pipeline_;
+    const std::vector<PipelineStep> enhance_pipeline_;
+    const std::vector<PipelineStep> fast_pipeline_;
+    bool adaptive_preprocessing_;
+    
+    // Held for the whole of every call that uses the members above
+    mutable std::mutex call_mutex_;
+    
+    // Implementations of the public calls, call_mutex_ must be held
+    bool initialize_locked(const std::string& language);
+    std::string extract_text_locked(const cv::Mat& image);
+    OCRResult extract_text_with_confidence_locked(const cv::Mat& image, const std::string& level);
+    
+    void evict_languages();
+    
+    // Recognize the current image, honoring cancel() and the timeout
+    void recognize();
+    static bool cancel_callback(void* engine, int words);
     
-    // Image preprocessing methods
+    // Image preprocessing methods. Each stage reads its input and returns a view
+    // into the scratch buffer not holding it; the input is never modified, so
+    // caller-owned pixels can be passed in without a copy. A returned view is
+    // valid until the stage after next.
+    cv::Mat next_buffer(const cv::Mat& input, int rows, int cols, int type);
+    double resolution_scale(const cv::Mat& gray, bool enabled, double target_x_height,
+                            double min_x_height, double max_x_height);
+    cv::Mat normalize_resolution(const cv::Mat& gray, double& scale);
+    cv::Mat resize_by(const cv::Mat& image, double scale);
+    // Run compiled steps on a grayscale image; records one timing per step when result is given
+    cv::Mat run_pipeline(const std::vector<PipelineStep>& steps, const cv::Mat& gray,
+                         double& scale, OCRResult* result = nullptr);
+    // Pipeline for a grayscale image: the custom one, or the one its quality
+    // class needs with full as the fallback (quality is set when classified)
+    const std::vector<PipelineStep>& select_pipeline(const cv::Mat& gray, const std::vector<PipelineStep>& full,
+                                                     std::string& quality) const;
     cv::Mat enhance_contrast(const cv::Mat& image);
     cv::Mat enhance_sharpness(const cv::Mat& image);
     cv::Mat denoise_image(const cv::Mat& image);
     cv::Mat convert_to_grayscale(const cv::Mat& image);
     
     // Helper methods
+    static tesseract::PageIteratorLevel parse_level(const std::string& level);
+    void collect_results(tesseract::PageIteratorLevel level, OCRResult& result);
+    cv::Mat load_image(const std::string& image_path);
+    cv::Mat decode_image(const std::string& data);
     bool save_image(const cv::Mat& image, const std::string& output_path);
     std::string generate_temp_path(const std::string& original_path);
     std::string post_process_text(const std::string& text);
@@ -3,32 +3,110 @@ Python wrapper for C++ OCR engine
 This module provides a fallback to Python implementation if C++ is not available
 """
 
+import atexit
+import logging
 import os
 import sys
+import threading
+import time
 from typing import Dict, Any, Optional
 
-try:
-    # Try to import C++ implementation
-    from .cpp.cpp_ocr import OCREngine as _CppOCREngine
-    CPP_AVAILABLE = True
-except ImportError:
-    try:
-        # Try alternative import path for compiled module
-        import sys
-        import os
-        release_path = os.path.join(os.path.dirname(__file__), '..', 'Release')
-        if release_path not in sys.path:
-            sys.path.append(release_path)
-        from cpp_ocr import OCREngine as _CppOCREngine
-        CPP_AVAILABLE = True
-    except ImportError:
-        CPP_AVAILABLE = False
-        _CppOCREngine = None
+from .pipeline import PipelineSpec, parse_pipeline
+from .resolution import RESOLUTION_OPTIONS, resolution_options
+
+
+_cpp_module = None
+_CppOCREngine = None
+_load_attempted = False
+_load_lock = threading.Lock()
+
+# Native log records are forwarded to this logger
+native_logger = logging.getLogger(__package__ + '.native')
+
+
+def _engine_class(module):
+    """Get the engine class from the compiled module (exported as CppOCREngine)"""
+    engine_class = getattr(module, 'CppOCREngine', None) or getattr(module, 'OCREngine', None)
+    if engine_class is None:
+        raise ImportError("Compiled cpp_ocr module does not export an OCR engine class")
+    return engine_class
+
+
+def _load_cpp_module():
+    """
+    Import the compiled module on first use
+    
+    Loading it pulls in OpenCV and Tesseract, so it is deferred until a
+    C++ engine is actually needed.
+    
+    Returns:
+        Compiled module, or None if it is not available
+    """
+    global _cpp_module, _CppOCREngine, _load_attempted
+    if _load_attempted:
+        return _cpp_module
+    
+    with _load_lock:
+        if _load_attempted:
+            return _cpp_module
+        try:
+            # Try to import C++ implementation
+            from .cpp import cpp_ocr as module
+            _CppOCREngine = _engine_class(module)
+            _cpp_module = module
+        except ImportError:
+            try:
+                # Try alternative import path for compiled module
+                release_path = os.path.join(os.path.dirname(__file__), '..', 'Release')
+                if release_path not in sys.path:
+                    sys.path.append(release_path)
+                import cpp_ocr as module
+                _CppOCREngine = _engine_class(module)
+                _cpp_module = module
+            except ImportError:
+                _cpp_module = None
+                _CppOCREngine = None
+        if _cpp_module is not None:
+            _install_log_bridge(_cpp_module)
+        _load_attempted = True
+    return _cpp_module
+
+
+def _install_log_bridge(module):
+    """Route native log messages into Python logging"""
+    if not hasattr(module, 'set_log_sink'):
+        return
+    module.set_log_sink(native_logger.log)
+    # The sink holds a Python callable that must not outlive the interpreter
+    atexit.register(module.set_log_sink, None)
+    module.set_log_level(native_logger.getEffectiveLevel())
+
+
+def sync_native_log_level() -> None:
+    """
+    Apply the effective level of the native logger to the C++ engine
+    
+    Messages below the level are never formatted on the native side, call this
+    after changing the logging configuration at runtime.
+    """
+    module = _load_cpp_module()
+    if module is not None and hasattr(module, 'set_log_level'):
+        module.set_log_level(native_logger.getEffectiveLevel())
+
+
+def __getattr__(name):
+    # CPP_AVAILABLE is resolved lazily so importing this wrapper stays cheap
+    if name == 'CPP_AVAILABLE':
+        return is_cpp_available()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class CppOCREngine:
     """
     C++ OCR Engine wrapper with fallback to Python implementation
+    
+    Recognition releases the GIL. Calls on one engine are serialized by the
+    native engine, so use one engine per thread to recognize in parallel.
     """
     
     def __init__(self, **kwargs):
@@ -37,15 +115,24 @@ class CppOCREngine:
         
         Args:
             **kwargs: Configuration options
+                normalize_resolution, target_x_height, min_x_height,
+                max_x_height: Resolution normalization, see src.ocr.resolution
+                pipeline: Preprocessing pipeline spec, see set_pipeline
+                adaptive_preprocessing: See set_adaptive_preprocessing (default True)
         """
-        if not CPP_AVAILABLE:
+        if not is_cpp_available():
             raise ImportError(
                 "C++ OCR engine not available. "
                 "Please install required dependencies: OpenCV, Tesseract, pybind11"
             )
         
+        # Pick up logging configured after the module was loaded
+        sync_native_log_level()
         self._engine = _CppOCREngine()
         self.language = kwargs.get('language', 'eng')
+        self.set_resolution_normalization(**{k: kwargs[k] for k in RESOLUTION_OPTIONS if k in kwargs})
+        self.set_pipeline(kwargs.get('pipeline'))
+        self.set_adaptive_preprocessing(kwargs.get('adaptive_preprocessing', True))
     
     def initialize(self, language: str = 'eng') -> bool:
         """
@@ -103,6 +190,7 @@ class CppOCREngine:
         Args:
             image_path: Path to the image file
             **kwargs: Additional options
+                level: Result granularity ('word', 'line', 'paragraph' or 'block')
             
         Returns:
             Dictionary with text and confidence information
@@ -110,15 +198,68 @@ class CppOCREngine:
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"Image file not found: {image_path}")
         
-        result = self._engine.extract_text_with_confidence(image_path)
+        level = kwargs.get('level', 'word')
+        return self._result_to_dict(self._engine.extract_text_with_confidence(image_path, level))
+    
+    def extract_text_from_array(self, image: Any, **kwargs) -> str:
+        """
+        Extract text from an in-memory image without writing it to disk
         
-        return {
-            'text': result.text,
-            'confidence': result.confidence,
-            'text_parts': result.text_parts,
-            'confidences': result.confidences,
-            'bounding_boxes': result.bounding_boxes
-        }
+        Args:
+            image: RGB/RGBA or grayscale uint8 array (or PIL image / QImage)
+            **kwargs: Additional options
+            
+        Returns:
+            Extracted text
+        """
+        return self._engine.extract_text_from_array(self._as_buffer(image), rgb=True)
+    
+    def extract_text_with_confidence_from_array(self, image: Any, **kwargs) -> Dict[str, Any]:
+        """
+        Extract text with confidence scores from an in-memory image
+        
+        Args:
+            image: RGB/RGBA or grayscale uint8 array (or PIL image / QImage)
+            **kwargs: Additional options
+            
+        Returns:
+            Dictionary with text and confidence information
+        """
+        start = time.perf_counter()
+        buffer = self._as_buffer(image)
+        convert_seconds = time.perf_counter() - start
+        result = self._result_to_dict(self._engine.extract_text_with_confidence_from_array(
+            buffer, rgb=True, level=kwargs.get('level', 'word')))
+        result['timings'] = {'convert': convert_seconds, **result['timings']}
+        return result
+    
+    def extract_text_from_bytes(self, data: bytes, **kwargs) -> str:
+        """
+        Extract text from an encoded image (PNG, JPEG, ...) held in memory
+        
+        Args:
+            data: Encoded image bytes, decoded natively
+            **kwargs: Additional options
+            
+        Returns:
+            Extracted text
+        """
+        return self._engine.extract_text_from_bytes(bytes(data))
+    
+    def extract_text_with_confidence_from_bytes(self, data: bytes, **kwargs) -> Dict[str, Any]:
+        """
+        Extract text with confidence scores from an encoded image held in memory
+        
+        Args:
+            data: Encoded image bytes, decoded natively
+            **kwargs: Additional options
+            
+        Returns:
+            Dictionary with text and confidence information
+        """
+        result = self._engine.extract_text_with_confidence_from_bytes(
+            bytes(data), level=kwargs.get('level', 'word'))
+        return self._result_to_dict(result)
     
     def preprocess_image(self, image_path: str, **kwargs) -> str:
         """
@@ -163,6 +304,110 @@ class CppOCREngine:
         else:
             raise RuntimeError(f"Failed to set language: {language}")
     
+    def set_max_cached_languages(self, max_languages: int):
+        """
+        Set how many initialized languages are kept warm
+        
+        Switching back to a cached language does not reload its traineddata.
+        Combined languages such as 'eng+vie' count as one entry.
+        
+        Args:
+            max_languages: Maximum number of cached languages (at least 1)
+        """
+        self._engine.set_max_cached_languages(max(1, int(max_languages)))
+    
+    def cancel(self):
+        """
+        Abort the recognition running on this engine
+        
+        Safe to call from any thread. The request stays set until
+        reset_cancel(), so it also aborts a call that is about to start.
+        """
+        self._engine.cancel()
+    
+    def reset_cancel(self):
+        """Clear a pending cancel request before starting a new call"""
+        self._engine.reset_cancel()
+    
+    def set_timeout(self, seconds: Optional[float]):
+        """
+        Set the native recognition deadline for subsequent calls
+        
+        Args:
+            seconds: Deadline in seconds, None or 0 disables it
+        """
+        self._engine.set_timeout_ms(int(seconds * 1000) if seconds else 0)
+    
+    def set_resolution_normalization(self, **kwargs):
+        """
+        Configure the rescaling applied before recognition
+        
+        Args:
+            **kwargs: normalize_resolution (bool), target_x_height, min_x_height
+                and max_x_height in pixels; missing values use the defaults
+        """
+        options = resolution_options(kwargs)
+        self._engine.set_resolution_normalization(
+            bool(options['normalize_resolution']), options['target_x_height'],
+            options['min_x_height'], options['max_x_height'])
+    
+    def set_pipeline(self, spec: Optional[PipelineSpec]):
+        """
+        Replace the built-in preprocessing with a declarative pipeline
+        
+        Args:
+            spec: Preset name, JSON list or list of stage dicts (see
+                src.ocr.pipeline); None restores the built-in pipelines
+            
+        Raises:
+            ValueError: Invalid spec
+        """
+        if spec is None:
+            self._engine.reset_pipeline()
+        else:
+            self._engine.set_pipeline(parse_pipeline(spec))
+    
+    def set_adaptive_preprocessing(self, enabled: bool = True):
+        """
+        Classify each image and run only the preprocessing it needs
+        
+        Crisp screenshots skip enhancement, clean low-contrast images are only
+        binarized (see src.ocr.quality). Ignored while a custom pipeline is set.
+        
+        Args:
+            enabled: Whether to classify images
+        """
+        self._engine.set_adaptive_preprocessing(bool(enabled))
+    
+    def get_pipeline_steps(self) -> list:
+        """
+        Get the compiled steps of the custom pipeline
+        
+        Returns:
+            Step names, fused stages joined by '+' (e.g. 'contrast+invert')
+        """
+        return self._engine.get_pipeline_steps()
+    
+    def get_scratch_bytes(self) -> int:
+        """
+        Get the size of the engine's preprocessing buffers
+        
+        They grow to fit the largest image seen and are reused afterwards.
+        
+        Returns:
+            Bytes held by the scratch buffers
+        """
+        return self._engine.get_scratch_bytes()
+    
+    def get_cached_languages(self) -> list:
+        """
+        Get initialized languages
+        
+        Returns:
+            Language codes, most recently used first
+        """
+        return self._engine.get_cached_languages()
+    
     def get_info(self) -> Dict[str, Any]:
         """
         Get engine information
@@ -172,13 +417,42 @@ class CppOCREngine:
         """
         return {
             'engine': 'C++',
-            'cpp_available': CPP_AVAILABLE,
+            'cpp_available': is_cpp_available(),
             'language': self.language,
             'info': self._engine.get_info()
         }
     
+    @staticmethod
+    def _as_buffer(image: Any):
+        """Contiguous uint8 array the native side can wrap without copying"""
+        import numpy as np
+        from .image_io import to_array
+        return np.ascontiguousarray(to_array(image))
+    
+    @staticmethod
+    def _result_to_dict(result) -> Dict[str, Any]:
+        """
+        Convert a native OCRResult to the dictionary returned by all backends
+        
+        'confidences' (N,) and 'bounding_boxes' (N, 4 as x, y, width, height)
+        are NumPy views over the native result, aligned with 'text_parts';
+        'timings' holds the native per-stage durations in seconds, 'scale'
+        the factor the image was resized by before recognition and 'quality'
+        the preprocessing picked for it (None when not classified)
+        """
+        return {
+            'text': result.text,
+            'confidence': result.confidence,
+            'text_parts': result.text_parts,
+            'confidences': result.confidences,
+            'bounding_boxes': result.bounding_boxes,
+            'scale': result.scale,
+            'quality': result.quality or None,
+            'timings': result.timings
+        }
+    
     def __repr__(self):
-        return f"CppOCREngine(language='{self.language}', cpp_available={CPP_AVAILABLE})"
+        return f"CppOCREngine(language='{self.language}', cpp_available={is_cpp_available()})"
 
 
 def is_cpp_available() -> bool:
@@ -188,7 +462,7 @@ def is_cpp_available() -> bool:
     Returns:
         True if C++ implementation is available
     """
-    return CPP_AVAILABLE
+    return _load_cpp_module() is not None
 
 
 def get_cpp_dependencies() -> Dict[str, str]:
@@ -198,12 +472,8 @@ def get_cpp_dependencies() -> Dict[str, str]:
     Returns:
         Dictionary with dependency information
     """
-    if CPP_AVAILABLE:
-        try:
-            from .cpp.cpp_ocr import get_dependencies
-            return get_dependencies()
-        except ImportError:
-            pass
+    if is_cpp_available() and hasattr(_cpp_module, 'get_dependencies'):
+        return _cpp_module.get_dependencies()
     
     return {
         'opencv': '4.x',
@@ -219,11 +489,7 @@ def get_cpp_version() -> str:
     Returns:
         Version string
     """
-    if CPP_AVAILABLE:
-        try:
-            from .cpp.cpp_ocr import get_version
-            return get_version()
-        except ImportError:
-            pass
+    if is_cpp_available() and hasattr(_cpp_module, 'get_version'):
+        return _cpp_module.get_version()
     
     return "Not available" 
\ No newline at end of file
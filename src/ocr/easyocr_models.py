@@ -0,0 +1,234 @@
+"""
+EasyOCR reader construction, model store and CPU tuning
+Readers are cached per process: creating the same reader again is free, and a
+reader for another language reuses the CRAFT detector already in memory, so only
+the recognizer weights are loaded. With a local model directory (the
+easyocr_model_dir option or TEXTCAPTURE_EASYOCR_MODELS) weights are only read
+from there, never downloaded, and memory-mapped where torch supports it so
+they are not read into a temporary buffer first. EasyOCR copies them into its
+models, so the mapping does not reduce resident memory or share pages between
+processes.
+
+The 'cpu_fast' mode builds a CPU-only reader whose recognizer (a BiLSTM with a
+linear head) runs with dynamic int8 weights, pins torch's intra-op threads to
+the process's core budget and runs inference under torch.inference_mode.
+The CRAFT detector is convolutional only, so dynamic quantization (Linear and
+LSTM layers) leaves it in fp32.
+"""
+
+import contextlib
+import inspect
+import logging
+import os
+import sys
+import threading
+import types
+from collections import OrderedDict
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EASYOCR_MODE_DEFAULT = 'default'
+EASYOCR_MODE_CPU_FAST = 'cpu_fast'
+EASYOCR_MODES = (EASYOCR_MODE_DEFAULT, EASYOCR_MODE_CPU_FAST)
+
+# Local model directory, loaded offline (easyocr_model_dir takes precedence)
+MODEL_DIR_ENV = 'TEXTCAPTURE_EASYOCR_MODELS'
+
+# Readers kept per process (languages, mode, model directory)
+MAX_CACHED_READERS = 4
+
+# Reader attributes that make up the text detector (model and its decoder)
+_DETECTOR_ATTRIBUTES = ('detector', 'get_textbox', 'get_detector', 'detect_network')
+
+# EasyOCR modules whose torch.load calls load checkpoints
+_TORCH_LOAD_MODULES = ('easyocr.detection', 'easyocr.recognition')
+
+_readers: 'OrderedDict[Tuple[Any, ...], Any]' = OrderedDict()
+_detectors: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+_cache_lock = threading.Lock()
+
+
+def model_dir(configured: Optional[str] = None) -> Optional[str]:
+    """Local model directory from the option or MODEL_DIR_ENV, None when not set"""
+    directory = configured or os.environ.get(MODEL_DIR_ENV)
+    return os.path.abspath(os.path.expanduser(directory)) if directory else None
+
+
+def create_reader(languages: List[str], mode: str = EASYOCR_MODE_DEFAULT,
+                  threads: Optional[int] = None, model_directory: Optional[str] = None) -> Any:
+    """
+    Get an easyocr.Reader from the process cache, creating it if needed
+
+    Args:
+        languages: EasyOCR language codes
+        mode: EASYOCR_MODE_DEFAULT or EASYOCR_MODE_CPU_FAST
+        threads: torch intra-op threads; cpu_fast defaults to the core budget
+        model_directory: Local model directory, see model_dir
+
+    Returns:
+        easyocr.Reader, shared by every caller asking for the same configuration
+
+    Raises:
+        ValueError: Unknown mode
+        FileNotFoundError: Weights missing from the local model directory
+    """
+    if mode not in EASYOCR_MODES:
+        raise ValueError(f"Unknown EasyOCR mode '{mode}', expected one of {EASYOCR_MODES}")
+    from .batch import default_workers
+
+    if mode == EASYOCR_MODE_CPU_FAST:
+        threads = threads or default_workers()
+    if threads:
+        set_threads(threads)
+
+    directory = model_dir(model_directory)
+    key = (tuple(languages), mode, directory)
+    with _cache_lock:
+        reader = _readers.get(key)
+        if reader is None:
+            reader = _build_reader(languages, mode, directory)
+            _readers[key] = reader
+            while len(_readers) > MAX_CACHED_READERS:
+                _readers.popitem(last=False)
+        _readers.move_to_end(key)
+    return reader
+
+
+def download_models(languages: List[str], model_directory: str):
+    """
+    Fill a local model directory with the detector and recognizers for languages
+
+    Run once on a machine with network access; the directory can then be
+    copied to offline machines.
+    """
+    import easyocr
+
+    os.makedirs(model_directory, exist_ok=True)
+    easyocr.Reader(languages, gpu=False, model_storage_directory=model_directory,
+                   download_enabled=True)
+
+
+def clear_cache():
+    """Drop the cached readers and detectors"""
+    with _cache_lock:
+        _readers.clear()
+        _detectors.clear()
+
+
+def _build_reader(languages: List[str], mode: str, directory: Optional[str]) -> Any:
+    """Create a reader, reusing a loaded detector of the same mode and directory"""
+    import easyocr
+
+    options: Dict[str, Any] = {}
+    if mode == EASYOCR_MODE_CPU_FAST:
+        options['gpu'] = False
+    if directory:
+        options.update(model_storage_directory=directory, download_enabled=False)
+
+    detector_key = (mode, directory)
+    detector = _detectors.get(detector_key)
+    with _mmap_torch_load():
+        reader = easyocr.Reader(languages, detector=detector is None, **options)
+
+    if detector is None:
+        _detectors[detector_key] = {name: getattr(reader, name)
+                                    for name in _DETECTOR_ATTRIBUTES if hasattr(reader, name)}
+    else:
+        for name, value in detector.items():
+            setattr(reader, name, value)
+        logger.debug("EasyOCR reader for %s reuses the loaded detector", languages)
+
+    if mode == EASYOCR_MODE_CPU_FAST:
+        reader.recognizer = quantize_recognizer(reader.recognizer)
+    return reader
+
+
+@contextlib.contextmanager
+def _mmap_torch_load() -> Iterator[None]:
+    """
+    Make EasyOCR's torch.load calls memory-map checkpoint files
+
+    Only the torch reference of the EasyOCR modules in _TORCH_LOAD_MODULES is
+    swapped for a proxy, so other torch.load callers are not affected. The
+    mapped file replaces the temporary buffer torch.load would read it into;
+    load_state_dict still copies the weights into the model, so resident
+    memory is the same once the reader is built. Needs torch 2.1+ and a
+    zip-format checkpoint; older files are loaded normally.
+    """
+    import torch
+
+    original = torch.load
+    modules = [sys.modules[name] for name in _TORCH_LOAD_MODULES
+               if getattr(sys.modules.get(name), 'torch', None) is torch]
+    if not modules or 'mmap' not in inspect.signature(original).parameters:
+        yield
+        return
+
+    def load(f, *args, **kwargs):
+        if isinstance(f, (str, os.PathLike)) and 'mmap' not in kwargs:
+            try:
+                return original(f, *args, mmap=True, **kwargs)
+            except RuntimeError:
+                # Legacy (non-zip) checkpoint
+                pass
+        return original(f, *args, **kwargs)
+
+    class _TorchProxy(types.ModuleType):
+        """torch with load replaced, every other attribute is torch's"""
+
+        def __getattr__(self, name):
+            return getattr(torch, name)
+
+    proxy = _TorchProxy(torch.__name__)
+    proxy.load = load
+    for module in modules:
+        module.torch = proxy
+    try:
+        yield
+    finally:
+        for module in modules:
+            module.torch = torch
+
+
+def set_threads(threads: int):
+    """Set torch's intra-op thread count (process-wide)"""
+    import torch
+
+    if torch.get_num_threads() != threads:
+        torch.set_num_threads(threads)
+        logger.debug("torch intra-op threads set to %d", threads)
+
+
+def quantize_recognizer(model: Any) -> Any:
+    """
+    Quantize the Linear and LSTM layers of a recognizer to dynamic int8
+
+    Recent EasyOCR versions already do this for CPU readers, so a model that
+    contains quantized layers is returned unchanged.
+
+    Args:
+        model: Recognizer torch module
+
+    Returns:
+        Quantized module (or the input when quantization is not possible)
+    """
+    import torch
+
+    if any('quantized' in type(module).__module__ for module in model.modules()):
+        return model
+    try:
+        return torch.quantization.quantize_dynamic(
+            model, {torch.nn.LSTM, torch.nn.Linear}, dtype=torch.qint8)
+    except Exception as e:
+        # Builds without a quantized engine (fbgemm/qnnpack) keep fp32
+        logger.warning("Dynamic quantization of the EasyOCR recognizer failed: %s", e)
+        return model
+
+
+def inference_context(mode: str) -> ContextManager:
+    """Context for EasyOCR calls: torch.inference_mode in cpu_fast, nothing otherwise"""
+    if mode != EASYOCR_MODE_CPU_FAST:
+        return contextlib.nullcontext()
+    import torch
+    return torch.inference_mode()
@@ -0,0 +1,287 @@
+"""
+Process-wide pool of warm OCR engines
+Keeps initialized engines alive between calls so Tesseract/EasyOCR models are loaded once
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, Tuple, Callable
+
+
+# Rough resident size of one warm engine per backend, in megabytes.
+# EasyOCR keeps the CRAFT detector and the recognizer in memory,
+# Tesseract only keeps its traineddata.
+DEFAULT_ENGINE_MEMORY_MB = {
+    'cpp': 60,
+    'python': 400,
+}
+
+
+def _freeze(value: Any) -> Any:
+    """Convert a configuration value into something hashable"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+class EnginePool:
+    """
+    LRU registry of initialized OCR engines keyed by (backend, language, config)
+
+    The backend in the key is the one the engine actually uses: an engine built
+    for a C++ request that fell back to Python is pooled and accounted as Python.
+    """
+
+    def __init__(self, max_engines: int = 4, max_memory_mb: Optional[int] = 1024,
+                 memory_estimates: Optional[Dict[str, int]] = None,
+                 factory: Optional[Callable[..., Any]] = None):
+        """
+        Initialize engine pool
+
+        Args:
+            max_engines: Maximum number of warm engines kept alive
+            max_memory_mb: Approximate memory cap for all warm engines (None disables it)
+            memory_estimates: Per-backend memory estimate in MB, overrides the defaults
+            factory: Callable used to build engines, defaults to OCREngine
+        """
+        self.max_engines = max_engines
+        self.max_memory_mb = max_memory_mb
+        self.memory_estimates = dict(DEFAULT_ENGINE_MEMORY_MB)
+        if memory_estimates:
+            self.memory_estimates.update(memory_estimates)
+        self._factory = factory
+        self._engines: "OrderedDict[Tuple, Any]" = OrderedDict()
+        # Requested key -> key of the backend actually built, when they differ
+        # (C++ requested but not available, so OCREngine fell back to Python)
+        self._aliases: Dict[Tuple, Tuple] = {}
+        # Engines being built, other callers for the same key wait on the future
+        self._building: Dict[Tuple, Future] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, use_cpp: bool, language: Optional[str], **kwargs) -> Tuple:
+        """
+        Build the registry key for an engine configuration
+
+        Args:
+            use_cpp: Whether the C++ backend is requested
+            language: OCR language code
+            **kwargs: Remaining engine configuration
+
+        Returns:
+            Hashable key
+        """
+        backend = 'cpp' if use_cpp else 'python'
+        return (backend, language, _freeze(kwargs))
+
+    def get(self, use_cpp: bool = True, language: Optional[str] = None, **kwargs) -> Any:
+        """
+        Return a warm engine for the configuration, creating it on first use
+
+        Args:
+            use_cpp: Whether to use C++ implementation if available
+            language: OCR language code
+            **kwargs: Additional arguments for the OCR engine
+
+        Returns:
+            OCREngine instance shared with other callers using the same configuration
+
+        Engines are built outside the pool lock, so a slow build (EasyOCR takes
+        seconds) does not block callers for other keys; callers for the same
+        key wait for that build instead of starting a second one.
+        """
+        key = self.make_key(use_cpp, language, **kwargs)
+
+        with self._lock:
+            engine = self._lookup(key)
+            if engine is not None:
+                self.hits += 1
+                return engine
+
+            pending = self._building.get(key)
+            if pending is None:
+                self.misses += 1
+                building = self._building[key] = Future()
+            else:
+                self.hits += 1
+
+        if pending is not None:
+            # Raises the builder's exception if the build failed
+            return pending.result()
+
+        try:
+            engine = self._create(use_cpp, language, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                del self._building[key]
+            building.set_exception(e)
+            raise
+
+        if hasattr(engine, '_pool'):
+            # Lets OCREngine.set_language take a reconfigured engine out of the pool
+            engine._pool = self
+        # Keyed and accounted by the backend that was built, not the one requested
+        built_key = self.make_key(getattr(engine, 'use_cpp', use_cpp), language, **kwargs)
+        with self._lock:
+            del self._building[key]
+            existing = self._lookup(built_key)
+            if existing is not None:
+                # The same backend and configuration was already pooled
+                engine = existing
+            else:
+                self._engines[built_key] = engine
+            if built_key != key:
+                self._aliases[key] = built_key
+            self._evict(keep=built_key)
+        building.set_result(engine)
+        return engine
+
+    def discard(self, use_cpp: bool = True, language: Optional[str] = None, **kwargs) -> bool:
+        """
+        Drop a cached engine, e.g. after it failed
+
+        Returns:
+            True if an engine was removed
+        """
+        key = self.make_key(use_cpp, language, **kwargs)
+        with self._lock:
+            key = self._aliases.pop(key, key)
+            return self._remove(key)
+
+    def forget(self, engine: Any) -> bool:
+        """
+        Drop an engine whose configuration no longer matches its key
+
+        Returns:
+            True if the engine was in the pool
+        """
+        with self._lock:
+            keys = [key for key, cached in self._engines.items() if cached is engine]
+            for key in keys:
+                self._remove(key)
+            return bool(keys)
+
+    def clear(self):
+        """Drop all cached engines"""
+        with self._lock:
+            self._engines.clear()
+            self._aliases.clear()
+
+    def memory_usage_mb(self) -> int:
+        """
+        Get estimated memory held by the warm engines
+
+        Returns:
+            Estimated memory in megabytes
+        """
+        with self._lock:
+            return sum(self._estimate(key) for key in self._engines)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics
+
+        Returns:
+            Dictionary with hit/miss counters and current size
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._engines),
+                'max_engines': self.max_engines,
+                'memory_mb': self.memory_usage_mb(),
+                'max_memory_mb': self.max_memory_mb,
+                'keys': [key[:2] for key in self._engines],
+            }
+
+    def __len__(self):
+        return len(self._engines)
+
+    def _create(self, use_cpp: bool, language: Optional[str], **kwargs) -> Any:
+        """Build a new engine with the configured factory"""
+        factory = self._factory
+        if factory is None:
+            from .ocr_engine import OCREngine
+            factory = OCREngine
+
+        if language is not None:
+            kwargs['language'] = language
+        return factory(use_cpp=use_cpp, **kwargs)
+
+    def _lookup(self, key: Tuple) -> Any:
+        """Pooled engine for a requested key, marked as most recently used (lock held)"""
+        key = self._aliases.get(key, key)
+        engine = self._engines.get(key)
+        if engine is not None:
+            self._engines.move_to_end(key)
+        return engine
+
+    def _remove(self, key: Tuple) -> bool:
+        """Drop the engine stored under a built key and its aliases (lock held)"""
+        for alias in [alias for alias, target in self._aliases.items() if target == key]:
+            del self._aliases[alias]
+        return self._engines.pop(key, None) is not None
+
+    def _estimate(self, key: Tuple) -> int:
+        """Estimated memory of one engine"""
+        return self.memory_estimates.get(key[0], 0)
+
+    def _evict(self, keep: Tuple):
+        """Evict least recently used engines until limits are respected"""
+        while len(self._engines) > 1:
+            over_count = self.max_engines is not None and len(self._engines) > self.max_engines
+            over_memory = (self.max_memory_mb is not None
+                           and self.memory_usage_mb() > self.max_memory_mb)
+            if not (over_count or over_memory):
+                break
+
+            oldest = next(iter(self._engines))
+            if oldest == keep:
+                break
+            self._remove(oldest)
+            self.evictions += 1
+
+
+_default_pool: Optional[EnginePool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_engine_pool() -> EnginePool:
+    """
+    Get the process-wide engine pool
+
+    Returns:
+        Shared EnginePool instance
+    """
+    global _default_pool
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = EnginePool()
+    return _default_pool
+
+
+def get_engine(use_cpp: bool = True, language: Optional[str] = None, **kwargs) -> Any:
+    """
+    Get a warm engine from the process-wide pool
+
+    Args:
+        use_cpp: Whether to use C++ implementation if available
+        language: OCR language code
+        **kwargs: Additional arguments for the OCR engine
+
+    Returns:
+        Shared OCREngine instance
+    """
+    return get_engine_pool().get(use_cpp=use_cpp, language=language, **kwargs)
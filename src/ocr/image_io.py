@@ -0,0 +1,192 @@
+"""
+In-memory image helpers shared by the OCR backends
+Converts NumPy arrays, encoded bytes, PIL images and QImages without touching the disk
+"""
+
+import contextlib
+import os
+from typing import Any, Union
+
+import numpy as np
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def is_path(image: Any) -> bool:
+    """
+    Check whether an image argument is a filesystem path
+
+    Args:
+        image: Image argument passed to an OCR call
+
+    Returns:
+        True for str and os.PathLike values
+    """
+    return isinstance(image, (str, os.PathLike))
+
+
+def is_qimage(image: Any) -> bool:
+    """Duck-typed QImage check so PySide6 is never imported here"""
+    return hasattr(image, 'constBits') and hasattr(image, 'bytesPerLine')
+
+
+def decode_bytes(data: BytesLike) -> np.ndarray:
+    """
+    Decode an encoded image (PNG, JPEG, ...) held in memory
+
+    Args:
+        data: Encoded image bytes
+
+    Returns:
+        uint8 array in RGB (H, W, 3) or grayscale (H, W) layout
+    """
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    if CV2_AVAILABLE:
+        image = cv2.imdecode(buffer, cv2.IMREAD_UNCHANGED)
+        if image is None:
+            raise ValueError("Failed to decode image bytes")
+        if image.ndim == 3 and image.shape[2] == 4:
+            return cv2.cvtColor(image, cv2.COLOR_BGRA2RGB)
+        if image.ndim == 3:
+            return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return image
+
+    if PIL_AVAILABLE:
+        import io
+        with Image.open(io.BytesIO(bytes(data))) as image:
+            return pil_to_array(image)
+
+    raise RuntimeError("Decoding image bytes requires OpenCV or Pillow")
+
+
+def pil_to_array(image: Any) -> np.ndarray:
+    """
+    Convert a PIL image to a uint8 array
+
+    Returns:
+        RGB (H, W, 3) or grayscale (H, W) array
+    """
+    if image.mode not in ('L', 'RGB'):
+        image = image.convert('RGB')
+    return np.asarray(image, dtype=np.uint8)
+
+
+def qimage_to_array(image: Any) -> np.ndarray:
+    """
+    Convert a QImage to a uint8 array without encoding it
+
+    Returns:
+        RGB (H, W, 3) or grayscale (H, W) array
+    """
+    # Imported lazily so headless users never load Qt
+    from PySide6.QtGui import QImage
+
+    if image.format() == QImage.Format.Format_Grayscale8:
+        channels = 1
+    else:
+        if image.format() != QImage.Format.Format_RGB888:
+            image = image.convertToFormat(QImage.Format.Format_RGB888)
+        channels = 3
+
+    height, width = image.height(), image.width()
+    buffer = np.frombuffer(image.constBits(), dtype=np.uint8,
+                           count=image.bytesPerLine() * height)
+    rows = buffer.reshape(height, image.bytesPerLine())
+    array = rows[:, :width * channels]
+    if channels == 3:
+        array = array.reshape(height, width, 3)
+    # Copy because the QImage owns the memory
+    return np.array(array, copy=True)
+
+
+def to_array(image: Any) -> np.ndarray:
+    """
+    Convert any supported image input to a uint8 array
+
+    Args:
+        image: Path, NumPy array, encoded bytes, PIL image or QImage
+
+    Returns:
+        uint8 array, RGB (H, W, 3), RGBA (H, W, 4) or grayscale (H, W)
+    """
+    if isinstance(image, np.ndarray):
+        if image.dtype != np.uint8:
+            raise TypeError(f"Expected a uint8 image array, got {image.dtype}")
+        if image.ndim not in (2, 3) or (image.ndim == 3 and image.shape[2] not in (1, 3, 4)):
+            raise ValueError(f"Unsupported image array shape: {image.shape}")
+        return image[:, :, 0] if image.ndim == 3 and image.shape[2] == 1 else image
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return decode_bytes(image)
+    if is_qimage(image):
+        return qimage_to_array(image)
+    if PIL_AVAILABLE and isinstance(image, Image.Image):
+        return pil_to_array(image)
+    if is_path(image):
+        with open(image, 'rb') as f:
+            return decode_bytes(f.read())
+    raise TypeError(f"Unsupported image type: {type(image).__name__}")
+
+
+def to_gray(image: Any) -> np.ndarray:
+    """
+    Convert any supported image input to a single-channel uint8 array
+
+    Paths are decoded straight to grayscale when OpenCV is available, so a
+    large scan is held in memory once at one byte per pixel.
+
+    Args:
+        image: Path, NumPy array, encoded bytes, PIL image or QImage
+
+    Returns:
+        Grayscale (H, W) uint8 array
+    """
+    if is_path(image) and CV2_AVAILABLE:
+        gray = cv2.imread(os.fspath(image), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            raise ValueError(f"Failed to load image: {image}")
+        return gray
+    if PIL_AVAILABLE and (is_path(image) or isinstance(image, Image.Image)):
+        with (Image.open(image) if is_path(image) else contextlib.nullcontext(image)) as pil_image:
+            return np.asarray(pil_image.convert('L'), dtype=np.uint8)
+
+    array = to_array(image)
+    if array.ndim == 2:
+        return array
+    if CV2_AVAILABLE:
+        code = cv2.COLOR_RGBA2GRAY if array.shape[2] == 4 else cv2.COLOR_RGB2GRAY
+        return cv2.cvtColor(array, code)
+    # ITU-R 601 luma, the same weights as OpenCV and PIL
+    weights = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    return (array[:, :, :3] @ weights).round().astype(np.uint8)
+
+
+def to_pil(image: Any) -> Any:
+    """
+    Convert any supported image input to a PIL image
+
+    Args:
+        image: Path, NumPy array, encoded bytes, PIL image or QImage
+
+    Returns:
+        PIL image (paths are opened lazily by PIL)
+    """
+    if not PIL_AVAILABLE:
+        raise RuntimeError("Pillow is not available")
+    if isinstance(image, Image.Image):
+        return image
+    if is_path(image):
+        return Image.open(image)
+    return Image.fromarray(to_array(image))
@@ -0,0 +1,215 @@
+"""
+Per-stage OCR timing metrics
+Aggregates stage durations into fixed-bucket histograms that can be exported
+as Prometheus text or JSON with estimated percentiles
+"""
+
+import bisect
+import json
+import threading
+import time
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+
+METRIC_NAME = 'textcapture_ocr_stage_seconds'
+
+# Upper bounds in seconds, from fast preprocessing stages up to slow EasyOCR runs
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class StageTimer:
+    """
+    Measures consecutive pipeline stages
+
+    Each lap() records the time since the previous lap (or creation) under the
+    stage name; repeated stage names are summed.
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> float:
+        """
+        Close the current stage
+
+        Returns:
+            Seconds spent in the stage
+        """
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+        self._last = now
+        return elapsed
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with constant memory
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One extra slot for observations above the last bound (+Inf)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """Record one observation"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by linear interpolation inside its bucket,
+        the same way Prometheus' histogram_quantile() does
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated value in seconds, None without observations
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                if index == len(self.buckets):
+                    # Above the largest bound: the best estimate is that bound
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+    def cumulative_counts(self) -> List[Tuple[str, int]]:
+        """Bucket bounds (as Prometheus 'le' labels) with cumulative counts"""
+        result = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            cumulative += bucket_count
+            result.append((_format_float(bound), cumulative))
+        result.append(('+Inf', self.count))
+        return result
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of stage histograms keyed by (backend, stage)
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialize metrics registry
+
+        Args:
+            buckets: Histogram upper bounds in seconds
+        """
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, backend: str, stage: str, seconds: float):
+        """Record the duration of one stage"""
+        with self._lock:
+            self._histogram(backend, stage).observe(seconds)
+
+    def observe_timings(self, backend: str, timings: Dict[str, float]):
+        """Record all stages of one OCR call"""
+        with self._lock:
+            for stage, seconds in timings.items():
+                self._histogram(backend, stage).observe(seconds)
+
+    def reset(self):
+        """Drop all recorded observations"""
+        with self._lock:
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Summarize all histograms
+
+        Returns:
+            Dictionary with one series per (backend, stage): count, sum, mean,
+            estimated p50/p90/p99 in seconds and cumulative buckets
+        """
+        with self._lock:
+            series = []
+            for (backend, stage), histogram in sorted(self._histograms.items()):
+                series.append({
+                    'backend': backend,
+                    'stage': stage,
+                    'count': histogram.count,
+                    'sum': histogram.sum,
+                    'mean': histogram.sum / histogram.count if histogram.count else None,
+                    'p50': histogram.quantile(0.5),
+                    'p90': histogram.quantile(0.9),
+                    'p99': histogram.quantile(0.99),
+                    'buckets': dict(histogram.cumulative_counts()),
+                })
+        return {'metric': METRIC_NAME, 'unit': 'seconds', 'series': series}
+
+    def to_json(self, **kwargs) -> str:
+        """Export the snapshot as JSON"""
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self) -> str:
+        """
+        Export in the Prometheus text exposition format
+
+        Returns:
+            Text with one histogram family labelled by backend and stage
+        """
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in each OCR pipeline stage",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        with self._lock:
+            for (backend, stage), histogram in sorted(self._histograms.items()):
+                labels = f'backend="{_escape(backend)}",stage="{_escape(stage)}"'
+                for bound, cumulative in histogram.cumulative_counts():
+                    lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{METRIC_NAME}_sum{{{labels}}} {_format_float(histogram.sum)}')
+                lines.append(f'{METRIC_NAME}_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def _histogram(self, backend: str, stage: str) -> Histogram:
+        """Get or create a histogram, lock must be held"""
+        key = (backend, stage)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(self.buckets)
+        return histogram
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+_default_registry: Optional[MetricsRegistry] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    Get the process-wide metrics registry
+
+    Returns:
+        Shared MetricsRegistry instance
+    """
+    global _default_registry
+    if _default_registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                _default_registry = MetricsRegistry()
+    return _default_registry
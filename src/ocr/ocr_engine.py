@@ -3,20 +3,26 @@ OCR Engine - Main interface for text extraction
 Supports both Python and C++ implementations
 """
 
+import logging
 import os
 import sys
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, Iterable, List, Sequence
 from pathlib import Path
 
-try:
-    # Try to import C++ implementation using the wrapper
-    from .cpp_ocr import CppOCREngine
-    CPP_AVAILABLE = True
-except ImportError:
-    CPP_AVAILABLE = False
-    CppOCREngine = None
+# Backends are imported on first use: the C++ module loads OpenCV/Tesseract
+# and the Python one may load EasyOCR (torch)
+from .cpp_ocr import is_cpp_available
+from .batch import run_batch, default_workers
+from .result_cache import get_result_cache, make_cache_key
+from .metrics import get_metrics_registry
+from .tiling import extract_tiled, DEFAULT_BAND_HEIGHT, DEFAULT_OVERLAP
 
-from .python_ocr import PythonOCREngine
+
+# Engine options that configure the cache itself and never change a result
+_CACHE_OPTIONS = ('use_cache', 'cache_dir')
+
+logger = logging.getLogger(__name__)
 
 
 class OCREngine:
@@ -31,9 +37,20 @@ class OCREngine:
         Args:
             use_cpp: Whether to use C++ implementation if available
             **kwargs: Additional arguments for the OCR engine
+                use_cache: Reuse results for identical images, languages and options
+                cache_dir: Directory of the persistent cache tier (implies use_cache)
+        
+        Confidence extractions record per-stage durations in the process-wide
+        metrics registry (src.ocr.get_metrics_registry).
         """
-        self.use_cpp = use_cpp and CPP_AVAILABLE
+        self.use_cpp = use_cpp and is_cpp_available()
         self.kwargs = kwargs
+        # EnginePool that hands this engine out, set by the pool
+        self._pool = None
+        
+        self._cache = None
+        if kwargs.get('use_cache') or kwargs.get('cache_dir'):
+            self._cache = get_result_cache(kwargs.get('cache_dir'))
         
         if self.use_cpp:
             # Set TESSDATA_PREFIX environment variable
@@ -44,16 +61,18 @@ class OCREngine:
             if os.path.exists(tessdata_path):
                 os.environ['TESSDATA_PREFIX'] = tessdata_path
             
-            self._engine = CppOCREngine()
+            from .cpp_ocr import CppOCREngine
+            self._engine = CppOCREngine(**kwargs)
             # Initialize with language if provided
             if 'language' in kwargs:
                 self._engine.initialize(kwargs['language'])
             else:
                 self._engine.initialize('eng')
-            print("Using C++ OCR implementation")
+            logger.info("Using C++ OCR implementation")
         else:
+            from .python_ocr import PythonOCREngine
             self._engine = PythonOCREngine(**kwargs)
-            print("Using Python OCR implementation")
+            logger.info("Using Python OCR implementation")
     
     def extract_text(self, image_path: str, **kwargs) -> str:
         """
@@ -69,7 +88,8 @@ class OCREngine:
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"Image file not found: {image_path}")
         
-        return self._engine.extract_text(image_path, **kwargs)
+        return self._cached('text', image_path, kwargs,
+                            lambda: self._engine.extract_text(image_path, **kwargs))
     
     def extract_text_with_confidence(self, image_path: str, **kwargs) -> Dict[str, Any]:
         """
@@ -80,23 +100,201 @@ class OCREngine:
             **kwargs: Additional arguments for text extraction
             
         Returns:
-            Dictionary with 'text' and 'confidence' keys
+            Dictionary with 'text' and 'confidence' keys, plus per-stage
+            'timings' in seconds when timings=True is passed
         """
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"Image file not found: {image_path}")
         
-        return self._engine.extract_text_with_confidence(image_path, **kwargs)
+        return self._timed(image_path, kwargs,
+                           lambda: self._engine.extract_text_with_confidence(image_path, **kwargs))
+    
+    def extract_text_from_array(self, image: Any, **kwargs) -> str:
+        """
+        Extract text from an in-memory image, no file path required
+        
+        Args:
+            image: uint8 NumPy array in RGB/RGBA or grayscale layout,
+                PIL image or QImage
+            **kwargs: Additional arguments for text extraction
+            
+        Returns:
+            Extracted text as string
+        """
+        return self._cached('text', image, kwargs,
+                            lambda: self._engine.extract_text_from_array(image, **kwargs))
+    
+    def extract_text_with_confidence_from_array(self, image: Any, **kwargs) -> Dict[str, Any]:
+        """
+        Extract text with confidence scores from an in-memory image
+        
+        Args:
+            image: uint8 NumPy array in RGB/RGBA or grayscale layout,
+                PIL image or QImage
+            **kwargs: Additional arguments for text extraction
+            
+        Returns:
+            Dictionary with 'text' and 'confidence' keys, plus per-stage
+            'timings' in seconds when timings=True is passed
+        """
+        return self._timed(image, kwargs,
+                           lambda: self._engine.extract_text_with_confidence_from_array(image, **kwargs))
+    
+    def extract_text_from_bytes(self, data: bytes, **kwargs) -> str:
+        """
+        Extract text from an encoded image (PNG, JPEG, ...) held in memory
+        
+        Args:
+            data: Encoded image bytes, e.g. clipboard or screenshot data
+            **kwargs: Additional arguments for text extraction
+            
+        Returns:
+            Extracted text as string
+        """
+        return self._cached('text', data, kwargs,
+                            lambda: self._engine.extract_text_from_bytes(data, **kwargs))
+    
+    def extract_text_with_confidence_from_bytes(self, data: bytes, **kwargs) -> Dict[str, Any]:
+        """
+        Extract text with confidence scores from an encoded image held in memory
+        
+        Args:
+            data: Encoded image bytes
+            **kwargs: Additional arguments for text extraction
+            
+        Returns:
+            Dictionary with 'text' and 'confidence' keys, plus per-stage
+            'timings' in seconds when timings=True is passed
+        """
+        return self._timed(data, kwargs,
+                           lambda: self._engine.extract_text_with_confidence_from_bytes(data, **kwargs))
+    
+    def extract_text_batch(self, image_paths: Iterable[str], workers: Optional[int] = None,
+                           ordered: bool = True, batch_size: Optional[int] = None,
+                           **kwargs) -> Dict[str, Any]:
+        """
+        Extract text from many images using a pool of worker processes
+
+        Args:
+            image_paths: Paths to the image files
+            workers: Number of worker processes (None uses all CPUs, 0 or 1 runs in-process)
+            ordered: Return results in input order, otherwise in completion order
+            batch_size: Images per batched inference call (None: batched for
+                EasyOCR, one by one otherwise)
+            **kwargs: Additional arguments for text extraction
+
+        Returns:
+            Dictionary with 'results' (one item per image with 'path', 'result',
+            'error' and 'seconds') and 'stats' (throughput information)
+        """
+        return run_batch(image_paths, mode='text', workers=workers, ordered=ordered,
+                         use_cpp=self.use_cpp, engine_kwargs=self.kwargs,
+                         extract_kwargs=kwargs, engine=self,
+                         batch_size=batch_size or self._default_batch_size(kwargs))
+
+    def extract_text_with_confidence_batch(self, image_paths: Iterable[str],
+                                           workers: Optional[int] = None,
+                                           ordered: bool = True, batch_size: Optional[int] = None,
+                                           **kwargs) -> Dict[str, Any]:
+        """
+        Extract text with confidence scores from many images using a pool of worker processes
+
+        Args:
+            image_paths: Paths to the image files
+            workers: Number of worker processes (None uses all CPUs, 0 or 1 runs in-process)
+            ordered: Return results in input order, otherwise in completion order
+            batch_size: Images per batched inference call, see extract_text_batch
+            **kwargs: Additional arguments for text extraction
+
+        Returns:
+            Dictionary with 'results' and 'stats', see extract_text_batch
+        """
+        return run_batch(image_paths, mode='confidence', workers=workers, ordered=ordered,
+                         use_cpp=self.use_cpp, engine_kwargs=self.kwargs,
+                         extract_kwargs=kwargs, engine=self,
+                         batch_size=batch_size or self._default_batch_size(kwargs))
+
+    def extract_batch(self, images: Sequence[Any], confidence: bool = False, **kwargs) -> List[Any]:
+        """
+        Run OCR on several images with as few inference calls as possible
+
+        The Python backend batches EasyOCR inference across images; other
+        backends and methods process the images one by one (with caching and
+        metrics as for single calls).
+
+        Args:
+            images: Paths or in-memory images (NumPy arrays, encoded bytes,
+                PIL images or QImages)
+            confidence: Return confidence dictionaries instead of text
+            **kwargs: Additional arguments for extraction
+
+        Returns:
+            One result per image, in order, or the exception raised for it
+        """
+        if self._default_batch_size(kwargs) > 1:
+            return self._extract_batched(images, confidence, dict(kwargs))
+
+        results: List[Any] = []
+        for image in images:
+            try:
+                results.append(self._extract_one(image, confidence, dict(kwargs)))
+            except Exception as e:
+                results.append(e)
+        return results
     
-    def preprocess_image(self, image_path: str, **kwargs) -> str:
+    def _extract_one(self, image: Any, confidence: bool, kwargs: Dict[str, Any]) -> Any:
+        """Single extraction through the entry point matching the image type"""
+        if isinstance(image, (str, os.PathLike)):
+            image = os.fspath(image)
+            if confidence:
+                return self.extract_text_with_confidence(image, **kwargs)
+            return self.extract_text(image, **kwargs)
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            if confidence:
+                return self.extract_text_with_confidence_from_bytes(image, **kwargs)
+            return self.extract_text_from_bytes(image, **kwargs)
+        if confidence:
+            return self.extract_text_with_confidence_from_array(image, **kwargs)
+        return self.extract_text_from_array(image, **kwargs)
+
+    def extract_text_tiled(self, image: Any, band_height: int = DEFAULT_BAND_HEIGHT,
+                           overlap: int = DEFAULT_OVERLAP, workers: Optional[int] = None,
+                           **kwargs) -> Dict[str, Any]:
+        """
+        Extract text from a very large image in overlapping horizontal bands
+
+        Bands are recognized in parallel (one engine per worker thread) and text
+        in the overlaps is de-duplicated by position.
+
+        Args:
+            image: Path, NumPy array, encoded bytes, PIL image or QImage
+            band_height: Band height in pixels, overlap included
+            overlap: Rows shared by consecutive bands, should span at least two text lines
+            workers: Bands recognized in parallel (None uses all CPUs)
+            **kwargs: Additional arguments for text extraction
+
+        Returns:
+            Dictionary with 'text', 'confidence', 'text_parts', 'confidences',
+            'bounding_boxes' (page coordinates) and 'tiles'
+        """
+        return extract_tiled(image, engine=self,
+                             engine_factory=lambda: OCREngine(use_cpp=self.use_cpp, **self.kwargs),
+                             band_height=band_height, overlap=overlap,
+                             workers=default_workers() if workers is None else workers,
+                             **kwargs)
+
+    def preprocess_image(self, image_path: str, **kwargs) -> Any:
         """
         Preprocess image for better OCR results
         
         Args:
             image_path: Path to the image file
-            **kwargs: Preprocessing options
+            **kwargs: Preprocessing options (pass output_path or save=True
+                to get a file from the Python implementation)
             
         Returns:
-            Path to preprocessed image
+            In-memory PIL image (Python implementation) or
+            path to the preprocessed image (C++ implementation / file requested)
         """
         return self._engine.preprocess_image(image_path, **kwargs)
     
@@ -113,10 +311,51 @@ class OCREngine:
         """
         Set OCR language
         
+        An engine obtained from the engine pool is removed from it, so other
+        callers asking for the old language get a fresh engine.
+        
         Args:
             language: Language code (e.g., 'eng', 'vie')
         """
         self._engine.set_language(language)
+        # Batch workers are built from kwargs and must use the current language
+        self.kwargs['language'] = language
+        if self._pool is not None:
+            # The pool key names the old language: stop handing this engine out
+            self._pool.forget(self)
+            self._pool = None
+    
+    @property
+    def supports_cancel(self) -> bool:
+        """Whether cancel() and set_timeout() can abort a running recognition"""
+        return hasattr(self._engine, 'cancel')
+    
+    def cancel(self) -> bool:
+        """
+        Abort the recognition running on this engine (C++ implementation only)
+        
+        Returns:
+            True if a cancel request was sent
+        """
+        if not self.supports_cancel:
+            return False
+        self._engine.cancel()
+        return True
+    
+    def reset_cancel(self):
+        """Clear a pending cancel request before starting a new call"""
+        if self.supports_cancel:
+            self._engine.reset_cancel()
+    
+    def set_timeout(self, seconds: Optional[float]):
+        """
+        Set the recognition deadline for subsequent calls (C++ implementation only)
+        
+        Args:
+            seconds: Deadline in seconds, None disables it
+        """
+        if self.supports_cancel:
+            self._engine.set_timeout(seconds)
     
     def is_cpp_available(self) -> bool:
         """
@@ -125,7 +364,7 @@ class OCREngine:
         Returns:
             True if C++ implementation is available
         """
-        return CPP_AVAILABLE
+        return is_cpp_available()
     
     def get_implementation_info(self) -> Dict[str, Any]:
         """
@@ -135,7 +374,7 @@ class OCREngine:
             Dictionary with implementation details
         """
         info = {
-            'cpp_available': CPP_AVAILABLE,
+            'cpp_available': is_cpp_available(),
             'using_cpp': self.use_cpp,
             'engine_type': type(self._engine).__name__
         }
@@ -143,4 +382,119 @@ class OCREngine:
         if hasattr(self._engine, 'get_info'):
             info.update(self._engine.get_info())
         
-        return info 
\ No newline at end of file
+        info['cache'] = self._cache.get_stats() if self._cache else None
+        
+        return info
+    
+    def _default_batch_size(self, kwargs: Dict[str, Any]) -> int:
+        """Images per inference call worth batching for the method in use"""
+        if not self.use_cpp and kwargs.get('method', self._engine.default_method) == 'easyocr':
+            from .python_ocr import EASYOCR_BATCH_IMAGES
+            return EASYOCR_BATCH_IMAGES
+        return 1
+    
+    def _backend_name(self, kwargs: Dict[str, Any]) -> str:
+        """Backend label used in cache keys and metrics"""
+        if self.use_cpp:
+            return 'cpp'
+        return 'python:' + kwargs.get('method', self._engine.default_method)
+    
+    def _timed(self, image: Any, kwargs: Dict[str, Any], compute) -> Dict[str, Any]:
+        """
+        Run a confidence extraction and record its stage timings
+        
+        The backend result always carries 'timings'; it is only returned to the
+        caller when timings=True. Cache hits report the lookup as 'cache'.
+        """
+        want_timings = kwargs.pop('timings', False)
+        computed = []
+        
+        def timed_compute():
+            start = time.perf_counter()
+            result = compute()
+            stages = dict(result.get('timings') or {})
+            stages['total'] = time.perf_counter() - start
+            result['timings'] = stages
+            get_metrics_registry().observe_timings(self._backend_name(kwargs), stages)
+            computed.append(True)
+            return result
+        
+        start = time.perf_counter()
+        result = self._cached('confidence', image, kwargs, timed_compute)
+        if not want_timings:
+            result.pop('timings', None)
+        elif not computed:
+            result['timings'] = {'cache': time.perf_counter() - start}
+        return result
+    
+    def _extract_batched(self, images: Sequence[Any], confidence: bool,
+                         kwargs: Dict[str, Any]) -> List[Any]:
+        """
+        Batched backend call for the images missing from the result cache
+        
+        Results are cached and their timings recorded as for single calls;
+        the 'recognize' stage of a batched image is its share of the call.
+        """
+        want_timings = kwargs.pop('timings', False)
+        kind = 'confidence' if confidence else 'text'
+        results: List[Any] = [None] * len(images)
+        keys: List[Optional[str]] = [None] * len(images)
+        misses = []
+        for index, image in enumerate(images):
+            if self._cache is not None:
+                start = time.perf_counter()
+                try:
+                    keys[index] = self._cache_key(kind, image, kwargs)
+                except Exception:
+                    # Unreadable input, the backend reports the error
+                    keys[index] = None
+                else:
+                    result = self._cache.get(keys[index])
+                    if result is not None:
+                        if confidence:
+                            result.pop('timings', None)
+                            if want_timings:
+                                result['timings'] = {'cache': time.perf_counter() - start}
+                        results[index] = result
+                        continue
+            misses.append(index)
+        
+        if not misses:
+            return results
+        outputs = self._engine.extract_batch([images[index] for index in misses],
+                                             confidence=confidence, **kwargs)
+        backend = self._backend_name(kwargs)
+        for index, output in zip(misses, outputs):
+            if not isinstance(output, Exception):
+                if confidence:
+                    stages = dict(output.get('timings') or {})
+                    stages['total'] = sum(stages.values())
+                    output['timings'] = stages
+                    get_metrics_registry().observe_timings(backend, stages)
+                if keys[index] is not None:
+                    self._cache.put(keys[index], output)
+                if confidence and not want_timings:
+                    output.pop('timings', None)
+            results[index] = output
+        return results
+    
+    def _cache_key(self, kind: str, image: Any, kwargs: Dict[str, Any]) -> str:
+        """Result cache key of an image for this engine's backend, language and options"""
+        backend = self._backend_name(kwargs)
+        options = {k: v for k, v in self.kwargs.items()
+                   if k not in _CACHE_OPTIONS and k != 'language'}
+        options.update(kwargs)
+        return make_cache_key(self._cache.digest(image), backend,
+                              getattr(self._engine, 'language', None), kind, options)
+    
+    def _cached(self, kind: str, image: Any, kwargs: Dict[str, Any], compute):
+        """Return a cached result for the image or compute and store it"""
+        if self._cache is None:
+            return compute()
+        
+        key = self._cache_key(kind, image, kwargs)
+        result = self._cache.get(key)
+        if result is None:
+            result = compute()
+            self._cache.put(key, result)
+        return result 
\ No newline at end of file
@@ -0,0 +1,237 @@
+"""
+Declarative preprocessing pipelines
+A pipeline is a list of stages such as {'op': 'contrast', 'alpha': 1.5}. The
+Python backend runs it with OpenCV here and the C++ engine compiles the same
+spec natively (OCREngine::set_pipeline), so both produce the same pixels.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .metrics import StageTimer
+from .resolution import normalization_scale, resolution_options
+
+
+# Stage name -> parameters with their defaults. All parameters are numeric so
+# the spec maps directly onto the native side.
+STAGES: Dict[str, Dict[str, float]] = {
+    # Rescale to the target x-height; without parameters the engine's
+    # resolution settings apply (see src.ocr.resolution)
+    'normalize': {},
+    # saturate(round(alpha * x + beta)), as cv::Mat::convertTo
+    'contrast': {'alpha': 1.5, 'beta': 10.0},
+    'invert': {},
+    # Fixed binary threshold: 255 above value, 0 otherwise
+    'threshold': {'value': 127.0},
+    'otsu': {},
+    'adaptive_threshold': {'block_size': 31.0, 'c': 10.0},
+    # 3x3 Laplacian sharpening, amount 1 is the classic 5/-1 kernel
+    'sharpen': {'amount': 1.0},
+    'median': {'ksize': 3.0},
+    'dilate': {'width': 2.0, 'height': 1.0},
+    'erode': {'width': 2.0, 'height': 1.0},
+}
+
+_NORMALIZE_PARAMS = ('target_x_height', 'min_x_height', 'max_x_height')
+
+# Built-in pipelines. The C++ engine defines the same ones (builtin_pipeline in
+# ocr_engine.cpp): 'binarize' and 'binarize-simple' are its extract_text chains
+# (the latter for Japanese) and 'enhance' its extract_text_with_confidence chain.
+PRESETS: Dict[str, List[Dict[str, Any]]] = {
+    'enhance': [
+        {'op': 'normalize'},
+        {'op': 'contrast', 'alpha': 1.5, 'beta': 10},
+        {'op': 'sharpen', 'amount': 1},
+        {'op': 'median', 'ksize': 3},
+    ],
+    'binarize': [
+        {'op': 'normalize'},
+        {'op': 'contrast', 'alpha': 1.5, 'beta': 10},
+        {'op': 'otsu'},
+        {'op': 'dilate', 'width': 2, 'height': 1},
+    ],
+    'binarize-simple': [
+        {'op': 'normalize'},
+        {'op': 'otsu'},
+    ],
+    'fast': [
+        {'op': 'normalize'},
+    ],
+    'none': [],
+}
+
+PipelineSpec = Union[str, Sequence[Dict[str, Any]]]
+# Normalized stage: (op, parameters), the form passed to the C++ engine
+Stage = Tuple[str, Dict[str, float]]
+
+_POINTWISE = ('contrast', 'invert', 'threshold')
+_MORPHOLOGY = ('dilate', 'erode')
+
+
+def parse_pipeline(spec: PipelineSpec) -> List[Stage]:
+    """
+    Validate a pipeline spec and fill in default parameters
+
+    Args:
+        spec: Preset name, JSON list, or list of {'op': name, **params} dicts
+
+    Returns:
+        List of (op, params) tuples
+
+    Raises:
+        ValueError: Unknown preset, stage or parameter, or invalid value
+    """
+    if isinstance(spec, str):
+        text = spec.strip()
+        if not text.startswith('['):
+            if text not in PRESETS:
+                raise ValueError(f"Unknown pipeline preset: {text} (available: {', '.join(PRESETS)})")
+            spec = PRESETS[text]
+        else:
+            spec = json.loads(text)
+
+    stages = []
+    for item in spec:
+        params = dict(item)
+        op = params.pop('op', None)
+        if op not in STAGES:
+            raise ValueError(f"Unknown pipeline stage: {op!r}")
+        allowed = _NORMALIZE_PARAMS if op == 'normalize' else STAGES[op]
+        unknown = set(params) - set(allowed)
+        if unknown:
+            raise ValueError(f"Unknown parameters for '{op}': {', '.join(sorted(unknown))}")
+
+        if op == 'normalize':
+            values = {k: float(v) for k, v in params.items()}
+            if values:
+                # Explicit settings always normalize, missing ones use the defaults
+                values = {k: v for k, v in resolution_options(values).items() if k in _NORMALIZE_PARAMS}
+        else:
+            values = {k: float(params.get(k, default)) for k, default in STAGES[op].items()}
+        _check_stage(op, values)
+        stages.append((op, values))
+    return stages
+
+
+def _check_stage(op: str, params: Dict[str, float]):
+    """Reject parameter values OpenCV would fail on"""
+    if op == 'median' and (params['ksize'] < 1 or params['ksize'] % 2 != 1):
+        raise ValueError("median ksize must be a positive odd number")
+    if op == 'adaptive_threshold' and (params['block_size'] < 3 or params['block_size'] % 2 != 1):
+        raise ValueError("adaptive_threshold block_size must be an odd number >= 3")
+    if op in _MORPHOLOGY and (params['width'] < 1 or params['height'] < 1):
+        raise ValueError(f"{op} width and height must be at least 1")
+
+
+def compile_pipeline(stages: Sequence[Stage]) -> List[Dict[str, Any]]:
+    """
+    Fuse a parsed pipeline into the steps that are actually executed
+
+    Runs of pointwise stages (contrast, invert, threshold) become one 256-entry
+    lookup table, which is exact for 8-bit images. Consecutive rectangular
+    dilations (or erosions) become one with the combined kernel and anchor.
+    OCREngine::compile_pipeline fuses the same way.
+
+    Args:
+        stages: Result of parse_pipeline
+
+    Returns:
+        Steps with 'name' (joined stage names), 'op' and op-specific data
+    """
+    import numpy as np
+
+    steps: List[Dict[str, Any]] = []
+    for op, params in stages:
+        last = steps[-1] if steps else None
+        if op in _POINTWISE:
+            lut = _pointwise_lut(op, params)
+            if last is not None and last['op'] == 'lut':
+                last['lut'] = lut[last['lut']]
+                last['name'] += '+' + op
+            else:
+                steps.append({'op': 'lut', 'name': op, 'lut': lut})
+        elif op in _MORPHOLOGY:
+            width, height = int(params['width']), int(params['height'])
+            anchor = (width // 2, height // 2)
+            if last is not None and last['op'] == op:
+                # Rect (w1, h1) then rect (w2, h2) equals rect (w1 + w2 - 1, h1 + h2 - 1)
+                # with the anchors added
+                last['size'] = (last['size'][0] + width - 1, last['size'][1] + height - 1)
+                last['anchor'] = (last['anchor'][0] + anchor[0], last['anchor'][1] + anchor[1])
+                last['name'] += '+' + op
+            else:
+                steps.append({'op': op, 'name': op, 'size': (width, height), 'anchor': anchor})
+        elif op == 'sharpen':
+            amount = params['amount']
+            kernel = np.array([[0, -amount, 0],
+                               [-amount, 1 + 4 * amount, -amount],
+                               [0, -amount, 0]], dtype=np.float32)
+            steps.append({'op': op, 'name': op, 'kernel': kernel})
+        else:
+            steps.append({'op': op, 'name': op, 'params': params})
+    return steps
+
+
+def _pointwise_lut(op: str, params: Dict[str, float]) -> Any:
+    """Lookup table of one pointwise stage"""
+    import numpy as np
+    values = np.arange(256, dtype=np.float64)
+    if op == 'contrast':
+        # np.rint rounds half to even like cvRound
+        values = np.clip(np.rint(values * params['alpha'] + params['beta']), 0, 255)
+    elif op == 'invert':
+        values = 255 - values
+    elif op == 'threshold':
+        values = np.where(values > params['value'], 255, 0)
+    return values.astype(np.uint8)
+
+
+def run_pipeline(gray: Any, steps: Sequence[Dict[str, Any]],
+                 resolution: Optional[Dict[str, Any]] = None,
+                 timer: Optional[StageTimer] = None) -> Tuple[Any, float]:
+    """
+    Run compiled steps on a grayscale image
+
+    Args:
+        gray: Grayscale uint8 NumPy array, not modified
+        steps: Result of compile_pipeline
+        resolution: Settings from resolution_options() for 'normalize' stages
+            without parameters (defaults when None)
+        timer: Records one lap per step
+
+    Returns:
+        Processed image and the factor it was resized by
+    """
+    import cv2
+
+    scale = 1.0
+    image = gray
+    for step in steps:
+        op = step['op']
+        if op == 'lut':
+            image = cv2.LUT(image, step['lut'])
+        elif op == 'normalize':
+            options = dict(step['params'], normalize_resolution=True) if step['params'] \
+                else (resolution or resolution_options({}))
+            factor = normalization_scale(image, options)
+            if factor != 1.0:
+                size = (round(image.shape[1] * factor), round(image.shape[0] * factor))
+                image = cv2.resize(image, size, interpolation=cv2.INTER_AREA if factor < 1.0 else cv2.INTER_CUBIC)
+                scale *= factor
+        elif op == 'otsu':
+            _, image = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        elif op == 'adaptive_threshold':
+            image = cv2.adaptiveThreshold(image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY,
+                                          int(step['params']['block_size']), step['params']['c'])
+        elif op == 'sharpen':
+            image = cv2.filter2D(image, -1, step['kernel'])
+        elif op == 'median':
+            image = cv2.medianBlur(image, int(step['params']['ksize']))
+        elif op in _MORPHOLOGY:
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, step['size'])
+            morph = cv2.dilate if op == 'dilate' else cv2.erode
+            image = morph(image, kernel, anchor=step['anchor'])
+        if timer is not None:
+            timer.lap(step['name'])
+    return image, scale
+
@@ -2,25 +2,54 @@
 Python OCR Implementation using EasyOCR and Tesseract
 """
 
+import importlib.util
+import logging
 import os
 import sys
 import tempfile
-from typing import Dict, Any, List, Optional
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from pathlib import Path
 
+from . import image_io
+from .easyocr_models import (EASYOCR_MODE_DEFAULT, EASYOCR_MODES, create_reader, inference_context,
+                             model_dir)
+from .metrics import StageTimer
+from .pipeline import compile_pipeline, parse_pipeline, run_pipeline
+from .quality import QUALITY_PIPELINES, classify_quality
+from .tesseract_capi import TesseractAPI, is_libtesseract_available, parse_config
+from .tesseract_tsv import parse_tsv, tsv_raw_data, tsv_result
+from .resolution import RESOLUTION_OPTIONS, resolution_options, normalization_scale
+
+logger = logging.getLogger(__name__)
+
+# EasyOCR pulls in torch, which takes seconds to import: only check that it is
+# installed here and import it when a reader is first created
+EASYOCR_AVAILABLE = importlib.util.find_spec('easyocr') is not None
+
 try:
-    import easyocr
-    EASYOCR_AVAILABLE = True
+    from PIL import Image, ImageEnhance, ImageFilter
+    PIL_AVAILABLE = True
 except ImportError:
-    EASYOCR_AVAILABLE = False
+    PIL_AVAILABLE = False
 
 try:
     import pytesseract
-    from PIL import Image, ImageEnhance, ImageFilter
-    TESSERACT_AVAILABLE = True
+    TESSERACT_AVAILABLE = PIL_AVAILABLE
 except ImportError:
     TESSERACT_AVAILABLE = False
 
+# Warm in-process Tesseract handles kept per engine (one per language)
+MAX_TESSERACT_HANDLES = 3
+
+# EasyOCR recognizer batch (text crops per forward pass), tuned for CPU
+EASYOCR_BATCH_SIZE = 16
+# Images per readtext_batched call, and the size step within which images are
+# padded to a common size and batched together
+EASYOCR_BATCH_IMAGES = 8
+EASYOCR_SIZE_STEP = 64
+
 
 class PythonOCREngine:
     """
@@ -37,19 +66,43 @@ class PythonOCREngine:
         self.language = kwargs.get('language', 'en')
         self.use_easyocr = kwargs.get('use_easyocr', True)
         self.use_tesseract = kwargs.get('use_tesseract', True)
+        # Engine-wide resolution settings, call options override them
+        self.resolution = {k: kwargs[k] for k in RESOLUTION_OPTIONS if k in kwargs}
+        # Declarative preprocessing pipeline (see src.ocr.pipeline), compiled
+        # once; None keeps the PIL preprocessing options below
+        pipeline = kwargs.get('pipeline')
+        self.pipeline = compile_pipeline(parse_pipeline(pipeline)) if pipeline is not None else None
+        # Without a pipeline, pick the preprocessing per image (see src.ocr.quality)
+        self.adaptive_preprocessing = kwargs.get('adaptive_preprocessing', True)
+        self._quality_pipelines = {quality: compile_pipeline(parse_pipeline(preset))
+                                   for quality, preset in QUALITY_PIPELINES.items() if preset}
         
         # Initialize OCR readers
+        self.easyocr_batch_size = kwargs.get('easyocr_batch_size', EASYOCR_BATCH_SIZE)
+        # 'cpu_fast' quantizes the recognizer to int8 and tunes torch for CPU
+        # (see src.ocr.easyocr_models); torch_threads pins intra-op threads
+        self.easyocr_mode = kwargs.get('easyocr_mode', EASYOCR_MODE_DEFAULT)
+        if self.easyocr_mode not in EASYOCR_MODES:
+            raise ValueError(f"Unknown EasyOCR mode '{self.easyocr_mode}', expected one of {EASYOCR_MODES}")
+        self.torch_threads = kwargs.get('torch_threads')
+        # Local EasyOCR weights, loaded offline (see src.ocr.easyocr_models.model_dir)
+        self.easyocr_model_dir = model_dir(kwargs.get('easyocr_model_dir'))
         self.easyocr_reader = None
         if self.use_easyocr and EASYOCR_AVAILABLE:
             try:
-                self.easyocr_reader = easyocr.Reader([self.language])
+                self.easyocr_reader = self._create_reader(self.language)
             except Exception as e:
-                print(f"Failed to initialize EasyOCR: {e}")
+                logger.warning("Failed to initialize EasyOCR: %s", e)
                 self.use_easyocr = False
         
+        # In-process libtesseract ('tesseract_inproc'), handles created on first use
+        self.use_tesseract_inproc = (kwargs.get('use_tesseract', True) and PIL_AVAILABLE
+                                     and is_libtesseract_available())
+        self._tesseract_apis: 'OrderedDict[Tuple[str, int], TesseractAPI]' = OrderedDict()
+        
         # Check Tesseract availability
         if self.use_tesseract and not TESSERACT_AVAILABLE:
-            print("Tesseract not available, disabling Tesseract OCR")
+            logger.warning("Tesseract not available, disabling Tesseract OCR")
             self.use_tesseract = False
         
         # Set default OCR method
@@ -57,15 +110,18 @@ class PythonOCREngine:
             self.default_method = 'easyocr'
         elif self.use_tesseract:
             self.default_method = 'tesseract'
+        elif self.use_tesseract_inproc:
+            self.default_method = 'tesseract_inproc'
         else:
             raise RuntimeError("No OCR engine available")
     
-    def extract_text(self, image_path: str, **kwargs) -> str:
+    def extract_text(self, image_path: Any, **kwargs) -> str:
         """
         Extract text from image
         
         Args:
-            image_path: Path to the image file
+            image_path: Path to the image file, or an in-memory image
+                (NumPy array, encoded bytes, PIL image or QImage)
             **kwargs: Additional options
             
         Returns:
@@ -77,19 +133,23 @@ class PythonOCREngine:
             return self._extract_with_easyocr(image_path, **kwargs)
         elif method == 'tesseract' and self.use_tesseract:
             return self._extract_with_tesseract(image_path, **kwargs)
+        elif method == 'tesseract_inproc' and self.use_tesseract_inproc:
+            return self._extract_with_tesseract(image_path, inproc=True, **kwargs)
         else:
             raise ValueError(f"Unsupported OCR method: {method}")
     
-    def extract_text_with_confidence(self, image_path: str, **kwargs) -> Dict[str, Any]:
+    def extract_text_with_confidence(self, image_path: Any, **kwargs) -> Dict[str, Any]:
         """
         Extract text with confidence scores
         
         Args:
-            image_path: Path to the image file
+            image_path: Path to the image file, or an in-memory image
             **kwargs: Additional options
             
         Returns:
-            Dictionary with text and confidence information
+            Dictionary with text and confidence information. With Tesseract
+            'text' keeps its line and paragraph layout (the same text as
+            extract_text) and 'raw_data' holds the image_to_data columns
         """
         method = kwargs.get('method', self.default_method)
         
@@ -97,56 +157,232 @@ class PythonOCREngine:
             return self._extract_with_easyocr_confidence(image_path, **kwargs)
         elif method == 'tesseract' and self.use_tesseract:
             return self._extract_with_tesseract_confidence(image_path, **kwargs)
+        elif method == 'tesseract_inproc' and self.use_tesseract_inproc:
+            return self._extract_with_tesseract_confidence(image_path, inproc=True, **kwargs)
         else:
             raise ValueError(f"Unsupported OCR method: {method}")
     
-    def preprocess_image(self, image_path: str, **kwargs) -> str:
+    def extract_batch(self, images: Sequence[Any], confidence: bool = False,
+                      batch_images: int = EASYOCR_BATCH_IMAGES, **kwargs) -> List[Any]:
+        """
+        Run OCR on several images at once
+        
+        With EasyOCR, images of similar size are padded to a common size and
+        detected and recognized together (readtext_batched, detail=0 when only
+        text is needed). Other methods process the images one by one.
+        
+        Args:
+            images: Paths or in-memory images
+            confidence: Return confidence dictionaries instead of text
+            batch_images: Maximum images per batched call
+            **kwargs: Additional options, as for extract_text
+            
+        Returns:
+            One result per image, in order: the text or confidence dictionary,
+            or the exception raised for that image
+        """
+        method = kwargs.get('method', self.default_method)
+        if method != 'easyocr' or not self.use_easyocr or not self.easyocr_reader:
+            extract = self.extract_text_with_confidence if confidence else self.extract_text
+            results = []
+            for image in images:
+                try:
+                    results.append(extract(image, **kwargs))
+                except Exception as e:
+                    results.append(e)
+            return results
+        
+        results: List[Any] = [None] * len(images)
+        arrays = {}
+        decode_seconds = {}
+        for index, image in enumerate(images):
+            start = time.perf_counter()
+            try:
+                arrays[index] = _rgb(image_io.to_array(image))
+            except Exception as e:
+                results[index] = RuntimeError(f"EasyOCR extraction failed: {e}")
+                continue
+            decode_seconds[index] = time.perf_counter() - start
+        
+        shapes = {index: array.shape[:2] for index, array in arrays.items()}
+        for group in _size_groups(shapes, EASYOCR_SIZE_STEP, max(1, batch_images)):
+            height = max(shapes[index][0] for index in group)
+            width = max(shapes[index][1] for index in group)
+            batch = [_pad_to(arrays[index], height, width) for index in group]
+            
+            start = time.perf_counter()
+            try:
+                with inference_context(self.easyocr_mode):
+                    outputs = self.easyocr_reader.readtext_batched(
+                        batch, batch_size=self.easyocr_batch_size, detail=1 if confidence else 0)
+            except Exception as e:
+                for index in group:
+                    results[index] = RuntimeError(f"EasyOCR extraction failed: {e}")
+                continue
+            # Each image gets an equal share of the batched call
+            share = (time.perf_counter() - start) / len(group)
+            
+            for index, output in zip(group, outputs):
+                if confidence:
+                    results[index] = self._easyocr_result(
+                        output, {'decode': decode_seconds[index], 'recognize': share})
+                else:
+                    results[index] = ' '.join(output)
+        return results
+    
+    def extract_text_from_array(self, image: Any, **kwargs) -> str:
+        """Extract text from an in-memory image (RGB or grayscale uint8 array)"""
+        return self.extract_text(image_io.to_array(image), **kwargs)
+    
+    def extract_text_with_confidence_from_array(self, image: Any, **kwargs) -> Dict[str, Any]:
+        """Extract text with confidence from an in-memory image"""
+        return self.extract_text_with_confidence(image_io.to_array(image), **kwargs)
+    
+    def extract_text_from_bytes(self, data: bytes, **kwargs) -> str:
+        """Extract text from an encoded image (PNG, JPEG, ...) held in memory"""
+        return self.extract_text(image_io.decode_bytes(data), **kwargs)
+    
+    def extract_text_with_confidence_from_bytes(self, data: bytes, **kwargs) -> Dict[str, Any]:
+        """Extract text with confidence from an encoded image held in memory"""
+        return self.extract_text_with_confidence(image_io.decode_bytes(data), **kwargs)
+    
+    def preprocess_image(self, image_path: Any, **kwargs) -> Any:
         """
         Preprocess image for better OCR results
         
+        The result stays in memory unless a file is explicitly requested,
+        so the Tesseract path never pays for a PNG encode/decode round trip.
+        
         Args:
-            image_path: Path to the image file
+            image_path: Path to the image file, or an in-memory image
             **kwargs: Preprocessing options
+                normalize_resolution: Rescale so the text x-height is close to
+                    target_x_height (default True, see src.ocr.resolution)
+                pipeline: Declarative pipeline spec replacing the options
+                    below (see src.ocr.pipeline)
+                adaptive_preprocessing: Without a pipeline, skip or reduce the
+                    options below for clean images (default True, see src.ocr.quality)
+                output_path: Save the preprocessed image to this path and return the path
+                save: Save to a unique temporary file and return its path
             
         Returns:
-            Path to preprocessed image
+            Preprocessed PIL image, or the path it was saved to when requested
         """
-        if not TESSERACT_AVAILABLE:
+        if not PIL_AVAILABLE:
             return image_path
         
         try:
             # Load image
-            image = Image.open(image_path)
-            
-            # Apply preprocessing options
-            if kwargs.get('enhance_contrast', True):
-                enhancer = ImageEnhance.Contrast(image)
-                image = enhancer.enhance(1.5)
-            
-            if kwargs.get('enhance_sharpness', True):
-                enhancer = ImageEnhance.Sharpness(image)
-                image = enhancer.enhance(1.5)
-            
-            if kwargs.get('denoise', True):
-                image = image.filter(ImageFilter.MedianFilter(size=3))
+            image, _, _ = self._preprocess(image_io.to_pil(image_path), kwargs)
             
-            if kwargs.get('grayscale', True):
-                image = image.convert('L')
+            output_path = kwargs.get('output_path')
+            if not output_path and not kwargs.get('save', False):
+                return image
             
             # Save preprocessed image
-            output_path = kwargs.get('output_path')
             if not output_path:
-                temp_dir = tempfile.gettempdir()
-                filename = Path(image_path).stem + '_preprocessed.png'
-                output_path = os.path.join(temp_dir, filename)
+                # Unique name so concurrent jobs never overwrite each other
+                stem = Path(image_path).stem if image_io.is_path(image_path) else 'image'
+                fd, output_path = tempfile.mkstemp(prefix=stem + '_preprocessed_', suffix='.png')
+                os.close(fd)
             
             image.save(output_path)
             return output_path
             
         except Exception as e:
-            print(f"Error preprocessing image: {e}")
+            logger.error("Error preprocessing image: %s", e)
             return image_path
     
+    def _preprocess(self, image: Any, kwargs: Dict[str, Any],
+                    timer: Optional[StageTimer] = None) -> Tuple[Any, float, Optional[str]]:
+        """
+        Run the configured pipeline on a PIL image
+
+        A 'pipeline' call option or engine setting runs through OpenCV exactly
+        like the C++ engine. Otherwise the image is classified first and only
+        images that need it get resolution normalization plus the PIL
+        enhancement options. Returns the image, the factor it was resized by
+        and the quality decision (None when no classification ran).
+        """
+        import numpy as np
+        
+        steps = self.pipeline
+        if 'pipeline' in kwargs:
+            spec = kwargs['pipeline']
+            steps = compile_pipeline(parse_pipeline(spec)) if spec is not None else None
+        
+        quality = None
+        gray = None
+        if steps is None and kwargs.get('adaptive_preprocessing', self.adaptive_preprocessing):
+            gray = np.asarray(image.convert('L'))
+            quality = classify_quality(gray)
+            steps = self._quality_pipelines.get(quality)
+            logger.debug("Image quality '%s'", quality)
+            if timer is not None:
+                timer.lap('classify')
+        
+        if steps is None:
+            image, scale = self._normalize_resolution(image, kwargs, timer)
+            return self._apply_preprocessing(image, kwargs, timer), scale, quality
+        
+        if gray is None:
+            gray = np.asarray(image.convert('L'))
+            if timer is not None:
+                timer.lap('grayscale')
+        processed, scale = run_pipeline(gray, steps, resolution_options({**self.resolution, **kwargs}), timer)
+        return Image.fromarray(processed), scale, quality
+    
+    def _normalize_resolution(self, image: Any, kwargs: Dict[str, Any],
+                              timer: Optional[StageTimer] = None) -> Tuple[Any, float]:
+        """
+        Rescale a PIL image so its text has the target x-height
+
+        Runs before the other stages, so downscaled images are also cheaper to
+        enhance. Returns the image and the factor it was resized by.
+        """
+        options = resolution_options({**self.resolution, **kwargs})
+        if not options['normalize_resolution']:
+            return image, 1.0
+        
+        import numpy as np
+        scale = normalization_scale(np.asarray(image.convert('L')), options)
+        if scale != 1.0:
+            size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            # Box filter is area averaging when shrinking, like cv::INTER_AREA
+            resample = Image.Resampling.BOX if scale < 1.0 else Image.Resampling.BICUBIC
+            image = image.resize(size, resample)
+        if timer is not None:
+            timer.lap('normalize')
+        return image, scale
+    
+    @staticmethod
+    def _apply_preprocessing(image: Any, kwargs: Dict[str, Any],
+                             timer: Optional[StageTimer] = None) -> Any:
+        """Apply the preprocessing options to a PIL image, timing each stage when a timer is given"""
+        def lap(stage):
+            if timer is not None:
+                timer.lap(stage)
+        
+        if kwargs.get('enhance_contrast', True):
+            enhancer = ImageEnhance.Contrast(image)
+            image = enhancer.enhance(1.5)
+            lap('contrast')
+        
+        if kwargs.get('enhance_sharpness', True):
+            enhancer = ImageEnhance.Sharpness(image)
+            image = enhancer.enhance(1.5)
+            lap('sharpen')
+        
+        if kwargs.get('denoise', True):
+            image = image.filter(ImageFilter.MedianFilter(size=3))
+            lap('denoise')
+        
+        if kwargs.get('grayscale', True):
+            image = image.convert('L')
+            lap('grayscale')
+        
+        return image
+    
     def get_supported_languages(self) -> List[str]:
         """
         Get list of supported languages
@@ -165,7 +401,7 @@ class PythonOCREngine:
                 tesseract_langs = pytesseract.get_languages()
                 languages.extend(tesseract_langs)
             except Exception as e:
-                print(f"Error getting Tesseract languages: {e}")
+                logger.warning("Error getting Tesseract languages: %s", e)
         
         return list(set(languages))  # Remove duplicates
     
@@ -181,9 +417,9 @@ class PythonOCREngine:
         # Reinitialize EasyOCR reader if needed
         if self.use_easyocr and EASYOCR_AVAILABLE:
             try:
-                self.easyocr_reader = easyocr.Reader([language])
+                self.easyocr_reader = self._create_reader(language)
             except Exception as e:
-                print(f"Failed to set EasyOCR language: {e}")
+                logger.warning("Failed to set EasyOCR language: %s", e)
     
     def get_info(self) -> Dict[str, Any]:
         """
@@ -196,109 +432,184 @@ class PythonOCREngine:
             'engine': 'Python',
             'easyocr_available': EASYOCR_AVAILABLE,
             'tesseract_available': TESSERACT_AVAILABLE,
+            'tesseract_inproc_available': self.use_tesseract_inproc,
             'use_easyocr': self.use_easyocr,
             'use_tesseract': self.use_tesseract,
+            'easyocr_mode': self.easyocr_mode,
+            'easyocr_model_dir': self.easyocr_model_dir,
             'default_method': self.default_method,
             'language': self.language
         }
     
-    def _extract_with_easyocr(self, image_path: str, **kwargs) -> str:
+    def _tesseract_api(self, oem: int) -> TesseractAPI:
+        """Warm libtesseract handle for the current language, least recently used evicted"""
+        key = (self.language, oem)
+        api = self._tesseract_apis.get(key)
+        if api is None:
+            api = TesseractAPI(self.language, oem)
+            self._tesseract_apis[key] = api
+            while len(self._tesseract_apis) > MAX_TESSERACT_HANDLES:
+                _, evicted = self._tesseract_apis.popitem(last=False)
+                evicted.close()
+        self._tesseract_apis.move_to_end(key)
+        return api
+    
+    def _create_reader(self, language: str) -> Any:
+        """EasyOCR reader for a language in the configured mode (cached per process)"""
+        return create_reader([language], self.easyocr_mode, self.torch_threads,
+                             self.easyocr_model_dir)
+    
+    @staticmethod
+    def _easyocr_input(image: Any) -> Any:
+        """EasyOCR reads paths itself, everything else is handed over as an RGB array"""
+        if image_io.is_path(image):
+            return str(image)
+        return image_io.to_array(image)
+    
+    def _extract_with_easyocr(self, image_path: Any, **kwargs) -> str:
         """Extract text using EasyOCR"""
         if not self.easyocr_reader:
             raise RuntimeError("EasyOCR reader not initialized")
         
         try:
-            results = self.easyocr_reader.readtext(image_path)
-            text = ' '.join([result[1] for result in results])
-            return text
+            # Text only, so skip building boxes and scores
+            with inference_context(self.easyocr_mode):
+                results = self.easyocr_reader.readtext(self._easyocr_input(image_path), detail=0,
+                                                       batch_size=self.easyocr_batch_size)
+            return ' '.join(results)
         except Exception as e:
             raise RuntimeError(f"EasyOCR extraction failed: {e}")
     
-    def _extract_with_easyocr_confidence(self, image_path: str, **kwargs) -> Dict[str, Any]:
+    def _extract_with_easyocr_confidence(self, image_path: Any, **kwargs) -> Dict[str, Any]:
         """Extract text with confidence using EasyOCR"""
         if not self.easyocr_reader:
             raise RuntimeError("EasyOCR reader not initialized")
         
         try:
-            results = self.easyocr_reader.readtext(image_path)
-            
-            text_parts = []
-            confidences = []
+            timer = StageTimer()
+            image = self._easyocr_input(image_path)
+            timer.lap('decode')
+            with inference_context(self.easyocr_mode):
+                results = self.easyocr_reader.readtext(image, batch_size=self.easyocr_batch_size)
+            timer.lap('recognize')
             
-            for bbox, text, confidence in results:
-                text_parts.append(text)
-                confidences.append(confidence)
-            
-            full_text = ' '.join(text_parts)
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-            
-            return {
-                'text': full_text,
-                'confidence': avg_confidence,
-                'text_parts': text_parts,
-                'confidences': confidences,
-                'bboxes': [result[0] for result in results]
-            }
+            result = self._easyocr_result(results, timer.timings)
+            timer.lap('postprocess')
+            return result
         except Exception as e:
             raise RuntimeError(f"EasyOCR extraction failed: {e}")
     
-    def _extract_with_tesseract(self, image_path: str, **kwargs) -> str:
-        """Extract text using Tesseract"""
-        if not TESSERACT_AVAILABLE:
-            raise RuntimeError("Tesseract not available")
+    @staticmethod
+    def _easyocr_result(results: List[Any], timings: Dict[str, float]) -> Dict[str, Any]:
+        """Confidence dictionary from readtext output (bbox, text, confidence) tuples"""
+        text_parts = []
+        confidences = []
         
-        try:
-            # Preprocess image if requested
-            if kwargs.get('preprocess', True):
-                image_path = self.preprocess_image(image_path, **kwargs)
-            
-            # Extract text
-            text = pytesseract.image_to_string(
-                Image.open(image_path),
-                lang=self.language,
-                config=kwargs.get('tesseract_config', '--psm 6')
-            )
-            
-            return text.strip()
-        except Exception as e:
-            raise RuntimeError(f"Tesseract extraction failed: {e}")
+        for bbox, text, confidence in results:
+            text_parts.append(text)
+            confidences.append(confidence)
+        
+        full_text = ' '.join(text_parts)
+        avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+        bboxes = [result[0] for result in results]
+        
+        return {
+            'text': full_text,
+            'confidence': avg_confidence,
+            'text_parts': text_parts,
+            'confidences': confidences,
+            'bboxes': bboxes,
+            'timings': timings
+        }
+    
+    def _extract_with_tesseract(self, image_path: Any, inproc: bool = False, **kwargs) -> str:
+        """Extract text using Tesseract (the same single recognition as with confidence)"""
+        return self._extract_with_tesseract_confidence(image_path, inproc=inproc, **kwargs)['text']
     
-    def _extract_with_tesseract_confidence(self, image_path: str, **kwargs) -> Dict[str, Any]:
-        """Extract text with confidence using Tesseract"""
-        if not TESSERACT_AVAILABLE:
+    def _extract_with_tesseract_confidence(self, image_path: Any, inproc: bool = False,
+                                           **kwargs) -> Dict[str, Any]:
+        """
+        Extract text, word confidences and boxes using Tesseract
+        
+        One TSV recognition gives everything; it is parsed into columnar
+        arrays instead of per-word dictionaries (see src.ocr.tesseract_tsv).
+        With inproc the pixels go straight to a warm libtesseract handle
+        instead of a tesseract process.
+        """
+        if not (self.use_tesseract_inproc if inproc else TESSERACT_AVAILABLE):
             raise RuntimeError("Tesseract not available")
         
         try:
+            timer = StageTimer()
+            image = image_io.to_pil(image_path)
+            image.load()
+            timer.lap('decode')
+            
             # Preprocess image if requested
+            scale = 1.0
+            quality = None
             if kwargs.get('preprocess', True):
-                image_path = self.preprocess_image(image_path, **kwargs)
-            
-            # Extract text with confidence
-            data = pytesseract.image_to_data(
-                Image.open(image_path),
-                lang=self.language,
-                config=kwargs.get('tesseract_config', '--psm 6'),
-                output_type=pytesseract.Output.DICT
-            )
+                try:
+                    image, scale, quality = self._preprocess(image, kwargs, timer)
+                except Exception as e:
+                    logger.error("Error preprocessing image: %s", e)
             
-            # Process results
-            text_parts = []
-            confidences = []
+            # Text, confidences and boxes from one recognition
+            config = kwargs.get('tesseract_config', '--psm 6')
+            if inproc:
+                psm, oem, variables = parse_config(config)
+                tsv = self._tesseract_api(oem).recognize_tsv(image, psm, variables)
+            else:
+                tsv = pytesseract.image_to_data(
+                    image,
+                    lang=self.language,
+                    config=config,
+                    output_type=pytesseract.Output.STRING
+                )
+            timer.lap('recognize')
             
-            for i, conf in enumerate(data['conf']):
-                if conf > 0:  # Filter out low confidence results
-                    text_parts.append(data['text'][i])
-                    confidences.append(conf)
+            # Words with a positive confidence, boxes in input image coordinates
+            result = tsv_result(parse_tsv(tsv), scale)
+            result['raw_data'] = tsv_raw_data(tsv, scale)
+            timer.lap('postprocess')
             
-            full_text = ' '.join(text_parts)
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-            
-            return {
-                'text': full_text,
-                'confidence': avg_confidence,
-                'text_parts': text_parts,
-                'confidences': confidences,
-                'raw_data': data
-            }
+            result['scale'] = scale
+            result['quality'] = quality
+            result['timings'] = timer.timings
+            return result
         except Exception as e:
-            raise RuntimeError(f"Tesseract extraction failed: {e}") 
\ No newline at end of file
+            raise RuntimeError(f"Tesseract extraction failed: {e}") 
+
+
+def _rgb(array: Any) -> Any:
+    """RGB view or copy of a grayscale, RGB or RGBA uint8 array"""
+    import numpy as np
+    if array.ndim == 2:
+        return np.stack([array] * 3, axis=2)
+    return array[:, :, :3]
+
+
+def _size_groups(shapes: Dict[int, Tuple[int, int]], step: int, max_group: int) -> List[List[int]]:
+    """
+    Group image indices whose sizes round up to the same multiple of step
+
+    Returns:
+        Groups of at most max_group indices, each sorted by index
+    """
+    buckets: Dict[Tuple[int, int], List[int]] = {}
+    for index, (height, width) in sorted(shapes.items()):
+        key = (-(-height // step), -(-width // step))
+        buckets.setdefault(key, []).append(index)
+    return [indices[start:start + max_group]
+            for indices in buckets.values()
+            for start in range(0, len(indices), max_group)]
+
+
+def _pad_to(array: Any, height: int, width: int) -> Any:
+    """Pad an image at the bottom and right (box coordinates stay valid) with its last row's median"""
+    import numpy as np
+    pad_height, pad_width = height - array.shape[0], width - array.shape[1]
+    if not pad_height and not pad_width:
+        return array
+    return np.pad(array, ((0, pad_height), (0, pad_width), (0, 0)),
+                  mode='constant', constant_values=int(np.median(array[-1])))
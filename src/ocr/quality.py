@@ -0,0 +1,95 @@
+"""
+Fast image quality classification
+Picks the least preprocessing an image needs from its gray-level histogram and
+horizontal edges: crisp screenshots skip it, clean low-contrast images are only
+binarized, and noisy, blurred or unevenly lit images get the full chain. The C++
+engine applies the same rules (OCREngine::classify_quality).
+"""
+
+import math
+from typing import Any, Dict, Optional
+
+QUALITY_NONE = 'none'
+QUALITY_BINARIZE = 'binarize'
+QUALITY_FULL = 'full'
+
+# Pipeline preset run for each decision (see src.ocr.pipeline); None keeps the
+# backend's full preprocessing. Resolution normalization always stays.
+QUALITY_PIPELINES: Dict[str, Optional[str]] = {
+    QUALITY_NONE: 'fast',
+    QUALITY_BINARIZE: 'binarize-simple',
+    QUALITY_FULL: None,
+}
+
+# The histogram is taken on at most this many pixels (regular subsampling)
+MAX_SAMPLES = 512 * 512
+# Gray levels the ink peak must be away from the background peak
+MIN_INK_DISTANCE = 64
+# Background/ink distance of a high-contrast image that needs no enhancement
+CLEAN_CONTRAST = 128
+# Gray levels around each peak still counted as that peak
+PEAK_TOLERANCE = 16
+# Fraction of pixels that must sit at one of the two peaks (noise, shading)
+MIN_PEAK_FRACTION = 0.9
+# Fraction of text edges that must be sharp rather than soft (blur, noise)
+MIN_SHARP_EDGES = 0.35
+
+
+def quality_features(gray: Any) -> Optional[Dict[str, float]]:
+    """
+    Measure the features classify_quality decides on
+
+    Args:
+        gray: Grayscale uint8 NumPy array
+
+    Returns:
+        'contrast' (background to ink peak distance), 'peak_fraction' and
+        'sharp_edges', or None when the image has no ink at all
+    """
+    import numpy as np
+
+    step = max(1, math.ceil(math.sqrt(gray.size / MAX_SAMPLES)))
+    sample = gray[::step, ::step]
+    histogram = np.bincount(sample.ravel(), minlength=256)
+    levels = np.arange(256)
+
+    background = int(histogram.argmax())
+    far = np.abs(levels - background) >= MIN_INK_DISTANCE
+    if not histogram[far].any():
+        return None
+    ink = int(np.where(far, histogram, -1).argmax())
+    contrast = abs(background - ink)
+
+    near = (np.abs(levels - background) <= PEAK_TOLERANCE) | (np.abs(levels - ink) <= PEAK_TOLERANCE)
+    peak_fraction = histogram[near].sum() / sample.size
+
+    # Text edges jump most of the way between the peaks within one pixel;
+    # noise and blur produce many smaller steps
+    diffs = np.abs(np.diff(sample.astype(np.int16), axis=1))
+    strong = np.count_nonzero(diffs >= contrast // 2)
+    soft = np.count_nonzero((diffs > PEAK_TOLERANCE) & (diffs < contrast // 2))
+    sharp_edges = strong / (strong + soft) if strong + soft else 1.0
+
+    return {'contrast': float(contrast), 'peak_fraction': float(peak_fraction),
+            'sharp_edges': float(sharp_edges)}
+
+
+def classify_quality(gray: Any) -> str:
+    """
+    Decide how much preprocessing an image needs
+
+    Args:
+        gray: Grayscale uint8 NumPy array
+
+    Returns:
+        QUALITY_NONE, QUALITY_BINARIZE or QUALITY_FULL
+    """
+    features = quality_features(gray)
+    if features is None:
+        # Blank image, nothing to enhance
+        return QUALITY_NONE
+    if features['peak_fraction'] < MIN_PEAK_FRACTION or features['sharp_edges'] < MIN_SHARP_EDGES:
+        return QUALITY_FULL
+    if features['contrast'] >= CLEAN_CONTRAST:
+        return QUALITY_NONE
+    return QUALITY_BINARIZE
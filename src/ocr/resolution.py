@@ -0,0 +1,110 @@
+"""
+Resolution normalization before recognition
+Estimates the x-height of the text from connected components and picks the
+scale that brings it to the size Tesseract recognizes best. The C++ engine
+implements the same estimate (OCREngine::estimate_x_height).
+"""
+
+from typing import Any, Dict, Optional
+
+
+# x-height in pixels Tesseract is most accurate at; accuracy drops quickly below
+# about 10 px and larger text only costs time
+DEFAULT_TARGET_X_HEIGHT = 20.0
+# Images whose text already falls in this range are left alone
+DEFAULT_MIN_X_HEIGHT = 14.0
+DEFAULT_MAX_X_HEIGHT = 32.0
+MIN_SCALE = 0.25
+MAX_SCALE = 4.0
+
+# Engine/call options understood by resolution_options()
+RESOLUTION_OPTIONS = ('normalize_resolution', 'target_x_height',
+                      'min_x_height', 'max_x_height')
+
+# Fewer glyph-like components than this and the estimate is not trusted
+_MIN_COMPONENTS = 8
+
+
+def resolution_options(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolution settings from engine or call options, with defaults
+
+    Args:
+        kwargs: Options that may contain normalize_resolution (bool),
+            target_x_height, min_x_height and max_x_height (pixels)
+
+    Returns:
+        Dictionary with all four settings
+    """
+    options = {
+        'normalize_resolution': kwargs.get('normalize_resolution', True),
+        'target_x_height': float(kwargs.get('target_x_height', DEFAULT_TARGET_X_HEIGHT)),
+        'min_x_height': float(kwargs.get('min_x_height', DEFAULT_MIN_X_HEIGHT)),
+        'max_x_height': float(kwargs.get('max_x_height', DEFAULT_MAX_X_HEIGHT)),
+    }
+    if not options['min_x_height'] <= options['target_x_height'] <= options['max_x_height']:
+        raise ValueError("Expected min_x_height <= target_x_height <= max_x_height")
+    return options
+
+
+def estimate_x_height(gray: Any) -> Optional[float]:
+    """
+    Estimate the x-height of the text in a grayscale image
+
+    Otsu-binarizes the image (the minority color is taken as ink), then takes
+    the median height of the connected components that look like glyphs:
+    at least 3 px tall, not taller than a third of the image, not wider than
+    three glyph heights and neither hairlines nor solid blocks. Lowercase
+    letters without ascenders or descenders are the most common glyphs, so
+    the median glyph height is close to the x-height.
+
+    Args:
+        gray: Grayscale uint8 NumPy array
+
+    Returns:
+        Estimated x-height in pixels, None when OpenCV is missing or the image
+        has too few glyph-like components
+    """
+    try:
+        import cv2
+    except ImportError:
+        return None
+    import numpy as np
+
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    if cv2.countNonZero(binary) > binary.size // 2:
+        binary = cv2.bitwise_not(binary)
+
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    # Row 0 is the background
+    widths = stats[1:count, cv2.CC_STAT_WIDTH]
+    heights = stats[1:count, cv2.CC_STAT_HEIGHT]
+    areas = stats[1:count, cv2.CC_STAT_AREA]
+    fill = areas / np.maximum(widths * heights, 1)
+    glyphs = ((heights >= 3) & (heights <= gray.shape[0] // 3) & (widths <= 3 * heights)
+              & (fill >= 0.1) & (fill <= 0.95))
+
+    heights = heights[glyphs]
+    if heights.size < _MIN_COMPONENTS:
+        return None
+    return float(np.median(heights))
+
+
+def normalization_scale(gray: Any, options: Dict[str, Any]) -> float:
+    """
+    Scale factor that brings the text of an image to the target height
+
+    Args:
+        gray: Grayscale uint8 NumPy array
+        options: Settings from resolution_options()
+
+    Returns:
+        Factor to resize the image by, 1.0 when disabled, when the text is
+        already in range or when its size cannot be estimated
+    """
+    if not options['normalize_resolution']:
+        return 1.0
+    height = estimate_x_height(gray)
+    if height is None or options['min_x_height'] <= height <= options['max_x_height']:
+        return 1.0
+    return min(MAX_SCALE, max(MIN_SCALE, options['target_x_height'] / height))
@@ -0,0 +1,420 @@
+"""
+Content-addressed OCR result cache
+Results are keyed by image digest, backend, language and pipeline options, with an
+in-memory LRU tier and an optional size-bounded SQLite tier on disk. The disk tier
+stores JSON (NumPy arrays are tagged with their dtype and shape), never pickles.
+File digests are remembered by (path, size, mtime_ns), so a hit on a path does
+not read the file again; both digest tiers are LRU-bounded as well.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+
+_CHUNK_SIZE = 1 << 20
+
+# File digests remembered in memory, by (path, size, mtime_ns)
+MAX_PATH_DIGESTS = 4096
+# File digests kept in the disk tier (least recently used paths are evicted)
+MAX_DISK_PATH_DIGESTS = 65536
+
+# Marks a NumPy array in the JSON stored on disk
+_ARRAY_TAG = '__ndarray__'
+
+
+def _new_hasher():
+    """Fast non-cryptographic hasher when available, blake2b otherwise"""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def image_digest(image: Any) -> str:
+    """
+    Compute a content digest for an image input
+
+    Args:
+        image: Path (file bytes are hashed), encoded bytes or uint8 array (pixels are hashed)
+
+    Returns:
+        Hex digest string
+    """
+    hasher = _new_hasher()
+
+    if isinstance(image, (str, os.PathLike)):
+        with open(image, 'rb') as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                hasher.update(chunk)
+        return 'f' + hasher.hexdigest()
+
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        hasher.update(image)
+        return 'f' + hasher.hexdigest()
+
+    import numpy as np
+    if not isinstance(image, np.ndarray):
+        from .image_io import to_array
+        image = to_array(image)
+    image = np.ascontiguousarray(image)
+    hasher.update(repr((image.shape, image.dtype.str)).encode())
+    hasher.update(memoryview(image).cast('B'))
+    return 'p' + hasher.hexdigest()
+
+
+def _json_default(value: Any) -> Any:
+    """Encode the NumPy values found in results"""
+    import numpy as np
+
+    if isinstance(value, np.ndarray):
+        return {_ARRAY_TAG: value.dtype.str, 'shape': list(value.shape), 'data': value.ravel().tolist()}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot store {type(value).__name__} in the result cache")
+
+
+def _json_object_hook(value: Dict[str, Any]) -> Any:
+    """Decode arrays encoded by _json_default"""
+    if _ARRAY_TAG not in value:
+        return value
+    import numpy as np
+    return np.array(value['data'], dtype=np.dtype(value[_ARRAY_TAG])).reshape(value['shape'])
+
+
+def encode_result(value: Any) -> bytes:
+    """Serialize a result for the disk tier"""
+    return json.dumps(value, default=_json_default, ensure_ascii=False).encode('utf-8')
+
+
+def decode_result(blob: bytes) -> Any:
+    """
+    Deserialize a result written by encode_result
+
+    Raises:
+        ValueError: Not a JSON result (e.g. a row written by an older version)
+    """
+    return json.loads(bytes(blob).decode('utf-8'), object_hook=_json_object_hook)
+
+
+def make_cache_key(digest: str, backend: str, language: Optional[str], kind: str,
+                   options: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build a cache key from the image digest and everything that affects the result
+
+    Args:
+        digest: Image digest from image_digest
+        backend: Backend identifier (e.g. 'cpp', 'python:tesseract')
+        language: OCR language
+        kind: Result kind ('text' or 'confidence')
+        options: Preprocessing / recognition options
+
+    Returns:
+        Cache key string
+    """
+    encoded_options = json.dumps(options or {}, sort_keys=True, default=repr)
+    return '|'.join((digest, backend, str(language), kind, encoded_options))
+
+
+class ResultCache:
+    """
+    Two-tier OCR result cache: in-memory LRU plus optional SQLite on disk
+    """
+
+    def __init__(self, max_entries: int = 256, cache_dir: Optional[str] = None,
+                 max_disk_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize result cache
+
+        Args:
+            max_entries: Maximum number of results kept in memory
+            cache_dir: Directory of the on-disk tier (None keeps the cache in memory only)
+            max_disk_bytes: Size bound of the on-disk tier
+        """
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.cache_dir = cache_dir
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._path_digests: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._db = None
+        self._disk_bytes = 0
+        self._disk_digests = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lookup_seconds = 0.0
+        self._lookups = 0
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(cache_dir, 'ocr_cache.sqlite3'),
+                                       timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, accessed REAL NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results(accessed)")
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(file_digests)")}
+            if columns and 'accessed' not in columns:
+                # Written without LRU bookkeeping, the digests are only a memo
+                self._db.execute("DROP TABLE file_digests")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS file_digests ("
+                "path TEXT PRIMARY KEY, size INTEGER NOT NULL, "
+                "mtime_ns INTEGER NOT NULL, digest TEXT NOT NULL, accessed REAL NOT NULL)")
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS file_digests_accessed ON file_digests(accessed)")
+            self._db.commit()
+            row = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+            self._disk_bytes = row[0]
+            self._disk_digests = self._db.execute("SELECT COUNT(*) FROM file_digests").fetchone()[0]
+
+    def digest(self, image: Any) -> str:
+        """
+        Content digest of an image input, see image_digest
+
+        The digest of a file is remembered (in memory and in the disk tier) by
+        its path, size and modification time, so the file is only read when it
+        is new or has changed.
+
+        Args:
+            image: Path, encoded bytes or in-memory image
+
+        Returns:
+            Hex digest string
+        """
+        if not isinstance(image, (str, os.PathLike)):
+            return image_digest(image)
+
+        stat = os.stat(image)
+        identity = (os.path.abspath(image), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._path_digests.get(identity)
+            if digest is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT digest FROM file_digests WHERE path = ? AND size = ? AND mtime_ns = ?",
+                    identity).fetchone()
+                if row is not None:
+                    digest = row[0]
+                    self._db.execute("UPDATE file_digests SET accessed = ? WHERE path = ?",
+                                     (time.time(), identity[0]))
+                    self._db.commit()
+            if digest is not None:
+                self._remember_digest(identity, digest)
+                return digest
+
+        # Hashed without the lock so other lookups are not blocked
+        digest = image_digest(image)
+        with self._lock:
+            self._remember_digest(identity, digest)
+            if self._db is not None:
+                # One row per path: a changed file replaces its stale digest
+                known = self._db.execute("SELECT 1 FROM file_digests WHERE path = ?",
+                                         (identity[0],)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO file_digests (path, size, mtime_ns, digest, accessed) "
+                    "VALUES (?, ?, ?, ?, ?)", identity + (digest, time.time()))
+                if known is None:
+                    self._disk_digests += 1
+                    self._evict_disk_digests()
+                self._db.commit()
+        return digest
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached result
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            Copy of the cached result (safe to modify) or None
+        """
+        start = time.perf_counter()
+        with self._lock:
+            try:
+                value = self._memory.get(key)
+                if value is not None:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return copy.deepcopy(value)
+
+                if self._db is not None:
+                    row = self._db.execute("SELECT value FROM results WHERE key = ?",
+                                           (key,)).fetchone()
+                    if row is not None:
+                        try:
+                            value = decode_result(row[0])
+                        except ValueError:
+                            # Written in another format, drop it and recompute
+                            self._delete_disk(key)
+                            self._db.commit()
+                        else:
+                            self._db.execute("UPDATE results SET accessed = ? WHERE key = ?",
+                                             (time.time(), key))
+                            self._db.commit()
+                            self._remember(key, value)
+                            self.disk_hits += 1
+                            return copy.deepcopy(value)
+
+                self.misses += 1
+                return None
+            finally:
+                self._lookups += 1
+                self._lookup_seconds += time.perf_counter() - start
+
+    def put(self, key: str, value: Any):
+        """
+        Store a result in both tiers
+
+        Args:
+            key: Cache key from make_cache_key
+            value: Result to cache, copied so the caller may keep modifying it
+                (JSON types and NumPy arrays for the disk tier)
+        """
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._remember(key, value)
+
+            if self._db is not None:
+                blob = encode_result(value)
+                previous = self._db.execute("SELECT size FROM results WHERE key = ?",
+                                            (key,)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                    (key, blob, len(blob), time.time()))
+                self._disk_bytes += len(blob) - (previous[0] if previous else 0)
+                self._evict_disk()
+                self._db.commit()
+
+    def clear(self):
+        """Drop all cached results from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            self._path_digests.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.execute("DELETE FROM file_digests")
+                self._db.commit()
+                self._disk_bytes = 0
+                self._disk_digests = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with hit/miss counters and tier sizes
+        """
+        with self._lock:
+            lookups = self._lookups
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                'avg_lookup_us': self._lookup_seconds / lookups * 1e6 if lookups else 0.0,
+                'entries': len(self._memory),
+                'max_entries': self.max_entries,
+                'evictions': self.evictions,
+                'disk_path': self.cache_dir,
+                'disk_bytes': self._disk_bytes if self._db is not None else 0,
+                'max_disk_bytes': self.max_disk_bytes if self._db is not None else 0,
+                'hasher': 'xxh3_128' if XXHASH_AVAILABLE else 'blake2b',
+            }
+
+    def close(self):
+        """Close the on-disk tier"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, value: Any):
+        """Insert into the in-memory LRU tier"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _remember_digest(self, identity: Tuple[str, int, int], digest: str):
+        """Insert into the in-memory file digest LRU"""
+        self._path_digests[identity] = digest
+        self._path_digests.move_to_end(identity)
+        while len(self._path_digests) > MAX_PATH_DIGESTS:
+            self._path_digests.popitem(last=False)
+
+    def _delete_disk(self, key: str):
+        """Delete one row of the disk tier"""
+        row = self._db.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._disk_bytes -= row[0]
+
+    def _evict_disk(self):
+        """Delete least recently accessed rows until the disk tier fits its bound"""
+        if self._disk_bytes <= self.max_disk_bytes:
+            return
+
+        # Trim a little below the bound so eviction does not run on every insert
+        target = int(self.max_disk_bytes * 0.9)
+        while self._disk_bytes > target:
+            rows = self._db.execute(
+                "SELECT key, size FROM results ORDER BY accessed LIMIT 64").fetchall()
+            if not rows:
+                self._disk_bytes = 0
+                break
+            for key, size in rows:
+                if self._disk_bytes <= target:
+                    break
+                self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._disk_bytes -= size
+
+    def _evict_disk_digests(self):
+        """Delete least recently used file digests beyond MAX_DISK_PATH_DIGESTS"""
+        if self._disk_digests <= MAX_DISK_PATH_DIGESTS:
+            return
+        # Trim a little below the bound so eviction does not run on every insert
+        excess = self._disk_digests - int(MAX_DISK_PATH_DIGESTS * 0.9)
+        self._db.execute(
+            "DELETE FROM file_digests WHERE path IN "
+            "(SELECT path FROM file_digests ORDER BY accessed LIMIT ?)", (excess,))
+        self._disk_digests -= excess
+
+
+_caches: Dict[Optional[str], ResultCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_result_cache(cache_dir: Optional[str] = None) -> ResultCache:
+    """
+    Get the process-wide result cache for a cache directory
+
+    Args:
+        cache_dir: Directory of the on-disk tier (None for memory only)
+
+    Returns:
+        Shared ResultCache instance
+    """
+    key = os.path.abspath(cache_dir) if cache_dir else None
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = ResultCache(cache_dir=key)
+            _caches[key] = cache
+        return cache
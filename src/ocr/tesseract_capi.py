@@ -0,0 +1,277 @@
+"""
+In-process Tesseract through the libtesseract C API (ctypes)
+Unlike pytesseract, which writes a temporary image, starts the tesseract
+executable and reloads traineddata for every image, a TesseractAPI handle is
+initialized once per language and recognizes pixel buffers directly. Output is
+the same TSV the command line writes, parsed by src.ocr.tesseract_tsv.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import shlex
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Full path of the library, checked before the system search
+LIBRARY_ENV = 'TEXTCAPTURE_LIBTESSERACT'
+
+# File names tried when the system search finds nothing
+_LIBRARY_NAMES = {
+    'win32': ('libtesseract-5.dll', 'tesseract53.dll', 'tesseract52.dll', 'tesseract51.dll',
+              'tesseract50.dll', 'libtesseract-4.dll', 'tesseract41.dll'),
+    'darwin': ('libtesseract.5.dylib', 'libtesseract.4.dylib', 'libtesseract.dylib'),
+}
+_DEFAULT_LIBRARY_NAMES = ('libtesseract.so.5', 'libtesseract.so.4', 'libtesseract.so')
+
+# TessOcrEngineMode OEM_DEFAULT and TessPageSegMode PSM_SINGLE_BLOCK
+DEFAULT_OEM = 3
+DEFAULT_PSM = 6
+
+_library = None
+_load_attempted = False
+_load_lock = threading.Lock()
+
+
+def _candidates() -> List[str]:
+    """Library paths and names to try, in order"""
+    candidates = []
+    if os.environ.get(LIBRARY_ENV):
+        candidates.append(os.environ[LIBRARY_ENV])
+    found = ctypes.util.find_library('tesseract')
+    if found:
+        candidates.append(found)
+    candidates.extend(_LIBRARY_NAMES.get(sys.platform, _DEFAULT_LIBRARY_NAMES))
+    return candidates
+
+
+def _declare(library):
+    """Set the C signatures of the functions used here"""
+    handle = ctypes.c_void_p
+    signatures = {
+        'TessVersion': ([], ctypes.c_char_p),
+        'TessBaseAPICreate': ([], handle),
+        'TessBaseAPIDelete': ([handle], None),
+        'TessBaseAPIInit2': ([handle, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int], ctypes.c_int),
+        'TessBaseAPIEnd': ([handle], None),
+        'TessBaseAPISetPageSegMode': ([handle, ctypes.c_int], None),
+        'TessBaseAPISetVariable': ([handle, ctypes.c_char_p, ctypes.c_char_p], ctypes.c_int),
+        'TessBaseAPIGetIntVariable': ([handle, ctypes.c_char_p, ctypes.POINTER(ctypes.c_int)], ctypes.c_int),
+        'TessBaseAPIGetBoolVariable': ([handle, ctypes.c_char_p, ctypes.POINTER(ctypes.c_int)], ctypes.c_int),
+        'TessBaseAPIGetDoubleVariable': ([handle, ctypes.c_char_p, ctypes.POINTER(ctypes.c_double)],
+                                         ctypes.c_int),
+        'TessBaseAPIGetStringVariable': ([handle, ctypes.c_char_p], ctypes.c_char_p),
+        'TessBaseAPISetImage': ([handle, ctypes.c_void_p, ctypes.c_int, ctypes.c_int,
+                                 ctypes.c_int, ctypes.c_int], None),
+        'TessBaseAPIRecognize': ([handle, ctypes.c_void_p], ctypes.c_int),
+        # Returned as a raw pointer so it can be released with TessDeleteText
+        'TessBaseAPIGetTsvText': ([handle, ctypes.c_int], ctypes.c_void_p),
+        'TessBaseAPIClear': ([handle], None),
+        'TessDeleteText': ([ctypes.c_void_p], None),
+    }
+    for name, (argtypes, restype) in signatures.items():
+        function = getattr(library, name)
+        function.argtypes = argtypes
+        function.restype = restype
+
+
+def _load_library():
+    """
+    Load libtesseract on first use
+
+    Returns:
+        ctypes library, or None if no usable libtesseract was found
+    """
+    global _library, _load_attempted
+    if _load_attempted:
+        return _library
+
+    with _load_lock:
+        if _load_attempted:
+            return _library
+        for candidate in _candidates():
+            try:
+                library = ctypes.CDLL(candidate)
+                _declare(library)
+            except (OSError, AttributeError) as e:
+                logger.debug("libtesseract candidate %s not usable: %s", candidate, e)
+                continue
+            _library = library
+            logger.debug("Loaded libtesseract %s from %s",
+                         library.TessVersion().decode('ascii', 'replace'), candidate)
+            break
+        _load_attempted = True
+    return _library
+
+
+def is_libtesseract_available() -> bool:
+    """Check if libtesseract can be loaded in-process"""
+    return _load_library() is not None
+
+
+def parse_config(config: str) -> Tuple[int, int, Dict[str, str]]:
+    """
+    Parse a tesseract command line config string
+
+    Args:
+        config: Options as passed to pytesseract, e.g. '--psm 6 -c preserve_interword_spaces=1'
+
+    Returns:
+        Page segmentation mode, OCR engine mode and -c variables
+
+    Raises:
+        ValueError: Unsupported or malformed option
+    """
+    psm, oem, variables = DEFAULT_PSM, DEFAULT_OEM, {}
+    tokens = shlex.split(config or '')
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        value = tokens[index + 1] if index + 1 < len(tokens) else None
+        if token in ('--psm', '--oem', '-c') and value is None:
+            raise ValueError(f"Missing value for {token} in tesseract config")
+        if token == '--psm':
+            psm = int(value)
+        elif token == '--oem':
+            oem = int(value)
+        elif token == '-c':
+            name, separator, setting = value.partition('=')
+            if not separator:
+                raise ValueError(f"Expected -c name=value in tesseract config, got {value!r}")
+            variables[name] = setting
+        else:
+            raise ValueError(f"Unsupported tesseract option for in-process recognition: {token}")
+        index += 2
+    return psm, oem, variables
+
+
+class TesseractAPI:
+    """
+    One initialized TessBaseAPI handle (one language and engine mode)
+
+    Not safe for concurrent use, calls are serialized by an internal lock.
+    Variables passed to a call only apply to that call: their previous values
+    are restored afterwards, so results never depend on earlier calls.
+    """
+
+    def __init__(self, language: str = 'eng', oem: int = DEFAULT_OEM, datapath: Optional[str] = None):
+        """
+        Create and initialize the handle (loads the traineddata once)
+
+        Args:
+            language: Tesseract language string ('eng', 'eng+vie', ...)
+            oem: OCR engine mode
+            datapath: tessdata directory, defaults to TESSDATA_PREFIX or the
+                library's built-in path
+
+        Raises:
+            RuntimeError: libtesseract missing or initialization failed
+        """
+        self._lib = _load_library()
+        if self._lib is None:
+            raise RuntimeError("libtesseract not found (set %s to its path)" % LIBRARY_ENV)
+        self.language = language
+        self._lock = threading.Lock()
+        self._handle = self._lib.TessBaseAPICreate()
+        datapath = datapath or os.environ.get('TESSDATA_PREFIX')
+        status = self._lib.TessBaseAPIInit2(self._handle, datapath.encode() if datapath else None,
+                                            language.encode(), oem)
+        if status != 0:
+            self._lib.TessBaseAPIDelete(self._handle)
+            self._handle = None
+            raise RuntimeError(f"Failed to initialize Tesseract for language '{language}'")
+
+    def recognize_tsv(self, image: Any, psm: int = DEFAULT_PSM,
+                      variables: Optional[Dict[str, str]] = None) -> str:
+        """
+        Recognize an image and return Tesseract's TSV output
+
+        Args:
+            image: PIL image or uint8 array (H, W), (H, W, 3) or (H, W, 4);
+                the pixels are handed to Tesseract without encoding
+            psm: Page segmentation mode
+            variables: Tesseract variables for this call only
+
+        Returns:
+            TSV text (word rows as the tesseract command line writes them)
+        """
+        import numpy as np
+
+        pixels = np.asarray(_tesseract_mode(image)) if hasattr(image, 'mode') else np.asarray(image)
+        if pixels.dtype != np.uint8 or pixels.ndim not in (2, 3):
+            raise ValueError("Expected a uint8 image with shape (H, W) or (H, W, C)")
+        if pixels.strides[-1] != 1 or (pixels.ndim == 3 and pixels.strides[1] != pixels.shape[2]):
+            pixels = np.ascontiguousarray(pixels)
+        height, width = pixels.shape[:2]
+        channels = 1 if pixels.ndim == 2 else pixels.shape[2]
+
+        with self._lock:
+            if self._handle is None:
+                raise RuntimeError("Tesseract handle is closed")
+            lib = self._lib
+            lib.TessBaseAPISetPageSegMode(self._handle, psm)
+            previous: Dict[str, str] = {}
+            try:
+                for name, value in (variables or {}).items():
+                    current = self._get_variable(name)
+                    if current is None or not lib.TessBaseAPISetVariable(
+                            self._handle, name.encode(), value.encode()):
+                        raise ValueError(f"Unknown Tesseract variable: {name}")
+                    previous.setdefault(name, current)
+                # SetImage copies the pixels, the array only has to live until then
+                lib.TessBaseAPISetImage(self._handle, pixels.ctypes.data, width, height,
+                                        channels, pixels.strides[0])
+                if lib.TessBaseAPIRecognize(self._handle, None) != 0:
+                    raise RuntimeError("Tesseract recognition failed")
+                text = lib.TessBaseAPIGetTsvText(self._handle, 0)
+                try:
+                    return ctypes.string_at(text).decode('utf-8') if text else ''
+                finally:
+                    if text:
+                        lib.TessDeleteText(text)
+            finally:
+                lib.TessBaseAPIClear(self._handle)
+                for name, value in previous.items():
+                    lib.TessBaseAPISetVariable(self._handle, name.encode(), value.encode())
+
+    def _get_variable(self, name: str) -> Optional[str]:
+        """Current value of a variable as SetVariable accepts it, None if unknown (lock held)"""
+        lib, key = self._lib, name.encode()
+        number = ctypes.c_int()
+        if lib.TessBaseAPIGetIntVariable(self._handle, key, ctypes.byref(number)):
+            return str(number.value)
+        if lib.TessBaseAPIGetBoolVariable(self._handle, key, ctypes.byref(number)):
+            return '1' if number.value else '0'
+        real = ctypes.c_double()
+        if lib.TessBaseAPIGetDoubleVariable(self._handle, key, ctypes.byref(real)):
+            return repr(real.value)
+        text = lib.TessBaseAPIGetStringVariable(self._handle, key)
+        return text.decode('utf-8') if text is not None else None
+
+    def close(self):
+        """Release the handle and its traineddata"""
+        with self._lock:
+            if self._handle is not None:
+                self._lib.TessBaseAPIEnd(self._handle)
+                self._lib.TessBaseAPIDelete(self._handle)
+                self._handle = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def __repr__(self):
+        return f"TesseractAPI(language='{self.language}')"
+
+
+def _tesseract_mode(image: Any) -> Any:
+    """PIL image in a mode with a plain 8-bit layout (L, RGB or RGBA)"""
+    if image.mode in ('L', 'RGB', 'RGBA'):
+        return image
+    return image.convert('L' if image.mode in ('1', 'I', 'I;16', 'F') else 'RGB')
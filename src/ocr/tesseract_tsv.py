@@ -0,0 +1,134 @@
+"""
+Tesseract TSV parsing
+Turns the TSV Tesseract writes for one recognition (pytesseract.image_to_data,
+TessBaseAPIGetTsvText) into columnar arrays, so text, per-word confidences and
+boxes all come from a single OCR run
+"""
+
+from typing import Any, Dict, List, NamedTuple
+
+# Columns of a Tesseract TSV row
+TSV_COLUMNS = ('level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+               'left', 'top', 'width', 'height', 'conf', 'text')
+# Value of 'level' on word rows (page, block, paragraph and line rows carry no text)
+WORD_LEVEL = '5'
+
+
+class TsvWords(NamedTuple):
+    """Word rows of a TSV, one entry per word in reading order"""
+    text: List[str]
+    # (N,) float64, Tesseract's 0-100 word confidence
+    confidences: Any
+    # (N, 4) int32 x, y, width, height
+    boxes: Any
+    # (N, 3) int32 block, paragraph and line number
+    lines: Any
+
+
+def parse_tsv(tsv: str) -> TsvWords:
+    """
+    Parse Tesseract TSV output into columnar arrays
+
+    Args:
+        tsv: TSV text, with or without the header row
+
+    Returns:
+        TsvWords with the word rows
+    """
+    import numpy as np
+
+    rows = [line.split('\t') for line in tsv.splitlines()]
+    rows = [row for row in rows if len(row) == len(TSV_COLUMNS) and row[0] == WORD_LEVEL]
+    if not rows:
+        return TsvWords([], np.zeros(0, np.float64), np.zeros((0, 4), np.int32), np.zeros((0, 3), np.int32))
+
+    # One vectorized string-to-number conversion for all numeric columns
+    numeric = np.array([row[:-1] for row in rows], dtype=np.float64)
+    return TsvWords(
+        text=[row[-1] for row in rows],
+        confidences=numeric[:, 10],
+        boxes=numeric[:, 6:10].astype(np.int32),
+        lines=numeric[:, 2:5].astype(np.int32),
+    )
+
+
+def words_to_text(words: TsvWords) -> str:
+    """
+    Rebuild the page text the way Tesseract's text renderer lays it out
+
+    Words of a line are joined by spaces, lines by newlines and paragraphs
+    or blocks by an empty line, as in image_to_string output (stripped).
+    """
+    parts: List[str] = []
+    previous = None
+    for text, line in zip(words.text, words.lines.tolist()):
+        if not text.strip():
+            continue
+        if previous is not None:
+            if line == previous:
+                parts.append(' ')
+            elif line[:2] == previous[:2]:
+                parts.append('\n')
+            else:
+                parts.append('\n\n')
+        parts.append(text)
+        previous = line
+    return ''.join(parts)
+
+
+def tsv_raw_data(tsv: str, scale: float = 1.0) -> Dict[str, List[Any]]:
+    """
+    All TSV rows as a dict of columns, as pytesseract's Output.DICT returns them
+
+    Numeric cells become ints and text stays a string. Kept as the 'raw_data'
+    of confidence results for callers written against image_to_data.
+
+    Args:
+        tsv: TSV text, with or without the header row
+        scale: Factor the image was resized by; boxes are mapped back to input
+            coordinates
+    """
+    data: Dict[str, List[Any]] = {column: [] for column in TSV_COLUMNS}
+    for line in tsv.splitlines():
+        row = line.split('\t')
+        if len(row) == len(TSV_COLUMNS) - 1:
+            # The text cell of an empty last word may be missing
+            row.append('')
+        if len(row) != len(TSV_COLUMNS) or not row[0].isdigit():
+            continue
+        for column, value in zip(TSV_COLUMNS[:-1], row):
+            data[column].append(int(float(value)))
+        data['text'].append(row[-1])
+    if scale != 1.0:
+        for column in ('left', 'top', 'width', 'height'):
+            data[column] = [round(value / scale) for value in data[column]]
+    return data
+
+
+def tsv_result(words: TsvWords, scale: float = 1.0) -> Dict[str, Any]:
+    """
+    Build the confidence result shared by all backends from parsed words
+
+    Args:
+        words: Result of parse_tsv
+        scale: Factor the image was resized by before recognition; boxes are
+            mapped back to input coordinates
+
+    Returns:
+        Dictionary with 'text', 'confidence', 'text_parts', 'confidences' (N,)
+        and 'bounding_boxes' (N, 4) for the words with a positive confidence
+    """
+    import numpy as np
+
+    keep = words.confidences > 0
+    confidences = words.confidences[keep]
+    boxes = words.boxes[keep]
+    if scale != 1.0:
+        boxes = np.rint(boxes / scale).astype(np.int32)
+    return {
+        'text': words_to_text(words),
+        'confidence': float(confidences.mean()) if confidences.size else 0.0,
+        'text_parts': [text for text, kept in zip(words.text, keep.tolist()) if kept],
+        'confidences': confidences,
+        'bounding_boxes': boxes,
+    }
@@ -0,0 +1,324 @@
+"""
+Tiled OCR for very large images (scans, long scrolling screenshots)
+Splits the page into overlapping horizontal bands, recognizes them in parallel
+and keeps each word only in the band that owns its center
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Band height and overlap in pixels. The overlap must be taller than two text
+# lines so that every line is complete in at least one band.
+DEFAULT_BAND_HEIGHT = 2048
+DEFAULT_OVERLAP = 192
+
+# (text, confidence, x, y, width, height) in page coordinates
+Element = Tuple[str, float, int, int, int, int]
+
+# Uncompressed pixel layouts read band by band: channels and whether the
+# colour order is reversed (BMP stores BGR)
+_RAW_LAYOUTS = {
+    'L': (1, False),
+    'RGB': (3, False), 'BGR': (3, True),
+    'RGBX': (4, False), 'RGBA': (4, False), 'BGRX': (4, True), 'BGRA': (4, True),
+}
+
+
+def plan_bands(height: int, band_height: int = DEFAULT_BAND_HEIGHT,
+               overlap: int = DEFAULT_OVERLAP) -> List[Tuple[int, int]]:
+    """
+    Split an image height into overlapping bands
+
+    Args:
+        height: Image height in pixels
+        band_height: Height of each band, overlap included
+        overlap: Rows shared by consecutive bands
+
+    Returns:
+        List of (top, bottom) row ranges covering the image
+    """
+    if band_height <= 0:
+        raise ValueError("band_height must be positive")
+    if not 0 <= overlap < band_height // 2:
+        raise ValueError("overlap must be non-negative and less than half of band_height")
+    if height <= band_height:
+        return [(0, height)]
+
+    bands = []
+    step = band_height - overlap
+    top = 0
+    while True:
+        bottom = min(top + band_height, height)
+        bands.append((top, bottom))
+        if bottom == height:
+            return bands
+        top += step
+
+
+def owned_range(bands: Sequence[Tuple[int, int]], index: int, height: int) -> Tuple[int, int]:
+    """
+    Rows whose content belongs to band `index`
+
+    Consecutive bands split their overlap in the middle, so the owned ranges
+    partition the page and every element is kept exactly once.
+    """
+    top, bottom = bands[index]
+    lower = 0 if index == 0 else (top + bands[index - 1][1]) // 2
+    upper = height if index == len(bands) - 1 else (bands[index + 1][0] + bottom) // 2
+    return lower, upper
+
+
+def result_elements(result: Dict[str, Any], offset_y: int = 0) -> Optional[List[Element]]:
+    """
+    Extract positioned elements from a backend result
+
+    Args:
+        result: Result of extract_text_with_confidence (any backend)
+        offset_y: Band offset added to every box
+
+    Returns:
+        Elements in page coordinates, or None when the backend reported no boxes
+    """
+    parts = list(result.get('text_parts') or [])
+    confidences = list(result.get('confidences') if result.get('confidences') is not None else [])
+
+    boxes = result.get('bounding_boxes')
+    if boxes is None and result.get('bboxes') is not None:
+        # EasyOCR: four corner points per element
+        boxes = []
+        for points in result['bboxes']:
+            xs = [point[0] for point in points]
+            ys = [point[1] for point in points]
+            boxes.append((min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys)))
+    if boxes is None or len(boxes) != len(parts):
+        return None
+
+    elements = []
+    for index, (text, box) in enumerate(zip(parts, boxes)):
+        confidence = float(confidences[index]) if index < len(confidences) else 0.0
+        x, y, width, height = (int(value) for value in box)
+        elements.append((text, confidence, x, y + offset_y, width, height))
+    return elements
+
+
+def group_lines(elements: Sequence[Element]) -> List[List[Element]]:
+    """
+    Group elements into text lines by vertical overlap, in reading order
+
+    Returns:
+        Lines from top to bottom, each sorted left to right
+    """
+    lines: List[List[Element]] = []
+    centers: List[float] = []
+    for element in sorted(elements, key=lambda e: (e[3] + e[5] / 2, e[2])):
+        center = element[3] + element[5] / 2
+        if lines:
+            line_height = max(e[5] for e in lines[-1])
+            if abs(center - centers[-1]) <= max(element[5], line_height) / 2:
+                lines[-1].append(element)
+                centers[-1] = sum(e[3] + e[5] / 2 for e in lines[-1]) / len(lines[-1])
+                continue
+        lines.append([element])
+        centers.append(center)
+    return [sorted(line, key=lambda e: e[2]) for line in lines]
+
+
+def merge_texts(texts: Sequence[str], max_overlap_lines: int = 8) -> str:
+    """
+    Join band texts, dropping lines repeated at the start of a band
+
+    Fallback for backends without boxes: the longest run of leading lines of a
+    band that equals the trailing lines collected so far is skipped.
+    """
+    merged: List[str] = []
+    for text in texts:
+        lines = [line for line in text.splitlines() if line.strip()]
+        normalized = [' '.join(line.split()) for line in lines]
+        tail = [' '.join(line.split()) for line in merged[-max_overlap_lines:]]
+        skip = 0
+        for count in range(min(len(tail), len(normalized)), 0, -1):
+            if tail[-count:] == normalized[:count]:
+                skip = count
+                break
+        merged.extend(lines[skip:])
+    return '\n'.join(merged)
+
+
+def extract_tiled(image: Any, engine: Any = None,
+                  engine_factory: Optional[Callable[[], Any]] = None,
+                  band_height: int = DEFAULT_BAND_HEIGHT, overlap: int = DEFAULT_OVERLAP,
+                  workers: int = 1, **kwargs) -> Dict[str, Any]:
+    """
+    Recognize a large image band by band
+
+    Uncompressed image files (BMP, PPM/PGM, uncompressed TIFF) are read band by
+    band through a memory map, so memory is bounded by band size. Compressed
+    files (PNG, JPEG, ...) cannot be decoded in strips by OpenCV or PIL: they
+    and in-memory inputs are held once as a one-byte-per-pixel gray page whose
+    bands are views; only the per-band working memory (preprocessing copies,
+    Tesseract's internal images) is bounded by band size then.
+
+    Args:
+        image: Path, NumPy array, encoded bytes, PIL image or QImage
+        engine: OCREngine used for the first band worker
+        engine_factory: Builds one engine per additional worker thread
+            (engines are not shared between threads)
+        band_height: Band height in pixels, overlap included
+        overlap: Rows shared by consecutive bands
+        workers: Bands recognized in parallel
+        **kwargs: Additional arguments for extract_text_with_confidence_from_array
+
+    Returns:
+        Dictionary with 'text', 'confidence', 'text_parts', 'confidences',
+        'bounding_boxes' ((N, 4) int32 page coordinates) and 'tiles'
+    """
+    if engine is None and engine_factory is None:
+        raise ValueError("extract_tiled needs an engine or an engine_factory")
+
+    # Deferred so importing the engine stays cheap (image_io loads OpenCV)
+    import numpy as np
+
+    height, read_band = _band_reader(image)
+    bands = plan_bands(height, band_height, overlap)
+    workers = max(1, min(workers, len(bands)))
+
+    local = threading.local()
+    spare = [engine] if engine is not None else []
+    spare_lock = threading.Lock()
+
+    def thread_engine():
+        if getattr(local, 'engine', None) is None:
+            with spare_lock:
+                local.engine = spare.pop() if spare else None
+            if local.engine is None:
+                local.engine = engine_factory()
+        return local.engine
+
+    def recognize(index: int) -> Dict[str, Any]:
+        top, bottom = bands[index]
+        return thread_engine().extract_text_with_confidence_from_array(
+            read_band(top, bottom), **kwargs)
+
+    if workers == 1:
+        results = [recognize(index) for index in range(len(bands))]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='textcapture-tile') as pool:
+            results = list(pool.map(recognize, range(len(bands))))
+
+    per_band = [result_elements(result, bands[index][0]) for index, result in enumerate(results)]
+    if any(elements is None for elements in per_band):
+        return _merge_without_boxes(results, len(bands))
+
+    kept: List[Element] = []
+    for index, elements in enumerate(per_band):
+        lower, upper = owned_range(bands, index, height)
+        kept.extend(e for e in elements if lower <= e[3] + e[5] // 2 < upper)
+
+    lines = group_lines(kept)
+    ordered = [element for line in lines for element in line]
+    confidences = [element[1] for element in ordered]
+    return {
+        'text': '\n'.join(' '.join(element[0] for element in line) for line in lines),
+        'confidence': sum(confidences) / len(confidences) if confidences else 0.0,
+        'text_parts': [element[0] for element in ordered],
+        'confidences': confidences,
+        'bounding_boxes': np.array([element[2:] for element in ordered],
+                                   dtype=np.int32).reshape(-1, 4),
+        'tiles': len(bands),
+    }
+
+
+def _band_reader(image: Any) -> Tuple[int, Callable[[int, int], Any]]:
+    """
+    Page height and a function returning the gray rows [top, bottom) of an image
+
+    Uncompressed files are memory-mapped and only the requested rows are
+    converted; anything else is decoded once to a gray page.
+    """
+    from .image_io import is_path, to_gray
+
+    if is_path(image):
+        strips = _raw_strips(image)
+        if strips is not None:
+            height = max(strip[1] for strip in strips)
+            return height, lambda top, bottom: _read_strips(image, strips, top, bottom)
+
+    page = to_gray(image)
+    # A row range of a C-contiguous array is itself contiguous: no copy
+    return page.shape[0], lambda top, bottom: page[top:bottom]
+
+
+def _raw_strips(path: Any) -> Optional[List[Tuple[Any, ...]]]:
+    """
+    Layout of an uncompressed image file, None when it has to be decoded
+
+    Returns:
+        (top, bottom, offset, width, channels, stride, bottom_up, reversed)
+        per full-width strip of stored rows
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        with Image.open(path) as pil_image:
+            width = pil_image.size[0]
+            tiles = list(pil_image.tile)
+    except Exception:
+        return None
+
+    strips = []
+    for tile in tiles:
+        codec, extents, offset, args = tile[0], tile[1], tile[2], tile[3]
+        # Raw decoder arguments: rawmode[, stride[, orientation]]
+        args = (args,) if isinstance(args, str) else tuple(args)
+        rawmode = args[0] if args else None
+        stride = args[1] if len(args) > 1 else 0
+        orientation = args[2] if len(args) > 2 else 1
+        layout = _RAW_LAYOUTS.get(rawmode)
+        if codec != 'raw' or layout is None or extents[0] != 0 or extents[2] != width:
+            return None
+        channels, reverse = layout
+        strips.append((extents[1], extents[3], offset, width, channels,
+                       stride or width * channels, orientation < 0, reverse))
+    return strips or None
+
+
+def _read_strips(path: Any, strips, top: int, bottom: int) -> Any:
+    """Gray rows [top, bottom) of a memory-mapped uncompressed image"""
+    import numpy as np
+    from .image_io import to_gray
+
+    parts = []
+    for strip_top, strip_bottom, offset, width, channels, stride, bottom_up, reverse in strips:
+        first, last = max(top, strip_top), min(bottom, strip_bottom)
+        if first >= last:
+            continue
+        rows = strip_bottom - strip_top
+        stored = np.memmap(path, dtype=np.uint8, mode='r', offset=offset, shape=(rows, stride))
+        if bottom_up:
+            pixels = stored[rows - (last - strip_top):rows - (first - strip_top)][::-1]
+        else:
+            pixels = stored[first - strip_top:last - strip_top]
+        pixels = pixels[:, :width * channels].reshape(last - first, width, channels)
+        if channels == 1:
+            parts.append(np.array(pixels[:, :, 0]))
+            continue
+        pixels = pixels[:, :, 2::-1] if reverse else pixels[:, :, :3]
+        parts.append(to_gray(np.ascontiguousarray(pixels)))
+    return parts[0] if len(parts) == 1 else np.vstack(parts)
+
+
+def _merge_without_boxes(results: Sequence[Dict[str, Any]], tiles: int) -> Dict[str, Any]:
+    """Line-based merge used when a backend reports no element boxes"""
+    confidences = [float(c) for result in results for c in (result.get('confidences') or [])]
+    return {
+        'text': merge_texts([result.get('text') or '' for result in results]),
+        'confidence': sum(confidences) / len(confidences) if confidences else 0.0,
+        'text_parts': [part for result in results for part in (result.get('text_parts') or [])],
+        'confidences': confidences,
+        'bounding_boxes': None,
+        'tiles': tiles,
+    }
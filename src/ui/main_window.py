@@ -2,6 +2,7 @@
 Main window implementation
 """
 
+import logging
 import sys
 import os
 
@@ -14,9 +15,12 @@ from PySide6.QtCore import Qt, QCoreApplication, QTimer
 from src.widgets.ui_form import Ui_Main
 
 from src.core.button_manager import ButtonManager
+from src.core.job_queue import JobQueue
 from src.actions.button_actions import ButtonActions
 from src.utils.css_manager import CSSManager, WidgetStateManager
 
+logger = logging.getLogger(__name__)
+
 
 class MainWindow(QWidget):
     """Main application window"""
@@ -47,7 +51,10 @@ class MainWindow(QWidget):
         self.buttons = self._gather_buttons()
         self.button_manager = ButtonManager(self.buttons)
         self.button_actions = ButtonActions(self)
-        self.action_thread = None
+        # Background actions and OCR; the C++ engine releases the GIL while recognizing.
+        # OCR jobs share pooled engines, so they run one at a time on their own worker
+        self.job_queue = JobQueue(max_workers=2, parent=self, serial_groups=("ocr",))
+        self.job_queue.idle.connect(self.on_action_finished)
 
         # Initialize language combo box
         self.ui.cbLanguage.addItems(["En", "Vi", "Jp"])
@@ -135,6 +142,8 @@ class MainWindow(QWidget):
 
     def _load_image(self, image_path):
         """Load and display an image"""
+        # Results of OCR jobs for the previous image are no longer wanted
+        self.job_queue.cancel_group("ocr")
         try:
             # Set loading state
             self.image_area_state.set_loading_state(True)
@@ -168,6 +177,7 @@ class MainWindow(QWidget):
 
     def _clear_image_impl(self):
         """Clear the image and reset to default state"""
+        self.job_queue.cancel_group("ocr")
         self.ui.lbImageArea.clear()
         self.ui.lbImageArea.setText(
             QCoreApplication.translate(
@@ -206,7 +216,8 @@ class MainWindow(QWidget):
         if hasattr(self.ui, "lbStatusBar"):
             self.ui.lbStatusBar.setText(message)
             QTimer.singleShot(2000, lambda: self.ui.lbStatusBar.setText(""))
-        print(f"[{status_type.upper()}] {message}")
+        logger.log(logging.ERROR if status_type == "error" else logging.INFO,
+                   "[%s] %s", status_type.upper(), message)
 
     def get_image_area_state(self):
         """Get current state of image area"""
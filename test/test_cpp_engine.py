@@ -0,0 +1,120 @@
+"""Tests for the compiled C++ OCR engine, skipped when it is not built"""
+
+import logging
+import threading
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.ocr.cpp_ocr import CppOCREngine, is_cpp_available, native_logger, sync_native_log_level  # noqa: E402
+
+pytestmark = pytest.mark.skipif(not is_cpp_available(), reason="C++ OCR module not built")
+
+THREADS = 4
+CALLS_PER_THREAD = 5
+
+
+@pytest.fixture(scope="module")
+def images():
+    """Gray and RGB renderings of the benchmark text at several sizes"""
+    from benchmarks.fixtures import SAMPLE_TEXT, _font_path, render_text
+
+    images = []
+    for size in (12, 20, 32):
+        gray = np.asarray(render_text(SAMPLE_TEXT['eng'][:2], _font_path(), size, seed=size))
+        images.append(np.ascontiguousarray(gray))
+        images.append(np.ascontiguousarray(np.stack([gray] * 3, axis=2)))
+    return images
+
+
+@pytest.fixture
+def engine():
+    engine = CppOCREngine()
+    engine.initialize('eng')
+    return engine
+
+
+def test_concurrent_calls_on_one_engine_match_serial_runs(engine, images, caplog):
+    expected = [engine.extract_text_with_confidence_from_array(image)['text'] for image in images]
+
+    # Native messages go through the Python log sink while the engine mutex
+    # is held, which deadlocks unless every binding released the GIL first
+    caplog.set_level(logging.DEBUG, logger=native_logger.name)
+    sync_native_log_level()
+    results = {}
+    errors = []
+    barrier = threading.Barrier(THREADS)
+
+    def worker(thread_index):
+        barrier.wait()
+        try:
+            for call in range(CALLS_PER_THREAD):
+                index = (thread_index + call) % len(images)
+                text = engine.extract_text_with_confidence_from_array(images[index])['text']
+                results.setdefault(index, []).append(text)
+                engine.get_scratch_bytes()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=120)
+    native_logger.setLevel(logging.NOTSET)
+    sync_native_log_level()
+
+    assert not any(thread.is_alive() for thread in threads), "calls on one engine deadlocked"
+    assert errors == []
+    for index, texts in results.items():
+        assert texts == [expected[index]] * len(texts)
+
+
+def test_recognition_releases_the_gil(engine, images):
+    image = np.ascontiguousarray(np.tile(images[-1], (8, 1, 1)))
+    start = time.perf_counter()
+    engine.extract_text_from_array(image)
+    call_seconds = time.perf_counter() - start
+
+    gaps = []
+    done = threading.Event()
+
+    def heartbeat():
+        last = time.perf_counter()
+        while not done.is_set():
+            time.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    thread = threading.Thread(target=heartbeat)
+    thread.start()
+    try:
+        engine.extract_text_from_array(image)
+    finally:
+        done.set()
+        thread.join()
+
+    # Holding the GIL would stall the heartbeat for the whole call
+    assert max(gaps) < max(0.05, call_seconds / 2)
+
+
+def test_repeated_calls_keep_scratch_buffers_and_rss_flat(engine, images):
+    from benchmarks.bench_memory import current_rss_mb
+
+    def run(count):
+        for index in range(count):
+            engine.extract_text_with_confidence_from_array(images[index % len(images)])
+
+    # Buffers grow to the largest image during warm-up and are reused afterwards
+    run(2 * len(images))
+    scratch_bytes = engine.get_scratch_bytes()
+    baseline = current_rss_mb()
+
+    run(200)
+
+    assert engine.get_scratch_bytes() == scratch_bytes
+    if baseline is not None:
+        assert current_rss_mb() - baseline < 8.0
@@ -0,0 +1,71 @@
+"""Tests for the warm engine pool"""
+
+import threading
+
+from src.ocr.engine_pool import EnginePool
+
+
+class FakeEngine:
+    """Engine whose C++ backend is never available, like OCREngine without the module"""
+
+    def __init__(self, use_cpp=True, **kwargs):
+        self.use_cpp = False
+        self.kwargs = kwargs
+        self._pool = None
+
+
+def test_fallback_engine_is_keyed_and_accounted_as_python():
+    pool = EnginePool(memory_estimates={'cpp': 60, 'python': 400}, factory=FakeEngine)
+
+    engine = pool.get(use_cpp=True, language='eng')
+
+    assert pool.get_stats()['keys'] == [('python', 'eng')]
+    assert pool.memory_usage_mb() == 400
+    assert pool.get(use_cpp=True, language='eng') is engine
+    assert pool.get(use_cpp=False, language='eng') is engine
+    assert len(pool) == 1
+
+
+def test_fallback_engines_are_evicted_by_their_real_size():
+    pool = EnginePool(max_engines=8, max_memory_mb=500, factory=FakeEngine)
+
+    pool.get(use_cpp=True, language='eng')
+    pool.get(use_cpp=True, language='vie')
+
+    assert pool.get_stats()['keys'] == [('python', 'vie')]
+    assert pool.evictions == 1
+
+
+def test_discard_and_forget_drop_the_fallback_engine():
+    pool = EnginePool(factory=FakeEngine)
+    engine = pool.get(use_cpp=True, language='eng')
+
+    assert pool.discard(use_cpp=True, language='eng')
+    assert len(pool) == 0
+
+    engine = pool.get(use_cpp=True, language='eng')
+    assert pool.forget(engine)
+    assert pool.get(use_cpp=True, language='eng') is not engine
+
+
+def test_concurrent_requests_build_one_engine():
+    built = []
+    release = threading.Event()
+
+    def factory(**kwargs):
+        release.wait(5)
+        built.append(FakeEngine(**kwargs))
+        return built[-1]
+
+    pool = EnginePool(factory=factory)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.get(language='eng')))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(built) == 1
+    assert all(result is built[0] for result in results)
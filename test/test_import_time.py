@@ -0,0 +1,35 @@
+"""Import-time guard: entry points stay fast and load heavy dependencies lazily"""
+
+import subprocess
+
+import pytest
+
+from benchmarks.check_import_time import (
+    ENTRY_POINTS, FORBIDDEN_MODULES, STARTUP_STATEMENT, forbidden_imports, measure)
+
+# Same budget as benchmarks/check_import_time.py
+BUDGET_MS = 50.0
+RUNS = 3
+
+
+def test_ocr_package_imports_within_budget_without_heavy_modules():
+    best = None
+    for _ in range(RUNS):
+        total_us, modules = measure(STARTUP_STATEMENT)
+        assert forbidden_imports(modules, FORBIDDEN_MODULES) == []
+        best = total_us if best is None else min(best, total_us)
+
+    assert best / 1000.0 <= BUDGET_MS
+
+
+@pytest.mark.parametrize("statement, forbidden", ENTRY_POINTS,
+                         ids=[statement for statement, _ in ENTRY_POINTS])
+def test_entry_point_does_not_import_heavy_modules(statement, forbidden):
+    try:
+        _, modules = measure(statement)
+    except subprocess.CalledProcessError as e:
+        if "resources_rc" in e.stderr:
+            pytest.skip("Qt resources not compiled (pyside6-rcc resources.qrc -o src/resources_rc.py)")
+        raise
+
+    assert forbidden_imports(modules, forbidden) == []
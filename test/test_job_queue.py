@@ -0,0 +1,86 @@
+"""Tests for the background job queue"""
+
+import gc
+import os
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtCore = pytest.importorskip("PySide6.QtCore")
+
+from src.core.job_queue import JobQueue  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+@pytest.fixture
+def queue(app):
+    queue = JobQueue(max_workers=2, serial_groups=("ocr",))
+    yield queue
+    queue.shutdown(wait=True)
+
+
+def wait_for(app, condition, timeout=5.0):
+    """Process GUI events until condition() holds"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        gc.collect()
+        time.sleep(0.01)
+    return condition()
+
+
+def test_finished_slot_runs_without_a_job_reference(app, queue):
+    results = []
+    queue.submit(lambda: "HELLO", group="ocr", on_finished=results.append)
+    gc.collect()
+
+    assert wait_for(app, lambda: results == ["HELLO"])
+    assert wait_for(app, lambda: not queue._finishing)
+
+
+def test_failed_slot_runs_without_a_job_reference(app, queue):
+    errors = []
+
+    def fail():
+        raise ValueError("boom")
+
+    queue.submit(fail, on_failed=errors.append)
+
+    assert wait_for(app, lambda: len(errors) == 1)
+    assert isinstance(errors[0], ValueError)
+
+
+def test_duplicate_keys_are_coalesced(app, queue):
+    release = threading.Event()
+    first = queue.submit(release.wait, key="same")
+    second = queue.submit(release.wait, key="same")
+    release.set()
+
+    assert first is second
+
+
+def test_cancel_running_job_calls_callbacks_and_drops_result(app, queue):
+    started, stop = threading.Event(), threading.Event()
+    results, cancelled = [], []
+
+    def work():
+        from src.core.job_queue import current_job
+        current_job().add_cancel_callback(stop.set)
+        started.set()
+        stop.wait(5)
+        return "late"
+
+    job = queue.submit(work, group="ocr", on_finished=results.append)
+    job.cancelled.connect(lambda: cancelled.append(True))
+    assert started.wait(5)
+    assert queue.cancel_group("ocr") == 1
+
+    assert wait_for(app, lambda: cancelled == [True])
+    assert stop.is_set()
+    assert results == []
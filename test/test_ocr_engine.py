@@ -0,0 +1,57 @@
+"""Tests for the OCREngine facade"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.ocr.ocr_engine import OCREngine  # noqa: E402
+
+
+class FakeBackend:
+    """Backend recording which entry point each image reached"""
+
+    default_method = 'tesseract'
+    language = 'eng'
+
+    def extract_text(self, image, **kwargs):
+        return f"path:{image}"
+
+    def extract_text_from_array(self, image, **kwargs):
+        return f"array:{image.shape[0]}"
+
+    def extract_text_from_bytes(self, data, **kwargs):
+        return f"bytes:{len(data)}"
+
+    def extract_text_with_confidence(self, image, **kwargs):
+        return {'text': self.extract_text(image), 'confidence': 90.0, 'timings': {}}
+
+    def extract_text_with_confidence_from_array(self, image, **kwargs):
+        return {'text': self.extract_text_from_array(image), 'confidence': 90.0, 'timings': {}}
+
+    def extract_text_with_confidence_from_bytes(self, data, **kwargs):
+        return {'text': self.extract_text_from_bytes(data), 'confidence': 90.0, 'timings': {}}
+
+
+@pytest.fixture
+def engine():
+    engine = OCREngine(use_cpp=False)
+    engine._engine = FakeBackend()
+    return engine
+
+
+def test_unbatched_extract_batch_accepts_in_memory_images(engine, tmp_path):
+    path = tmp_path / "page.png"
+    path.write_bytes(b"png")
+    images = [str(path), path, np.zeros((7, 3), np.uint8), b"12345"]
+
+    assert engine.extract_batch(images) == [
+        f"path:{path}", f"path:{path}", "array:7", "bytes:5"]
+    assert [result['text'] for result in engine.extract_batch(images, confidence=True)] == [
+        f"path:{path}", f"path:{path}", "array:7", "bytes:5"]
+
+
+def test_unbatched_extract_batch_reports_errors_per_image(engine, tmp_path):
+    results = engine.extract_batch([str(tmp_path / "missing.png"), np.zeros((2, 2), np.uint8)])
+
+    assert isinstance(results[0], FileNotFoundError)
+    assert results[1] == "array:2"
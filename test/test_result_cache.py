@@ -0,0 +1,74 @@
+"""Tests for the OCR result cache"""
+
+import os
+import sqlite3
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.ocr import result_cache  # noqa: E402
+from src.ocr.result_cache import ResultCache, image_digest  # noqa: E402
+
+
+def digest_rows(cache_dir):
+    with sqlite3.connect(os.path.join(cache_dir, 'ocr_cache.sqlite3')) as db:
+        return [row[0] for row in db.execute("SELECT path FROM file_digests")]
+
+
+def test_results_round_trip_through_the_disk_tier(tmp_path):
+    value = {'text': 'a', 'confidences': np.array([90.5]), 'bounding_boxes': np.zeros((1, 4), np.int32)}
+    cache = ResultCache(cache_dir=str(tmp_path))
+    cache.put('key', value)
+    cache.close()
+
+    restored = ResultCache(cache_dir=str(tmp_path)).get('key')
+
+    assert restored['text'] == 'a'
+    assert restored['confidences'].tolist() == [90.5]
+    assert restored['bounding_boxes'].dtype == np.int32
+
+
+def test_path_digest_is_remembered_until_the_file_changes(tmp_path):
+    path = tmp_path / "page.png"
+    path.write_bytes(b"first")
+    cache = ResultCache(cache_dir=str(tmp_path / "cache"))
+
+    first = cache.digest(str(path))
+    assert first == image_digest(str(path))
+
+    path.write_bytes(b"second version")
+    assert cache.digest(str(path)) == image_digest(str(path)) != first
+    # One row per path, the stale digest was replaced
+    assert digest_rows(str(tmp_path / "cache")) == [os.path.abspath(path)]
+
+
+def test_disk_file_digests_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, 'MAX_DISK_PATH_DIGESTS', 10)
+    monkeypatch.setattr(result_cache, 'MAX_PATH_DIGESTS', 4)
+    cache_dir = str(tmp_path / "cache")
+    cache = ResultCache(cache_dir=cache_dir)
+    paths = []
+    for index in range(25):
+        path = tmp_path / f"{index}.png"
+        path.write_bytes(str(index).encode())
+        paths.append(os.path.abspath(path))
+        cache.digest(str(path))
+
+    rows = digest_rows(cache_dir)
+    assert len(rows) <= 10
+    assert paths[-1] in rows and paths[0] not in rows
+
+
+def test_digest_table_without_lru_column_is_rebuilt(tmp_path):
+    with sqlite3.connect(os.path.join(tmp_path, 'ocr_cache.sqlite3')) as db:
+        db.execute("CREATE TABLE file_digests (path TEXT PRIMARY KEY, size INTEGER NOT NULL, "
+                   "mtime_ns INTEGER NOT NULL, digest TEXT NOT NULL)")
+        db.execute("INSERT INTO file_digests VALUES ('/gone.png', 1, 1, 'f00')")
+
+    cache = ResultCache(cache_dir=str(tmp_path))
+    path = tmp_path / "page.png"
+    path.write_bytes(b"pixels")
+
+    assert cache.digest(str(path)) == image_digest(str(path))
+    assert digest_rows(str(tmp_path)) == [os.path.abspath(path)]
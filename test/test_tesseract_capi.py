@@ -0,0 +1,112 @@
+"""Tests for the in-process Tesseract wrapper"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.ocr import tesseract_capi  # noqa: E402
+from src.ocr.tesseract_capi import TesseractAPI, parse_config  # noqa: E402
+
+
+class FakeLibrary:
+    """Stand-in for libtesseract that records the variables seen by each recognition"""
+
+    def __init__(self):
+        self.variables = {'tessedit_char_whitelist': '', 'preserve_interword_spaces': 0,
+                          'textord_min_xheight': 10}
+        self.seen = []
+
+    def TessBaseAPICreate(self):
+        return 1
+
+    def TessBaseAPIInit2(self, handle, datapath, language, oem):
+        return 0
+
+    def TessBaseAPISetPageSegMode(self, handle, psm):
+        pass
+
+    def TessBaseAPISetVariable(self, handle, name, value):
+        name = name.decode()
+        if name not in self.variables:
+            return 0
+        current = self.variables[name]
+        self.variables[name] = type(current)(value.decode()) if not isinstance(current, str) else value.decode()
+        return 1
+
+    def _get(self, name, kind, ref):
+        value = self.variables.get(name.decode())
+        if type(value) is not kind:
+            return 0
+        ref._obj.value = value
+        return 1
+
+    def TessBaseAPIGetIntVariable(self, handle, name, ref):
+        return self._get(name, int, ref)
+
+    def TessBaseAPIGetBoolVariable(self, handle, name, ref):
+        return 0
+
+    def TessBaseAPIGetDoubleVariable(self, handle, name, ref):
+        return self._get(name, float, ref)
+
+    def TessBaseAPIGetStringVariable(self, handle, name):
+        value = self.variables.get(name.decode())
+        return value.encode() if isinstance(value, str) else None
+
+    def TessBaseAPISetImage(self, handle, data, width, height, channels, stride):
+        pass
+
+    def TessBaseAPIRecognize(self, handle, monitor):
+        self.seen.append(dict(self.variables))
+        return 0
+
+    def TessBaseAPIGetTsvText(self, handle, page):
+        return None
+
+    def TessBaseAPIClear(self, handle):
+        pass
+
+    def TessBaseAPIEnd(self, handle):
+        pass
+
+    def TessBaseAPIDelete(self, handle):
+        pass
+
+
+@pytest.fixture
+def library(monkeypatch):
+    library = FakeLibrary()
+    monkeypatch.setattr(tesseract_capi, '_load_library', lambda: library)
+    return library
+
+
+def test_parse_config():
+    assert parse_config("--psm 4 --oem 1 -c preserve_interword_spaces=1") == (
+        4, 1, {'preserve_interword_spaces': '1'})
+    with pytest.raises(ValueError):
+        parse_config("-l eng")
+
+
+def test_call_variables_do_not_leak_into_later_calls(library):
+    api = TesseractAPI('eng')
+    image = np.zeros((8, 8), np.uint8)
+
+    api.recognize_tsv(image, variables={'tessedit_char_whitelist': '0123456789',
+                                        'preserve_interword_spaces': '1'})
+    api.recognize_tsv(image)
+
+    assert library.seen[0]['tessedit_char_whitelist'] == '0123456789'
+    assert library.seen[0]['preserve_interword_spaces'] == 1
+    assert library.seen[1]['tessedit_char_whitelist'] == ''
+    assert library.seen[1]['preserve_interword_spaces'] == 0
+
+
+def test_unknown_variable_restores_the_ones_already_set(library):
+    api = TesseractAPI('eng')
+
+    with pytest.raises(ValueError):
+        api.recognize_tsv(np.zeros((8, 8), np.uint8),
+                          variables={'textord_min_xheight': '20', 'no_such_variable': '1'})
+
+    assert library.variables['textord_min_xheight'] == 10
+    assert library.seen == []
@@ -0,0 +1,55 @@
+"""Tests for Tesseract TSV parsing"""
+
+import shutil
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.ocr.tesseract_tsv import parse_tsv, tsv_raw_data, tsv_result, words_to_text  # noqa: E402
+
+HEADER = "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext"
+TSV = "\n".join([
+    HEADER,
+    "1\t1\t0\t0\t0\t0\t0\t0\t200\t100\t-1\t",
+    "5\t1\t1\t1\t1\t1\t10\t10\t40\t12\t96.5\tHello",
+    "5\t1\t1\t1\t1\t2\t60\t10\t50\t12\t91\tworld",
+    "5\t1\t1\t1\t2\t1\t10\t30\t30\t12\t0\t~",
+    "5\t1\t1\t2\t1\t1\t10\t60\t40\t12\t88\tNext",
+    "5\t1\t2\t1\t1\t1\t10\t80\t40\t12\t-1\t",
+])
+
+
+def test_words_to_text_keeps_line_and_paragraph_layout():
+    assert words_to_text(parse_tsv(TSV)) == "Hello world\n~\n\nNext"
+
+
+def test_result_keeps_positive_confidence_words_and_raw_data():
+    result = tsv_result(parse_tsv(TSV), scale=2.0)
+    raw = tsv_raw_data(TSV, scale=2.0)
+
+    assert result['text_parts'] == ["Hello", "world", "Next"]
+    assert result['bounding_boxes'].tolist() == [[5, 5, 20, 6], [30, 5, 25, 6], [5, 30, 20, 6]]
+    assert raw['conf'] == [-1, 96, 91, 0, 88, -1]
+    assert raw['text'][1:3] == ["Hello", "world"]
+    assert raw['left'][:3] == [0, 5, 30]
+
+
+def test_raw_data_matches_pytesseract_dict():
+    pytesseract = pytest.importorskip("pytesseract")
+
+    assert tsv_raw_data(TSV) == pytesseract.pytesseract.file_to_dict(TSV, '\t', -1)
+
+
+@pytest.mark.skipif(shutil.which("tesseract") is None, reason="tesseract binary not installed")
+def test_rebuilt_text_matches_image_to_string():
+    pytesseract = pytest.importorskip("pytesseract")
+    from benchmarks.fixtures import SAMPLE_TEXT, _font_path, render_text
+
+    image = render_text(SAMPLE_TEXT['eng'], _font_path(), 24)
+    config = '--psm 6'
+    tsv = pytesseract.image_to_data(image, lang='eng', config=config,
+                                    output_type=pytesseract.Output.STRING)
+
+    assert words_to_text(parse_tsv(tsv)) == pytesseract.image_to_string(
+        image, lang='eng', config=config).strip()
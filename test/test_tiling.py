@@ -0,0 +1,60 @@
+"""Tests for tiled OCR of large images"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from src.ocr.image_io import to_gray  # noqa: E402
+from src.ocr.tiling import _band_reader, _raw_strips, extract_tiled, plan_bands  # noqa: E402
+
+
+@pytest.fixture
+def page():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, size=(301, 57, 3), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("suffix, mode", [
+    ("bmp", "RGB"), ("ppm", "RGB"), ("tif", "RGB"), ("tif", "L"), ("pgm", "L"),
+])
+def test_uncompressed_files_are_read_band_by_band(tmp_path, page, suffix, mode):
+    path = str(tmp_path / f"page.{suffix}")
+    Image.fromarray(page).convert(mode).save(path)
+    expected = to_gray(np.asarray(Image.open(path).convert("RGB" if mode == "RGB" else "L")))
+
+    assert _raw_strips(path) is not None
+    height, read_band = _band_reader(path)
+    assert height == page.shape[0]
+    for top, bottom in plan_bands(height, band_height=64, overlap=16):
+        band = read_band(top, bottom)
+        assert band.flags['C_CONTIGUOUS']
+        assert np.array_equal(band, expected[top:bottom])
+
+
+def test_compressed_files_are_decoded_once(tmp_path, page):
+    path = str(tmp_path / "page.png")
+    Image.fromarray(page).save(path)
+
+    assert _raw_strips(path) is None
+    height, read_band = _band_reader(path)
+    assert np.array_equal(read_band(10, 20), to_gray(path)[10:20])
+
+
+class BoxEngine:
+    """Reports one word per band, boxed at the band's first row"""
+
+    def extract_text_with_confidence_from_array(self, band, **kwargs):
+        return {'text': f"w{band.shape[0]}", 'confidence': 90.0,
+                'text_parts': [f"w{int(band[0, 0])}"], 'confidences': [90.0],
+                'bounding_boxes': [(0, 30, 5, 4)]}
+
+
+def test_extract_tiled_reads_files_band_by_band(tmp_path, page):
+    path = str(tmp_path / "page.bmp")
+    Image.fromarray(page).save(path)
+
+    result = extract_tiled(path, engine=BoxEngine(), band_height=100, overlap=20)
+
+    assert result['tiles'] == len(plan_bands(page.shape[0], 100, 20))
+    assert result['bounding_boxes'].shape[1] == 4